@@ -1,26 +1,94 @@
 """Interviewer Helper - Main Application"""
-import gradio as gr
-import tempfile
+import time
+_START = time.perf_counter()
+
+import json
+import logging
+import os
+import shutil
+import threading
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone
 
-from core.pdf_parser import extract_text_from_pdf, is_image_based_pdf, get_pdf_as_bytes
 from core.ai_client import AIClient
-from core.question_generator import analyze_cv, analyze_cv_from_pdf, generate_interview_questions
-from core.cv_scorer import score_cv
+from core.pipeline import (
+    PRESCREEN_REJECTED_TEXT, build_jd_text, file_hash, jd_hash
+)
+from core.skill_matcher import parse_skill_list
+from core.job_queue import JobQueue
+from core import metrics, profiling
+from core.cv_scorer import get_consensus_stats
+from core.pdf_parser import get_slim_stats
+from core.question_bank import get_question_bank_stats, structure_questions
+from core.translation import SOURCE_LANGUAGE, translate_texts
 from storage.database import Database
 from storage.models import CVRecord, Settings
 from ui.i18n import get_text, set_language, LANGUAGES
+from ui.report import cleanup_exports, export_report, export_zip, render_markdown
 
 
-# Initialize database and migrate existing plaintext keys
-db = Database()
-db.migrate_plaintext_keys()
+logger = logging.getLogger("interviewer_helper")
+
+# Database is created on first use (see get_db) so importing app stays cheap
+db: Database = None
+_db_lock = threading.Lock()
+
+
+def get_db() -> Database:
+    """Get the app database, creating it on first use"""
+    global db
+    if db is None:
+        with _db_lock:
+            if db is None:
+                db = Database()
+                # Batch metric events off the request and worker paths; flushed at exit
+                db.enable_write_behind()
+                metrics.set_sink(db.record_metric)
+    return db
+
+
+def start_background_tasks():
+    """Run startup maintenance off the UI thread and resume queued jobs"""
+    def migrate():
+        start = time.perf_counter()
+        # Encrypt any existing plaintext keys (PBKDF2 key derivation is slow)
+        get_db().migrate_plaintext_keys()
+        logger.info("Startup: key migration %.0f ms (background)",
+                    (time.perf_counter() - start) * 1000)
+
+        # Records saved before near-duplicate detection need signatures
+        indexed = get_db().index_missing_signatures()
+        if indexed:
+            logger.info("Startup: indexed %d record(s) for near-duplicate detection", indexed)
+
+        # Report downloads are never collected by the UI
+        cleanup_exports()
+
+        # Move records past the retention age into the yearly archives
+        settings = get_db().load_settings()
+        if int(settings.retention_days or 0) > 0:
+            archive_old_records(settings.retention_days, settings.retention_positions)
+
+    threading.Thread(target=migrate, name="startup-migration", daemon=True).start()
+    get_job_queue().start()
+
+
+# The offline fake provider is only offered when explicitly enabled
+MODEL_CHOICES = ["Gemini", "Claude"] + (["Fake"] if os.getenv("IH_ENABLE_FAKE_LLM") else [])
 
 
 def load_saved_settings():
     """Load settings from database"""
-    return db.load_settings()
+    return get_db().load_settings()
+
+
+def apply_profiling_settings(settings: Settings):
+    """Switch request profiling per Settings (IH_PROFILE* variables take precedence)"""
+    try:
+        sample_rate = float(settings.profile_sample_rate or 0)
+    except ValueError:
+        sample_rate = None
+    profiling.configure(enabled=settings.profiling == "1", sample_rate=sample_rate)
 
 
 def create_ai_client(settings: Settings) -> AIClient:
@@ -31,132 +99,359 @@ def create_ai_client(settings: Settings) -> AIClient:
     )
 
 
-def process_cv(
-    pdf_file,
-    jd_text: str,
-    jd_required: str,
-    jd_nice_to_have: str,
-    jd_experience: str,
-    jd_mode: str,
-    model: str,
-    candidate_name: str,
-    position: str,
-    claude_key: str,
-    gemini_key: str
-):
-    """Main processing function"""
+def prescreen_skills(jd_mode: str, jd_required: str, jd_nice_to_have: str,
+                     settings: Settings) -> dict:
+    """Local skill pre-screen config for structured JDs (None for free text)"""
+    if jd_mode != "Structured":
+        return None
+    # Settings are stored as strings; empty or 0 disables auto-reject
     try:
-        # Build JD text
-        if jd_mode == "Structured":
-            jd_full = f"""
-## Required Skills
-{jd_required}
+        threshold = float(settings.auto_reject_coverage or 0)
+    except ValueError:
+        threshold = 0.0
+    return {
+        "required": parse_skill_list(jd_required),
+        "nice_to_have": parse_skill_list(jd_nice_to_have),
+        "min_coverage": threshold / 100 if threshold > 0 else None,
+    }
 
-## Nice to Have
-{jd_nice_to_have}
 
-## Experience Required
-{jd_experience} years
-"""
-        else:
-            jd_full = jd_text
-
-        # Create AI client
-        ai_client = AIClient(claude_key=claude_key, gemini_key=gemini_key)
-
-        # Check if PDF is image-based (scanned) or has text layer
-        pdf_path = pdf_file.name
-        cv_text = extract_text_from_pdf(pdf_path)
-
-        # Analyze CV - use direct PDF vision if text extraction fails
-        if cv_text.strip():
-            # PDF has text layer - use text-based analysis
-            cv_summary = analyze_cv(ai_client, cv_text, model.lower())
-        else:
-            # Image-based PDF - use AI vision to read directly
-            pdf_bytes = get_pdf_as_bytes(pdf_path)
-            cv_summary = analyze_cv_from_pdf(ai_client, pdf_bytes, model.lower())
-            cv_text = "[Image-based PDF - analyzed via AI vision]"
-
-        # Generate questions
-        questions = generate_interview_questions(ai_client, cv_summary, jd_full, model.lower())
-
-        # Score CV
-        score_result = score_cv(ai_client, cv_summary, jd_full, model.lower())
-        overall_score = score_result.get("overall_score", 0)
-
-        # Save to history
-        record = CVRecord(
-            candidate_name=candidate_name or "Unknown",
-            position=position or "Unknown",
-            cv_text=cv_text,
-            cv_summary=cv_summary,
-            jd_text=jd_full,
-            questions=questions,
-            score=overall_score,
-            score_breakdown=str(score_result)
+def build_record(params: dict, state: dict, pdf_hash: str = "") -> CVRecord:
+    """Build a history record from job params and pipeline results"""
+    score_result = state["score_result"]
+    return CVRecord(
+        candidate_name=params.get("candidate_name") or "Unknown",
+        position=params.get("position") or "Unknown",
+        cv_text=state["cv_text"],
+        cv_summary=state["cv_summary"],
+        jd_text=params["jd_full"],
+        questions=state["questions"],
+        score=score_result.get("overall_score"),
+        score_breakdown=json.dumps(score_result, indent=2, ensure_ascii=False),
+        file_hash=pdf_hash,
+        jd_hash=jd_hash(params["jd_full"]),
+        questions_data=json.dumps(structure_questions(state["questions"]), ensure_ascii=False),
+        score_variance=score_result.get("consensus", {}).get("variance")
+    )
+
+
+# Status shown while each stage is still running
+PENDING_TEXT = "_⏳ In progress..._"
+NEXT_STAGE_LABEL = {
+    "": "analyzing CV",
+    "analysis": "generating questions",
+    "questions": "scoring",
+    "score": "saving",
+    "prescreen": "saving",
+}
+
+
+def render_output(params: dict, state: dict) -> str:
+    """Render pipeline results as the output markdown.
+
+    Sections whose stage has not finished yet show a pending placeholder,
+    so this also renders intermediate results.
+    """
+    score_result = state.get("score_result")
+    if score_result is None:
+        score_display = "⏳"
+        score_section = PENDING_TEXT
+    else:
+        overall_score = score_result.get("overall_score")
+        score_display = f"{overall_score}/100" if overall_score is not None else "N/A"
+        consensus = score_result.get("consensus")
+        if consensus and overall_score is not None:
+            score_display += (f" (consensus of {consensus['samples']} samples, "
+                              f"±{consensus['variance'] ** 0.5:.1f})")
+        score_json = json.dumps(score_result, indent=2, ensure_ascii=False)
+        score_section = f"```json\n{score_json}\n```"
+
+    skill_line = ""
+    skill_match = state.get("skill_match")
+    if skill_match and (skill_match["matched_required"] or skill_match["missing_required"]):
+        required = len(skill_match["matched_required"]) + len(skill_match["missing_required"])
+        skill_line = (
+            f"\n**Required skills found:** {len(skill_match['matched_required'])}/{required} "
+            f"({skill_match['required_coverage']:.0%})"
         )
-        db.save_cv_record(record)
+        if skill_match["missing_required"]:
+            skill_line += f" · missing: {', '.join(skill_match['missing_required'])}"
 
-        # Build output markdown
-        output = f"""# Interview Questions: {candidate_name or 'Candidate'}
+    return f"""# Interview Questions: {params.get('candidate_name') or 'Candidate'}
 
-**Position:** {position or 'N/A'}
+**Position:** {params.get('position') or 'N/A'}
 **Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M')}
-**Score:** {overall_score}/100
+**Score:** {score_display}{skill_line}
 
 ---
 
 ## CV Summary
 
-{cv_summary}
+{state.get('cv_summary', PENDING_TEXT)}
 
 ---
 
 ## Job Description
 
-{jd_full}
+{params['jd_full']}
 
 ---
 
 ## Interview Questions
 
-{questions}
+{state.get('questions', PENDING_TEXT)}
 
 ---
 
 ## Score Breakdown
 
-```json
-{score_result}
-```
+{score_section}
 
 ---
 
 *Generated by Interviewer Helper*
 """
-        return output, f"✅ Generated! Score: {overall_score}/100"
 
-    except Exception as e:
-        return f"Error: {str(e)}", f"❌ Error: {str(e)}"
+
+def progress_status(label: str, stage: str, elapsed: float) -> str:
+    """Status line while a pipeline is running"""
+    return f"⏳ {label}: {NEXT_STAGE_LABEL.get(stage, stage)}... ({elapsed:.0f}s)"
+
+
+def score_status(state: dict) -> str:
+    """Status line for a finished pipeline run"""
+    overall_score = state["score_result"].get("overall_score")
+    if state["score_result"].get("parse_status") == "auto_rejected":
+        return "⛔ Auto-rejected by skill pre-screen (no AI calls made)"
+    if overall_score is None:
+        return "⚠️ Generated, but the score could not be parsed"
+    return f"✅ Generated! Score: {overall_score}/100"
+
+
+# Uploaded PDFs are copied here so queued jobs survive restarts
+JOB_DIR = Path(__file__).parent / "data" / "jobs"
+_job_queue: JobQueue = None
+_job_queue_lock = threading.Lock()
+
+
+def _complete_job(job, state: dict) -> int:
+    """Save a finished job's record and drop its PDF copy"""
+    record = build_record(job.params, state, job.params.get("file_hash", ""))
+    record_id = get_db().finish_job(job.id, record)
+    # The job is done once finish_job commits; what follows is best-effort
+    # (a missed signature is filled in by index_missing_signatures at startup)
+    try:
+        with metrics.stage("near_duplicate_index"):
+            get_db().index_signature(record_id, record.cv_text)
+        Path(job.pdf_path).unlink(missing_ok=True)
+    except Exception:
+        logger.exception("Cleanup after job %s failed", job.id)
+    return record_id
+
+
+def get_job_queue() -> JobQueue:
+    """Get the background job queue, creating it on first use"""
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            _job_queue = JobQueue(
+                get_db(),
+                client_factory=lambda: create_ai_client(load_saved_settings()),
+                on_complete=_complete_job,
+                workers=int(os.getenv("IH_JOB_WORKERS", "2"))
+            )
+    return _job_queue
+
+
+def enqueue_cv(
+    pdf_file,
+    jd_text: str,
+    jd_required: str,
+    jd_nice_to_have: str,
+    jd_experience: str,
+    jd_mode: str,
+    model: str,
+    candidate_name: str,
+    position: str,
+    state: dict = None
+) -> int:
+    """Queue a CV for background processing and return the job ID.
+
+    A state with cv_text and cv_summary skips the CV analysis stage.
+    """
+    JOB_DIR.mkdir(parents=True, exist_ok=True)
+    pdf_hash = file_hash(pdf_file.name)
+    pdf_copy = JOB_DIR / f"{pdf_hash[:16]}_{int(time.time() * 1000)}.pdf"
+    shutil.copyfile(pdf_file.name, pdf_copy)
+
+    settings = load_saved_settings()
+    params = {
+        "jd_full": build_jd_text(jd_mode, jd_text, jd_required, jd_nice_to_have, jd_experience),
+        "model": model.lower(),
+        "candidate_name": candidate_name,
+        "position": position,
+        "file_hash": pdf_hash,
+        "skills": prescreen_skills(jd_mode, jd_required, jd_nice_to_have, settings),
+        "reuse_questions": settings.reuse_questions == "1",
+        "consensus": settings.consensus_scoring == "1",
+    }
+    return get_job_queue().enqueue(str(pdf_copy), params, state)
 
 
-def save_settings(claude_key, gemini_key, default_model, language):
+def find_near_duplicate(cv_text: str):
+    """Find a saved record whose CV is nearly identical to this CV text.
+
+    Returns:
+        (record, similarity) for the closest match, or None
+    """
+    from core.near_duplicate import DUPLICATE_THRESHOLD, minhash
+
+    get_db().flush()
+    with metrics.stage("near_duplicate_check"):
+        matches = get_db().find_near_duplicates(minhash(cv_text), DUPLICATE_THRESHOLD)
+    metrics.record_cache("near_duplicate", bool(matches))
+    for record_id, sim in matches:
+        record = get_db().get_record(record_id)
+        if record:
+            return record, sim
+    return None
+
+
+def render_record(record: CVRecord) -> str:
+    """Render a saved record like a fresh pipeline result"""
+    try:
+        score_result = json.loads(record.score_breakdown) if record.score_breakdown else {}
+    except json.JSONDecodeError:
+        score_result = {"overall_score": record.score}
+    params = {
+        "jd_full": record.jd_text,
+        "candidate_name": record.candidate_name,
+        "position": record.position,
+    }
+    state = {
+        "cv_summary": record.cv_summary,
+        "questions": record.questions,
+        "score_result": score_result,
+    }
+    return render_output(params, state)
+
+
+def _job_elapsed(job) -> float:
+    """Seconds since a job was created (timestamps are UTC from SQLite)"""
+    try:
+        created = datetime.strptime(str(job.created_at), "%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        return 0.0
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return max(0.0, (now - created).total_seconds())
+
+
+def job_record_id(job_id):
+    """ID of the record saved by a finished job (None if not finished)"""
+    job = get_db().get_job(int(job_id)) if job_id else None
+    return job.record_id if job else None
+
+
+def watch_job(job_id, poll_seconds: float = 1.0):
+    """Yield (output markdown, status, done) until a job finishes.
+
+    Output is re-rendered whenever a new stage completes.
+    """
+    if not job_id:
+        yield "", "Enter a job ID", True
+        return
+    import gradio as gr
+
+    job_id = int(job_id)
+    get_job_queue().start()
+    last_stage = None
+
+    while True:
+        job = get_db().get_job(job_id)
+        if job is None:
+            yield "", f"❌ Job #{job_id} not found", True
+            return
+        elapsed = _job_elapsed(job)
+        if job.status == "done":
+            yield (render_output(job.params, job.state),
+                   f"Job #{job_id}: {score_status(job.state)} ({elapsed:.0f}s)", True)
+            return
+        if job.status == "failed":
+            yield (f"Error: {job.error}",
+                   f"❌ Job #{job_id} failed: {job.error} (Retry resumes after '{job.stage or 'start'}')",
+                   True)
+            return
+
+        output = gr.update()
+        if job.stage != last_stage:
+            output = render_output(job.params, job.state)
+            last_stage = job.stage
+        yield output, progress_status(f"Job #{job_id} {job.status}", job.stage, elapsed), False
+        time.sleep(poll_seconds)
+
+
+def save_settings(claude_key, gemini_key, default_model, language, auto_reject_coverage=0,
+                  reuse_questions=False, consensus_scoring=False, profiling_enabled=False,
+                  profile_sample_rate=0.1, retention_days=0, retention_positions=""):
     """Save settings to database"""
     settings = Settings(
         claude_api_key=claude_key,
         gemini_api_key=gemini_key,
         default_model=default_model.lower(),
-        language=language
+        language=language,
+        auto_reject_coverage=str(int(auto_reject_coverage or 0)),
+        reuse_questions="1" if reuse_questions else "0",
+        consensus_scoring="1" if consensus_scoring else "0",
+        profiling="1" if profiling_enabled else "0",
+        profile_sample_rate=str(profile_sample_rate if profile_sample_rate is not None else 0.1),
+        retention_days=str(int(retention_days or 0)),
+        retention_positions=retention_positions or ""
     )
-    db.save_settings(settings)
+    get_db().save_settings(settings)
+    apply_profiling_settings(settings)
     set_language(language)
     return "✅ Settings saved!"
 
 
+def archive_old_records(older_than_days, positions: str = ""):
+    """Archive records older than a number of days (optionally only some positions)"""
+    days = int(older_than_days or 0)
+    if days <= 0:
+        return "Set a retention age above 0 days"
+    start = time.perf_counter()
+    position_list = [p.strip() for p in (positions or "").split(",") if p.strip()]
+    moved = get_db().archive_records(days, position_list or None)
+    if not moved:
+        return "No records to archive"
+    per_year = ", ".join(f"{year}: {count}" for year, count in sorted(moved.items()))
+    logger.info("Archived records older than %d days (%s) in %.0f ms",
+                days, per_year, (time.perf_counter() - start) * 1000)
+    return f"✅ Archived {sum(moved.values())} record(s) ({per_year})"
+
+
+def search_archive(query, search_content=False):
+    """Search archived records for the History tab"""
+    rows = get_db().search_archive(query or "", search_content=bool(search_content))
+    return [
+        [row["year"], row["id"], row["candidate_name"], row["position"], row["score"],
+         row["created_at"]]
+        for row in rows
+    ]
+
+
+def view_archived_record(year, record_id):
+    """Render an archived record's report"""
+    if not year or not record_id:
+        return "Enter the year and record ID of an archived record"
+    record = get_db().get_archived_record(str(int(year)), int(record_id))
+    return render_markdown(record) if record else "Archived record not found"
+
+
+@profiling.profiled("get_history_data")
 def get_history_data():
     """Get history for display"""
-    records = db.get_all_records()
+    get_db().flush()  # include records still in the write-behind queue
+    records = get_db().get_all_records()
     data = []
     for r in records:
         data.append([
@@ -169,85 +464,262 @@ def get_history_data():
     return data
 
 
-def view_record(record_id):
-    """View a saved record"""
+def get_position_choices():
+    """Positions with saved records, for the re-score dropdown"""
+    import gradio as gr
+    get_db().flush()
+    return gr.update(choices=get_db().get_positions())
+
+
+@profiling.profiled("rescore_position")
+def rescore_position(position, jd_text, model, regenerate_questions, progress=None):
+    """Re-score a position's saved candidates against an edited JD"""
+    from core.rescore import rescore_position as run_rescore
+
+    if not position or not jd_text or not jd_text.strip():
+        return "❌ Select a position and enter the updated job description", get_history_data()
+
+    get_db().flush()
+    settings = load_saved_settings()
+    summary = run_rescore(
+        create_ai_client(settings),
+        get_db(),
+        position,
+        jd_text,
+        model.lower(),
+        regenerate_questions=regenerate_questions,
+        workers=int(os.getenv("IH_RESCORE_WORKERS", "4")),
+        on_progress=(lambda done, total: progress(done / total, desc=f"{done}/{total}"))
+        if progress else None,
+        consensus=settings.consensus_scoring == "1"
+    )
+    if not summary["total"]:
+        status = "✅ All candidates are already scored against this JD"
+    else:
+        status = f"✅ Re-scored {summary['updated']}/{summary['total']} candidates"
+        if summary["failed"]:
+            status += f" ({summary['failed']} failed: {'; '.join(summary['errors'])})"
+    return status, get_history_data()
+
+
+def get_leaderboard_data(position):
+    """Ranked candidates of a position for the Compare tab"""
+    if not position:
+        return []
+    get_db().flush()
+    return [
+        [row["rank"], row["candidate_name"], row["score"], row["record_id"]]
+        for row in get_db().get_leaderboard(position)
+    ]
+
+
+def get_record_choices():
+    """History records as (label, ID) choices for the compare selector"""
+    import gradio as gr
+    get_db().flush()
+    return gr.update(choices=[
+        (f"#{r.id} · {r.candidate_name} · {r.position} · {r.score}", r.id)
+        for r in get_db().get_all_records()
+    ])
+
+
+def compare_selected(record_ids, jd_text, model):
+    """Compare selected history records from their stored summaries"""
+    from core.comparison import compare_records
+
+    if not record_ids or len(record_ids) < 2:
+        return "Select at least two candidates", ""
+    get_db().flush()
+    try:
+        with metrics.run():
+            result, cached = compare_records(
+                create_ai_client(load_saved_settings()), get_db(),
+                [int(i) for i in record_ids], model.lower(), jd_text=(jd_text or "").strip() or None
+            )
+    except Exception as e:
+        return f"Error: {str(e)}", f"❌ Error: {str(e)}"
+    return result, "✅ From cache" if cached else f"✅ Compared {len(record_ids)} candidates"
+
+
+def compare_top_candidates(position, k, model):
+    """Compare the top-K candidates of a position (cached until the top-K changes)"""
+    from core.comparison import compare_top_k
+
+    if not position:
+        return "Select a position", ""
+    get_db().flush()
+    try:
+        with metrics.run():
+            result, cached = compare_top_k(
+                create_ai_client(load_saved_settings()), get_db(), position, int(k), model.lower()
+            )
+    except Exception as e:
+        return f"Error: {str(e)}", f"❌ Error: {str(e)}"
+    return result, "✅ From cache (top candidates unchanged)" if cached else "✅ Compared"
+
+
+def get_metrics_data():
+    """Get latency percentiles and cost summary for the Metrics tab"""
+    rows = [
+        [m["name"], m["count"], m.get("p50"), m.get("p95"), m.get("p99"),
+         m["errors"], m["cache_hits"]]
+        for m in get_db().get_latency_percentiles()
+    ]
+    cost = get_db().get_cost_summary()
+    summary = f"""**Candidates:** {cost['candidates']}
+**Total cost:** ${cost['total_cost']:.4f}
+**Cost per candidate:** ${cost['cost_per_candidate']:.4f}
+**AI calls per candidate:** {cost['calls_per_candidate']:.1f}
+**Tokens:** {cost['input_tokens']:,} in / {cost['output_tokens']:,} out"""
+
+    slim = get_slim_stats()
+    if slim["count"]:
+        saved = slim["original_bytes"] - slim["slim_bytes"]
+        summary += (
+            f"\n**PDF slimming (this session):** {slim['count']} PDFs, "
+            f"{saved / 1024:,.0f} KB saved "
+            f"({saved / slim['original_bytes']:.0%}), "
+            f"{slim['total_ms'] / slim['count']:.0f} ms avg"
+        )
+
+    consensus = get_consensus_stats()
+    if consensus.get("runs"):
+        summary += (
+            f"\n**Consensus scoring (this session):** {consensus['runs']} CVs, "
+            f"{consensus['avg_samples']:.1f} samples avg, "
+            f"{consensus.get('extended', 0)} needed extra samples"
+        )
+
+    profile = profiling.get_profiling_stats()
+    if profile["enabled"] or profile.get("profiled"):
+        summary += (
+            f"\n**Profiling:** {'on' if profile['enabled'] else 'off'} "
+            f"({profile['sample_rate']:.0%} of requests), {profile.get('profiled', 0)} "
+            f"profiles written to data/profiles"
+        )
+
+    bank = get_question_bank_stats()
+    if bank["runs"]:
+        summary += (
+            f"\n**Question bank (this session):** {bank['reused']} reused / "
+            f"{bank['generated']} generated ({bank['reuse_ratio']:.0%} reuse)"
+        )
+        if bank["est_saved_ms"] is not None and bank["est_saved_ms"] > 0:
+            summary += f", ~{bank['est_saved_ms'] / 1000:.0f}s generation time saved"
+    return rows, summary
+
+
+def report_translator(language: str):
+    """Translator for a report's generated text (None when no translation is needed).
+
+    Uses the default model from Settings; results are cached in the database.
+    """
+    if language == SOURCE_LANGUAGE:
+        return None
+    settings = load_saved_settings()
+    ai_client = create_ai_client(settings)
+    model = (settings.default_model or "gemini").lower()
+    return lambda texts: translate_texts(ai_client, texts, language, model, get_db())
+
+
+@profiling.profiled("view_record")
+def view_record(record_id, language: str = "en"):
+    """View a saved record's report in a language"""
     if not record_id:
         return "Select a record to view"
-    record = db.get_record(int(record_id))
+    get_db().flush()
+    record = get_db().get_record(int(record_id))
     if record:
-        return record.questions
+        return render_markdown(record, language, report_translator(language))
     return "Record not found"
 
 
+@profiling.profiled("delete_record")
 def delete_record(record_id):
     """Delete a record"""
     if record_id:
-        db.delete_record(int(record_id))
+        get_db().delete_record(int(record_id))
     return get_history_data()
 
 
-def create_md_download(content: str, candidate_name: str, language: str = "en"):
-    """Create downloadable markdown file with bilingual headers"""
-    if not content or content.startswith("Error"):
+@profiling.profiled("create_md_download")
+def create_md_download(record_id, language: str = "en", fmt: str = "md"):
+    """Render a saved record's report (localized headings) into a download file"""
+    if not record_id:
         return None
+    get_db().flush()
+    record = get_db().get_record(int(record_id))
+    if record is None:
+        return None
+    return export_report(record, fmt, language, report_translator(language))
+
+
+@profiling.profiled("export_history")
+def export_history(record_ids, position, min_score, fmt, language: str = "en"):
+    """Export selected records, or all records matching the filters, as one ZIP.
+
+    Returns:
+        (ZIP file path or None, status message)
+    """
+    get_db().flush()
+    if record_ids:
+        ids = [int(i) for i in record_ids]
+    else:
+        ids = get_db().get_record_ids(
+            position=position or None,
+            min_score=int(min_score) if min_score else None
+        )
+    if not ids:
+        return None, "No records match"
+    start = time.perf_counter()
+    translate = report_translator(language) if fmt.lower() == "md" else None
+    path, count = export_zip(get_db().iter_records(ids), fmt.lower(), language, translate)
+    return path, f"✅ Exported {count} report(s) in {time.perf_counter() - start:.1f}s"
 
-    # Bilingual headers mapping
-    headers = {
-        "en": {
-            "interview_questions": "Interview Questions",
-            "position": "Position",
-            "generated": "Generated",
-            "score": "Score",
-            "cv_summary": "CV Summary",
-            "job_description": "Job Description",
-            "questions": "Interview Questions",
-            "score_breakdown": "Score Breakdown",
-            "footer": "Generated by Interviewer Helper"
-        },
-        "vi": {
-            "interview_questions": "Câu Hỏi Phỏng Vấn",
-            "position": "Vị Trí",
-            "generated": "Ngày Tạo",
-            "score": "Điểm",
-            "cv_summary": "Tóm Tắt CV",
-            "job_description": "Mô Tả Công Việc",
-            "questions": "Câu Hỏi Phỏng Vấn",
-            "score_breakdown": "Chi Tiết Điểm",
-            "footer": "Tạo bởi Interviewer Helper"
-        }
-    }
-
-    h = headers.get(language, headers["en"])
-
-    # Replace English headers with localized ones if Vietnamese
-    if language == "vi":
-        content = content.replace("# Interview Questions:", f"# {h['interview_questions']}:")
-        content = content.replace("**Position:**", f"**{h['position']}:**")
-        content = content.replace("**Generated:**", f"**{h['generated']}:**")
-        content = content.replace("**Score:**", f"**{h['score']}:**")
-        content = content.replace("## CV Summary", f"## {h['cv_summary']}")
-        content = content.replace("## Job Description", f"## {h['job_description']}")
-        content = content.replace("## Interview Questions", f"## {h['questions']}")
-        content = content.replace("## Score Breakdown", f"## {h['score_breakdown']}")
-        content = content.replace("*Generated by Interviewer Helper*", f"*{h['footer']}*")
-
-    # Create temp file
-    safe_name = "".join(c for c in (candidate_name or "candidate") if c.isalnum() or c in " -_").strip()
-    safe_name = safe_name.replace(" ", "_") or "interview"
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M")
-    filename = f"{safe_name}_{timestamp}.md"
-
-    # Write to temp file
-    temp_dir = tempfile.gettempdir()
-    filepath = Path(temp_dir) / filename
-    filepath.write_text(content, encoding="utf-8")
 
-    return str(filepath)
+def load_initial_state():
+    """Load settings, history and metrics once the UI is shown"""
+    start = time.perf_counter()
+    settings = load_saved_settings()
+    set_language(settings.language or "en")
+    apply_profiling_settings(settings)
+    history = get_history_data()
+    metrics_rows, metrics_summary = get_metrics_data()
+    positions = get_position_choices()
+    records = get_record_choices()
+    logger.info("Startup: initial data load %.0f ms (deferred)",
+                (time.perf_counter() - start) * 1000)
+    return (
+        settings.language or "en",
+        settings.claude_api_key,
+        settings.gemini_api_key,
+        settings.default_model.capitalize() if settings.default_model else "Gemini",
+        settings.language or "en",
+        int(float(settings.auto_reject_coverage or 0)),
+        settings.reuse_questions == "1",
+        settings.consensus_scoring == "1",
+        settings.profiling == "1",
+        float(settings.profile_sample_rate or 0),
+        int(settings.retention_days or 0),
+        settings.retention_positions,
+        history,
+        positions,
+        positions,
+        positions,
+        records,
+        records,
+        metrics_rows,
+        metrics_summary,
+    )
 
 
 def build_app():
-    """Build Gradio interface"""
-    settings = load_saved_settings()
+    """Build Gradio interface.
+
+    Settings, history and metrics are filled in by `load_initial_state`
+    after the page loads instead of before the window appears.
+    """
+    import gradio as gr
 
     with gr.Blocks(title="Interviewer Helper", theme=gr.themes.Soft()) as app:
         gr.Markdown("# 🎯 Interviewer Helper")
@@ -270,7 +742,7 @@ def build_app():
                             placeholder="e.g., Senior Backend Developer"
                         )
                         model_select = gr.Radio(
-                            choices=["Gemini", "Claude"],
+                            choices=MODEL_CHOICES,
                             value="Gemini",
                             label="AI Model"
                         )
@@ -319,53 +791,114 @@ def build_app():
                             outputs=[jd_text, structured_group]
                         )
 
+                reuse_duplicates = gr.Checkbox(
+                    label="Reuse near-duplicate results",
+                    info="For a CV nearly identical to a saved one: show the saved result if "
+                         "JD and position match, otherwise reuse its CV summary and only "
+                         "generate questions and score",
+                    value=False
+                )
                 generate_btn = gr.Button("🚀 Generate Questions", variant="primary")
                 status = gr.Textbox(label="Status", interactive=False)
 
                 output_md = gr.Markdown(label="Generated Questions")
-                output_content_state = gr.State("")  # Store generated content for download
+                result_record_state = gr.State(None)  # Saved record of the result, for download
 
                 with gr.Row():
                     download_btn = gr.Button("📥 Download .md")
                     download_file = gr.File(label="Download", visible=False)
 
-                # Hidden inputs for API keys and language
-                claude_key_state = gr.State(settings.claude_api_key)
-                gemini_key_state = gr.State(settings.gemini_api_key)
-                language_state = gr.State(settings.language or "en")
+                with gr.Row():
+                    job_id_input = gr.Number(label="Job ID", precision=0)
+                    check_job_btn = gr.Button("🔎 Check Job")
+                    retry_job_btn = gr.Button("🔁 Retry Job")
+
+                # Hidden input for language
+                language_state = gr.State("en")
 
                 def process_and_store(pdf_file, jd_text, jd_required, jd_nice_to_have,
-                                      jd_experience, jd_mode, model, name, pos,
-                                      claude_key, gemini_key):
-                    """Process CV and return result + store content"""
-                    output, stat = process_cv(
+                                      jd_experience, jd_mode, model, name, pos, reuse):
+                    """Queue CV for processing and stream job status + store content"""
+                    if pdf_file is None:
+                        yield gr.update(), "❌ Please upload a CV", gr.update(), gr.update()
+                        return
+                    from core.pdf_parser import extract_text_from_pdf
+
+                    cv_text = extract_text_from_pdf(pdf_file.name)
+                    duplicate = find_near_duplicate(cv_text)
+                    seed = None
+                    note = ""
+                    if duplicate:
+                        record, sim = duplicate
+                        jd_full = build_jd_text(jd_mode, jd_text, jd_required, jd_nice_to_have,
+                                                jd_experience)
+                        same_job = (record.jd_hash == jd_hash(jd_full)
+                                    and record.position == (pos or "Unknown"))
+                        if reuse and same_job:
+                            yield render_record(record), (
+                                f"♻️ {sim:.0%} match with saved record #{record.id} "
+                                f"({record.candidate_name}) for the same JD and position - "
+                                "showing its result. Untick 'Reuse near-duplicate results' "
+                                "to process anyway."
+                            ), record.id, gr.update()
+                            return
+                        if reuse and record.cv_summary != PRESCREEN_REJECTED_TEXT:
+                            seed = {"cv_text": cv_text, "cv_summary": record.cv_summary}
+                            note = f" · ♻️ CV summary reused from record #{record.id}"
+                        else:
+                            note = (f" · ♻️ {sim:.0%} match with saved record #{record.id} "
+                                    f"({record.candidate_name}"
+                                    f"{', same JD and position' if same_job else ''}), "
+                                    "see History")
+                    job_id = enqueue_cv(
                         pdf_file, jd_text, jd_required, jd_nice_to_have,
-                        jd_experience, jd_mode, model, name, pos,
-                        claude_key, gemini_key
+                        jd_experience, jd_mode, model, name, pos, state=seed
                     )
-                    return output, stat, output  # Third output is for state
+                    for output, stat, done in watch_job(job_id):
+                        # Third output is for state: the record saved when the job finished
+                        yield (output, stat + note,
+                               job_record_id(job_id) if done else gr.update(), job_id)
+
+                def check_job(job_id):
+                    for output, stat, done in watch_job(job_id):
+                        yield output, stat, job_record_id(job_id) if done else gr.update()
+
+                def retry(job_id):
+                    if job_id and get_job_queue().retry(int(job_id)):
+                        yield from check_job(job_id)
+                    else:
+                        yield gr.update(), "Only failed jobs can be retried", gr.update()
 
                 generate_btn.click(
                     process_and_store,
                     inputs=[
                         pdf_input, jd_text, jd_required, jd_nice_to_have,
                         jd_experience, jd_mode, model_select,
-                        candidate_name, position,
-                        claude_key_state, gemini_key_state
+                        candidate_name, position, reuse_duplicates
                     ],
-                    outputs=[output_md, status, output_content_state]
+                    outputs=[output_md, status, result_record_state, job_id_input]
+                )
+                check_job_btn.click(
+                    check_job,
+                    inputs=[job_id_input],
+                    outputs=[output_md, status, result_record_state]
+                )
+                retry_job_btn.click(
+                    retry,
+                    inputs=[job_id_input],
+                    outputs=[output_md, status, result_record_state]
                 )
 
-                def handle_download(content, name, lang):
+                def handle_download(record_id, lang):
                     """Handle download button click"""
-                    filepath = create_md_download(content, name, lang)
+                    filepath = create_md_download(record_id, lang)
                     if filepath:
                         return gr.update(value=filepath, visible=True)
                     return gr.update(visible=False)
 
                 download_btn.click(
                     handle_download,
-                    inputs=[output_content_state, candidate_name, language_state],
+                    inputs=[result_record_state, language_state],
                     outputs=[download_file]
                 )
 
@@ -373,7 +906,7 @@ def build_app():
             with gr.Tab("📚 History"):
                 history_table = gr.Dataframe(
                     headers=["Date", "Candidate", "Position", "Score", "ID"],
-                    value=get_history_data(),
+                    value=[],
                     interactive=False
                 )
                 refresh_btn = gr.Button("🔄 Refresh")
@@ -381,66 +914,299 @@ def build_app():
 
                 with gr.Row():
                     record_id_input = gr.Number(label="Record ID", precision=0)
+                    view_language = gr.Radio(
+                        choices=[(name, code) for code, name in LANGUAGES.items()],
+                        value="en", label="Report language"
+                    )
                     view_btn = gr.Button("👁️ View")
                     delete_btn = gr.Button("🗑️ Delete", variant="stop")
 
                 record_view = gr.Markdown()
 
-                view_btn.click(view_record, inputs=[record_id_input], outputs=[record_view])
+                view_btn.click(
+                    view_record, inputs=[record_id_input, view_language], outputs=[record_view]
+                )
+                view_language.change(
+                    view_record, inputs=[record_id_input, view_language], outputs=[record_view]
+                )
                 delete_btn.click(delete_record, inputs=[record_id_input], outputs=[history_table])
 
-            # Tab 3: Compare (placeholder)
+                with gr.Accordion("📦 Export Reports", open=False):
+                    gr.Markdown(
+                        "Download reports as one ZIP: the selected records, or every "
+                        "record matching the filters when none are selected."
+                    )
+                    export_records_input = gr.Dropdown(
+                        label="Records", choices=[], multiselect=True
+                    )
+                    with gr.Row():
+                        export_position = gr.Dropdown(
+                            label="Position", choices=[], allow_custom_value=True
+                        )
+                        export_min_score = gr.Number(label="Minimum score", precision=0)
+                        export_format = gr.Radio(
+                            choices=["MD", "JSON"], value="MD", label="Format"
+                        )
+                    export_btn = gr.Button("📦 Export ZIP")
+                    export_status = gr.Textbox(label="Status", interactive=False)
+                    export_file = gr.File(label="Download")
+
+                def handle_export(record_ids, position, min_score, fmt, lang):
+                    return export_history(record_ids, position, min_score, fmt, lang)
+
+                export_btn.click(
+                    handle_export,
+                    inputs=[export_records_input, export_position, export_min_score,
+                            export_format, language_state],
+                    outputs=[export_file, export_status]
+                )
+
+                refresh_btn.click(get_record_choices, outputs=[export_records_input])
+                refresh_btn.click(get_position_choices, outputs=[export_position])
+
+                with gr.Accordion("🗄️ Archive", open=False):
+                    gr.Markdown(
+                        "Old records are moved to compressed per-year archive databases "
+                        "(automatically at startup when a retention age is set in Settings). "
+                        "Archived records are no longer listed above but can be searched here."
+                    )
+                    with gr.Row():
+                        archive_days = gr.Number(
+                            label="Archive records older than (days)", value=365,
+                            minimum=1, precision=0
+                        )
+                        archive_positions = gr.Textbox(
+                            label="Positions", placeholder="Comma-separated; empty means all"
+                        )
+                        archive_btn = gr.Button("🗄️ Archive Now")
+                    archive_status = gr.Textbox(label="Status", interactive=False)
+                    with gr.Row():
+                        archive_query = gr.Textbox(label="Search name or position")
+                        archive_content = gr.Checkbox(
+                            label="Also search CV and report text (slower)", value=False
+                        )
+                        archive_search_btn = gr.Button("🔍 Search")
+                    archive_table = gr.Dataframe(
+                        headers=["Year", "ID", "Candidate", "Position", "Score", "Date"],
+                        interactive=False
+                    )
+                    with gr.Row():
+                        archive_year_input = gr.Number(label="Year", precision=0)
+                        archive_id_input = gr.Number(label="Record ID", precision=0)
+                        archive_view_btn = gr.Button("👁️ View")
+                    archive_view = gr.Markdown()
+
+                archive_btn.click(
+                    archive_old_records, inputs=[archive_days, archive_positions],
+                    outputs=[archive_status]
+                ).then(get_history_data, outputs=[history_table])
+                archive_search_btn.click(
+                    search_archive, inputs=[archive_query, archive_content],
+                    outputs=[archive_table]
+                )
+                archive_view_btn.click(
+                    view_archived_record, inputs=[archive_year_input, archive_id_input],
+                    outputs=[archive_view]
+                )
+
+                with gr.Accordion("🔁 Re-score Position", open=False):
+                    gr.Markdown(
+                        "Re-score saved candidates against an edited JD. Stored CV "
+                        "summaries are reused; only candidates scored against a "
+                        "different JD are updated, and old scores are kept in the audit trail."
+                    )
+                    with gr.Row():
+                        rescore_position_input = gr.Dropdown(
+                            label="Position", choices=[], allow_custom_value=True
+                        )
+                        rescore_model = gr.Radio(
+                            choices=MODEL_CHOICES, value="Gemini", label="AI Model"
+                        )
+                    rescore_jd = gr.Textbox(label="Updated Job Description", lines=8)
+                    rescore_questions = gr.Checkbox(
+                        label="Also regenerate interview questions", value=False
+                    )
+                    rescore_btn = gr.Button("🔁 Re-score", variant="primary")
+                    rescore_status = gr.Textbox(label="Status", interactive=False)
+
+                def handle_rescore(position, jd, model, regenerate, progress=gr.Progress()):
+                    return rescore_position(position, jd, model, regenerate, progress)
+
+                refresh_btn.click(get_position_choices, outputs=[rescore_position_input])
+                rescore_btn.click(
+                    handle_rescore,
+                    inputs=[rescore_position_input, rescore_jd, rescore_model, rescore_questions],
+                    outputs=[rescore_status, history_table]
+                )
+
+            # Tab 3: Compare
             with gr.Tab("📊 Compare CVs"):
-                gr.Markdown("### Compare Multiple CVs")
-                gr.Markdown("*Coming soon - Select CVs from history to compare side-by-side*")
+                gr.Markdown("### Leaderboard")
+                with gr.Row():
+                    compare_position = gr.Dropdown(
+                        label="Position", choices=[], allow_custom_value=True
+                    )
+                    top_k = gr.Slider(2, 10, value=5, step=1, label="Compare top K")
+                    compare_model = gr.Radio(
+                        choices=MODEL_CHOICES, value="Gemini", label="AI Model"
+                    )
+                leaderboard_table = gr.Dataframe(
+                    headers=["Rank", "Candidate", "Score", "ID"],
+                    value=[],
+                    interactive=False
+                )
+                compare_top_btn = gr.Button("📊 Compare Top K", variant="primary")
 
-            # Tab 4: Settings
+                gr.Markdown("### Compare Selected Candidates")
+                compare_records_input = gr.Dropdown(
+                    label="Candidates from history", choices=[], multiselect=True
+                )
+                compare_jd = gr.Textbox(
+                    label="Job Description (optional - defaults to the newest selected record's JD)",
+                    lines=4
+                )
+                with gr.Row():
+                    compare_selected_btn = gr.Button("📊 Compare Selected", variant="primary")
+                    compare_choices_btn = gr.Button("🔄 Refresh List")
+
+                compare_status = gr.Textbox(label="Status", interactive=False)
+                compare_output = gr.Markdown()
+
+                compare_choices_btn.click(get_record_choices, outputs=[compare_records_input])
+                compare_selected_btn.click(
+                    compare_selected,
+                    inputs=[compare_records_input, compare_jd, compare_model],
+                    outputs=[compare_output, compare_status]
+                )
+
+                compare_position.change(
+                    get_leaderboard_data, inputs=[compare_position], outputs=[leaderboard_table]
+                )
+                compare_top_btn.click(
+                    compare_top_candidates,
+                    inputs=[compare_position, top_k, compare_model],
+                    outputs=[compare_output, compare_status]
+                ).then(get_leaderboard_data, inputs=[compare_position], outputs=[leaderboard_table])
+
+            # Tab 4: Metrics
+            with gr.Tab("📈 Metrics"):
+                metrics_table = gr.Dataframe(
+                    headers=["Stage", "Count", "p50 (ms)", "p95 (ms)", "p99 (ms)", "Errors", "Cache Hits"],
+                    value=[],
+                    interactive=False
+                )
+                cost_md = gr.Markdown()
+                metrics_refresh_btn = gr.Button("🔄 Refresh")
+                metrics_refresh_btn.click(get_metrics_data, outputs=[metrics_table, cost_md])
+
+            # Tab 5: Settings
             with gr.Tab("⚙️ Settings"):
                 claude_key_input = gr.Textbox(
                     label="Claude API Key",
-                    value=settings.claude_api_key,
                     type="password"
                 )
                 gemini_key_input = gr.Textbox(
                     label="Gemini API Key",
-                    value=settings.gemini_api_key,
                     type="password"
                 )
                 default_model_input = gr.Radio(
-                    choices=["Gemini", "Claude"],
-                    value=settings.default_model.capitalize() if settings.default_model else "Gemini",
+                    choices=MODEL_CHOICES,
+                    value="Gemini",
                     label="Default AI Model"
                 )
                 language_input = gr.Dropdown(
                     choices=list(LANGUAGES.keys()),
-                    value=settings.language or "en",
+                    value="en",
                     label="Language"
                 )
+                auto_reject_input = gr.Number(
+                    label="Auto-reject below required-skill coverage (%)",
+                    info="Structured JDs only. Candidates below this share of required skills "
+                         "are rejected before any AI call. 0 disables.",
+                    value=0, minimum=0, maximum=100, precision=0
+                )
+                reuse_questions_input = gr.Checkbox(
+                    label="Reuse questions from the question bank",
+                    info="Fill scenario and generic question categories with previously "
+                         "generated questions and only generate the rest.",
+                    value=False
+                )
+                consensus_input = gr.Checkbox(
+                    label="Consensus scoring",
+                    info="Score each CV from several parallel samples and use the median; "
+                         "more samples run only when they disagree.",
+                    value=False
+                )
+                with gr.Row():
+                    profiling_input = gr.Checkbox(
+                        label="Profile requests",
+                        info="Write cProfile and memory allocation reports for sampled "
+                             "requests to data/profiles (IH_PROFILE overrides).",
+                        value=False
+                    )
+                    profile_rate_input = gr.Number(
+                        label="Profile sample rate", value=0.1, minimum=0, maximum=1
+                    )
+                with gr.Row():
+                    retention_days_input = gr.Number(
+                        label="Archive records older than (days)",
+                        info="Applied at startup; archived records move to data/archive and "
+                             "stay searchable in History. 0 disables.",
+                        value=0, minimum=0, precision=0
+                    )
+                    retention_positions_input = gr.Textbox(
+                        label="Archive only positions",
+                        placeholder="Comma-separated; empty means all positions"
+                    )
 
                 save_btn = gr.Button("💾 Save Settings", variant="primary")
                 settings_status = gr.Textbox(label="Status", interactive=False)
 
                 save_btn.click(
                     save_settings,
-                    inputs=[claude_key_input, gemini_key_input, default_model_input, language_input],
+                    inputs=[claude_key_input, gemini_key_input, default_model_input, language_input,
+                            auto_reject_input, reuse_questions_input, consensus_input,
+                            profiling_input, profile_rate_input, retention_days_input,
+                            retention_positions_input],
                     outputs=[settings_status]
                 )
 
                 # Update state when settings saved
-                def update_states(claude, gemini, lang):
-                    return claude, gemini, lang
+                def update_states(lang):
+                    return lang
 
                 save_btn.click(
                     update_states,
-                    inputs=[claude_key_input, gemini_key_input, language_input],
-                    outputs=[claude_key_state, gemini_key_state, language_state]
+                    inputs=[language_input],
+                    outputs=[language_state]
                 )
 
+        app.load(
+            load_initial_state,
+            outputs=[
+                language_state,
+                claude_key_input, gemini_key_input, default_model_input, language_input,
+                auto_reject_input, reuse_questions_input, consensus_input, profiling_input,
+                profile_rate_input, retention_days_input, retention_positions_input, history_table,
+                rescore_position_input,
+                compare_position, export_position, compare_records_input, export_records_input,
+                metrics_table, cost_md
+            ]
+        )
+
     return app
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    imports_done = time.perf_counter()
+    start_background_tasks()
     app = build_app()
+    built = time.perf_counter()
+    logger.info(
+        "Startup: imports %.0f ms, build_app %.0f ms (UI deps loaded here), total %.0f ms",
+        (imports_done - _START) * 1000, (built - imports_done) * 1000, (built - _START) * 1000
+    )
     app.launch(
         server_name="127.0.0.1",
         server_port=7860,
@@ -0,0 +1,200 @@
+"""End-to-end concurrency load test using the offline fake LLM provider.
+
+Drives the Generate path of the UI - `app.enqueue_cv` followed by
+`app.watch_job` - with N simulated concurrent users against a temporary
+database and job directory. The background job queue runs the pipeline,
+so --workers bounds concurrency just as IH_JOB_WORKERS does in the app.
+Reports throughput, latency percentiles, provider errors and SQLite lock
+contention. No API keys or network are needed.
+
+Usage:
+    python benchmarks/load_test.py --users 20 --requests 5 --workers 8
+    python benchmarks/load_test.py --users 50 --latency uniform:200:800 --error-rate 0.05
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+
+# Allow running as a script from the repo root
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from run_benchmarks import make_text_pdf
+
+JD_TEXT = """Senior Backend Engineer
+Required: Python, PostgreSQL, Kubernetes, 5+ years building APIs.
+Nice to have: Go, Kafka, AWS."""
+
+
+def _percentile(samples: list[float], p: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class LockStats:
+    """Counts SQLite lock waits and failures on the instrumented database"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.save_ms = []
+        self.locked_errors = 0
+        self.metric_write_errors = 0
+
+    def add_save(self, ms: float):
+        with self.lock:
+            self.save_ms.append(ms)
+
+    def add_locked(self):
+        with self.lock:
+            self.locked_errors += 1
+
+
+def instrument_database(db, stats: LockStats):
+    """Wrap save/metric writes to measure time spent waiting on SQLite locks.
+
+    Save latency is measured where job workers save (`finish_job`, the
+    record insert plus the job update in one transaction).
+    """
+    save = db.finish_job
+    record_metric = db.record_metric
+
+    def timed_save(job_id, record):
+        start = time.perf_counter()
+        try:
+            return save(job_id, record)
+        except sqlite3.OperationalError as e:
+            if "locked" in str(e):
+                stats.add_locked()
+            raise
+        finally:
+            stats.add_save((time.perf_counter() - start) * 1000)
+
+    def checked_record_metric(event):
+        try:
+            record_metric(event)
+        except sqlite3.OperationalError as e:
+            with stats.lock:
+                stats.metric_write_errors += 1
+            if "locked" in str(e):
+                stats.add_locked()
+            raise
+
+    db.finish_job = timed_save
+    db.record_metric = checked_record_metric
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the job queue with a fake LLM")
+    parser.add_argument("--users", type=int, default=10, help="Concurrent simulated users")
+    parser.add_argument("--requests", type=int, default=3, help="Requests per user")
+    parser.add_argument("--workers", type=int, default=4, help="Job queue worker threads")
+    parser.add_argument("--latency", default="lognormal:300:0.5",
+                        help="Fake LLM latency spec (see core/fake_llm.py)")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Fake LLM error probability per call")
+    parser.add_argument("--pages", type=int, default=2, help="Pages per synthetic CV")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--write-behind", action="store_true",
+                        help="Batch metric events through the write-behind writer, as the app does")
+    parser.add_argument("--json", type=Path, help="Also write the report as JSON")
+    args = parser.parse_args()
+
+    os.environ["IH_FAKE_LATENCY"] = args.latency
+    os.environ["IH_FAKE_ERROR_RATE"] = str(args.error_rate)
+    os.environ["IH_FAKE_SEED"] = str(args.seed)
+    os.environ["IH_JOB_WORKERS"] = str(args.workers)
+
+    import app
+    # watch_job imports gradio lazily; the running app has it loaded already
+    import gradio  # noqa: F401
+    from core import metrics
+    from storage.database import Database
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        pdf_path = tmp / "cv.pdf"
+        make_text_pdf(pdf_path, args.pages, random.Random(args.seed))
+
+        # Point the app at a throwaway database and job directory
+        stats = LockStats()
+        app.db = Database(tmp / "history.db")
+        app.JOB_DIR = tmp / "jobs"
+        app._job_queue = None
+        instrument_database(app.db, stats)
+        if args.write_behind:
+            app.db.enable_write_behind()
+        metrics.set_sink(app.db.record_metric)
+
+        latencies = []
+        failures = []
+        results_lock = threading.Lock()
+
+        def user(user_id: int):
+            for n in range(args.requests):
+                start = time.perf_counter()
+                job_id = app.enqueue_cv(
+                    SimpleNamespace(name=str(pdf_path)), JD_TEXT, "", "", 0,
+                    "Free Text", "Fake", f"User {user_id}-{n}", "Backend"
+                )
+                # watch_job streams per-stage updates until the job is done or failed
+                for _, status, _ in app.watch_job(job_id, poll_seconds=0.05):
+                    pass
+                elapsed = (time.perf_counter() - start) * 1000
+                with results_lock:
+                    latencies.append(elapsed)
+                    if status.startswith("❌"):
+                        failures.append(app.db.get_job(job_id).error)
+
+        print(f"Running {args.users} users x {args.requests} requests on {args.workers} "
+              f"workers (latency={args.latency}, error_rate={args.error_rate})...")
+        wall_start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.users) as pool:
+            list(pool.map(user, range(args.users)))
+        app.db.close()  # flush write-behind metric events before stopping the clock
+        wall = time.perf_counter() - wall_start
+
+        total = len(latencies)
+        report = {
+            "users": args.users,
+            "workers": args.workers,
+            "write_behind": args.write_behind,
+            "requests": total,
+            "wall_seconds": round(wall, 2),
+            "throughput_rps": round(total / wall, 3) if wall else 0.0,
+            "latency_ms": {
+                "p50": round(_percentile(latencies, 50)),
+                "p99": round(_percentile(latencies, 99)),
+                "max": round(max(latencies, default=0)),
+            },
+            "failed_requests": len(failures),
+            "failure_reasons": sorted(set(failures))[:5],
+            "db": {
+                "save_p50_ms": round(_percentile(stats.save_ms, 50), 2),
+                "save_p99_ms": round(_percentile(stats.save_ms, 99), 2),
+                "save_max_ms": round(max(stats.save_ms, default=0), 2),
+                "save_mean_ms": round(statistics.fmean(stats.save_ms), 2) if stats.save_ms else 0.0,
+                "locked_errors": stats.locked_errors,
+                "metric_write_errors": stats.metric_write_errors,
+            },
+        }
+
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,262 @@
+"""Offline micro-benchmarks for PDF parsing, storage and encryption hot paths.
+
+Usage:
+    python benchmarks/run_benchmarks.py                  # full suite
+    python benchmarks/run_benchmarks.py --quick          # smaller sizes
+    python benchmarks/run_benchmarks.py --only storage   # one group
+    python benchmarks/run_benchmarks.py --save-baseline  # update baseline
+
+Results are written as JSON and compared against benchmarks/baseline.json.
+The exit code is 1 when any benchmark is slower than the baseline by more
+than --threshold.
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Allow running as a script from the repo root
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import fitz  # PyMuPDF
+
+from core.encryption import decrypt, derive_key, encrypt
+from core.pdf_parser import extract_text_from_pdf, pdf_to_base64_images, pdf_to_images
+from storage.database import Database
+from storage.models import CVRecord, Settings
+
+
+BENCH_DIR = Path(__file__).parent
+BASELINE_FILE = BENCH_DIR / "baseline.json"
+RESULTS_FILE = BENCH_DIR / "results" / "latest.json"
+
+PDF_PAGES = [1, 10, 50]
+PDF_PAGES_QUICK = [1, 10]
+DB_ROWS = [1_000, 10_000, 100_000]
+DB_ROWS_QUICK = [1_000, 10_000]
+
+_WORDS = (
+    "python backend api microservices kubernetes docker postgresql redis "
+    "aws azure ci cd testing leadership mentoring architecture scalability "
+    "performance monitoring agile scrum react typescript graphql kafka"
+).split()
+
+
+def _timeit(fn, repeat: int) -> dict:
+    """Run fn `repeat` times and summarize wall time in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "repeat": repeat,
+        "min_ms": round(min(samples), 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+    }
+
+
+def _lorem(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words))
+
+
+def make_text_pdf(path: Path, pages: int, rng: random.Random):
+    """Create a PDF with a text layer, ~500 words per page"""
+    with fitz.open() as doc:
+        for _ in range(pages):
+            page = doc.new_page()
+            rect = fitz.Rect(50, 50, page.rect.width - 50, page.rect.height - 50)
+            page.insert_textbox(rect, _lorem(rng, 500), fontsize=9)
+        doc.save(path)
+
+
+def make_scanned_pdf(path: Path, pages: int, rng: random.Random):
+    """Create an image-only PDF by rasterizing a text page onto each page"""
+    with fitz.open() as src:
+        page = src.new_page()
+        rect = fitz.Rect(50, 50, page.rect.width - 50, page.rect.height - 50)
+        page.insert_textbox(rect, _lorem(rng, 500), fontsize=9)
+        png = page.get_pixmap(matrix=fitz.Matrix(2, 2)).tobytes("png")
+
+    with fitz.open() as doc:
+        for _ in range(pages):
+            page = doc.new_page()
+            page.insert_image(page.rect, stream=png)
+        doc.save(path)
+
+
+def bench_pdf(tmp: Path, quick: bool) -> dict:
+    """Benchmark text extraction and page rendering"""
+    rng = random.Random(42)
+    results = {}
+    for pages in (PDF_PAGES_QUICK if quick else PDF_PAGES):
+        text_pdf = tmp / f"text_{pages}.pdf"
+        scanned_pdf = tmp / f"scanned_{pages}.pdf"
+        make_text_pdf(text_pdf, pages, rng)
+        make_scanned_pdf(scanned_pdf, pages, rng)
+
+        repeat = 5 if pages < 50 else 2
+        results[f"extract_text/text/{pages}p"] = _timeit(
+            lambda: extract_text_from_pdf(str(text_pdf)), repeat)
+        results[f"extract_text/scanned/{pages}p"] = _timeit(
+            lambda: extract_text_from_pdf(str(scanned_pdf)), repeat)
+        results[f"to_images/scanned/{pages}p"] = _timeit(
+            lambda: pdf_to_base64_images(str(scanned_pdf)), max(1, repeat // 2))
+        results[f"to_images_raw/scanned/{pages}p"] = _timeit(
+            lambda: pdf_to_images(str(scanned_pdf)), max(1, repeat // 2))
+    return results
+
+
+def _seed_records(db: Database, rows: int, rng: random.Random):
+    """Bulk insert synthetic records, bypassing the per-row API"""
+    def gen():
+        for i in range(rows):
+            yield (
+                f"Candidate {i}", rng.choice(["Backend", "Frontend", "DevOps"]),
+                _lorem(rng, 400), _lorem(rng, 250), _lorem(rng, 150),
+                _lorem(rng, 300), rng.randint(0, 100), '{"overall_score": 50}'
+            )
+
+    with db._get_conn() as conn:
+        conn.executemany("""
+            INSERT INTO cv_records
+            (candidate_name, position, cv_text, cv_summary, jd_text, questions, score, score_breakdown)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, gen())
+        conn.commit()
+
+
+def bench_storage(tmp: Path, quick: bool) -> dict:
+    """Benchmark record save/list/get at increasing table sizes"""
+    rng = random.Random(7)
+    results = {}
+    for rows in (DB_ROWS_QUICK if quick else DB_ROWS):
+        db = Database(tmp / f"history_{rows}.db")
+        _seed_records(db, rows, rng)
+        record = CVRecord(
+            candidate_name="Bench", position="Backend",
+            cv_text=_lorem(rng, 400), cv_summary=_lorem(rng, 250),
+            jd_text=_lorem(rng, 150), questions=_lorem(rng, 300),
+            score=70, score_breakdown='{"overall_score": 70}'
+        )
+
+        # Each save commits (fsync), so the median needs more samples to be stable
+        results[f"save_cv_record/{rows}"] = _timeit(lambda: db.save_cv_record(record), 100)
+        results[f"get_all_records/{rows}"] = _timeit(
+            db.get_all_records, 3 if rows < 100_000 else 1)
+        results[f"get_all_records_full/{rows}"] = _timeit(
+            lambda: db.get_all_records(lazy=False), 3 if rows < 100_000 else 1)
+        results[f"get_record/{rows}"] = _timeit(
+            lambda: db.get_record(rng.randint(1, rows)), 50)
+    return results
+
+
+def bench_encryption(tmp: Path, quick: bool) -> dict:
+    """Benchmark API key encryption and encrypted settings load"""
+    token = encrypt("sk-test-" + "x" * 40)
+    db = Database(tmp / "settings.db")
+    db.save_settings(Settings(claude_api_key="sk-claude-test", gemini_api_key="gm-test"))
+    key = derive_key()
+
+    repeat = 2 if quick else 5
+    return {
+        # Each call derives the key with PBKDF2
+        "encrypt": _timeit(lambda: encrypt("sk-test-" + "x" * 40), repeat),
+        "decrypt": _timeit(lambda: decrypt(token), repeat),
+        # Key derived once by the caller (as load_settings does)
+        "decrypt_with_key": _timeit(lambda: decrypt(token, key=key), repeat),
+        "load_settings": _timeit(db.load_settings, repeat),
+    }
+
+
+GROUPS = {
+    "pdf": bench_pdf,
+    "storage": bench_storage,
+    "encryption": bench_encryption,
+}
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Compare median times against baseline.
+
+    Returns:
+        Names of benchmarks slower than baseline by more than threshold
+    """
+    regressions = []
+    base = baseline.get("benchmarks", {})
+    print(f"\n{'benchmark':45} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, current in sorted(results["benchmarks"].items()):
+        if name not in base:
+            print(f"{name:45} {'-':>12} {current['median_ms']:>10.2f}ms {'new':>8}")
+            continue
+        before = base[name]["median_ms"]
+        change = (current["median_ms"] - before) / before if before else 0.0
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:45} {before:>10.2f}ms {current['median_ms']:>10.2f}ms {change:>+7.0%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run offline micro-benchmarks")
+    parser.add_argument("--quick", action="store_true", help="Use smaller sizes")
+    parser.add_argument("--only", choices=list(GROUPS), action="append",
+                        help="Run only the given group (repeatable)")
+    parser.add_argument("--output", type=Path, default=RESULTS_FILE,
+                        help="Where to write JSON results")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE,
+                        help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.20,
+                        help="Allowed slowdown before flagging a regression (0.20 = 20%%)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Write results as the new baseline")
+    args = parser.parse_args()
+
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pymupdf": fitz.VersionBind,
+            "quick": args.quick,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "benchmarks": {},
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for group in args.only or GROUPS:
+            print(f"Running {group} benchmarks...")
+            for name, stats in GROUPS[group](Path(tmp), args.quick).items():
+                results["benchmarks"][f"{group}/{name}"] = stats
+                print(f"  {name}: median {stats['median_ms']:.2f}ms")
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(results, indent=2))
+    print(f"\nResults written to {args.output}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2))
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print("No baseline found - run with --save-baseline to create one")
+        return 0
+
+    regressions = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,306 @@
+"""Interviewer Helper - headless command line interface.
+
+Examples:
+    python cli.py batch --pdf-dir ./cvs --jd jd.md --position "Backend Developer"
+    python cli.py batch --pdf-dir ./cvs --jd jd.md --output results.jsonl --workers 8
+    python cli.py archive --older-than-days 365 --positions "Backend Developer"
+    python cli.py archive --search "Nguyen"
+    python cli.py export --output history.jsonl.gz
+    python cli.py import history.jsonl.gz
+
+Batch mode runs the full pipeline (parse, analyze, questions, score) for
+every PDF in a directory and prints one JSON line per candidate: failures
+as soon as they happen, results once their batch of records is saved to
+the history database. Ctrl-C stops CVs that have not started yet. Files
+whose hash is already in the history are skipped, so an interrupted run
+can simply be restarted.
+
+Archive mode moves old records into compressed per-year archive databases
+under data/archive and compacts the history database; with --search it
+lists matching archived records instead.
+
+Export and import move history between installs as JSON lines (gzipped
+when the file name ends in .gz): records plus settings, never API keys.
+Importing skips records that are already present, so it can be repeated.
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from core import metrics
+from core.ai_client import AIClient
+from core.pipeline import candidate_name_from_path, file_hash, jd_hash, run_pipeline
+from core.question_bank import structure_questions
+from core.skill_matcher import parse_skill_list
+from storage.database import Database
+from storage.models import CVRecord
+
+
+def _process_one(ai_client: AIClient, pdf_path: Path, digest: str, jd_full: str,
+                 model: str, position: str, skills: dict = None,
+                 consensus: bool = False) -> CVRecord:
+    """Run the pipeline for one PDF and build its history record"""
+    with metrics.run():
+        result = run_pipeline(ai_client, str(pdf_path), jd_full, model, skills=skills,
+                              consensus=consensus)
+    score_result = result["score_result"]
+    return CVRecord(
+        candidate_name=candidate_name_from_path(str(pdf_path)),
+        position=position or "Unknown",
+        cv_text=result["cv_text"],
+        cv_summary=result["cv_summary"],
+        jd_text=jd_full,
+        questions=result["questions"],
+        score=score_result.get("overall_score"),
+        score_breakdown=json.dumps(score_result, ensure_ascii=False),
+        file_hash=digest,
+        jd_hash=jd_hash(jd_full),
+        questions_data=json.dumps(structure_questions(result["questions"]), ensure_ascii=False),
+        score_variance=score_result.get("consensus", {}).get("variance")
+    )
+
+
+def run_batch(args) -> int:
+    """Process a directory of CVs against one JD"""
+    db = Database(args.db) if args.db else Database()
+    # Metric events are batched off the worker threads; records are saved below
+    db.enable_write_behind()
+    metrics.set_sink(db.record_metric)
+
+    settings = db.load_settings()
+    ai_client = AIClient(
+        claude_key=args.claude_key or os.getenv("ANTHROPIC_API_KEY") or settings.claude_api_key,
+        gemini_key=args.gemini_key or os.getenv("GEMINI_API_KEY") or settings.gemini_api_key
+    )
+    model = (args.model or settings.default_model or "gemini").lower()
+    jd_full = Path(args.jd).read_text(encoding="utf-8")
+    skills = None
+    if args.required_skills or args.nice_to_have:
+        skills = {
+            "required": parse_skill_list(args.required_skills),
+            "nice_to_have": parse_skill_list(args.nice_to_have),
+            "min_coverage": args.min_coverage / 100 if args.min_coverage else None,
+        }
+
+    # Skip files already in history (resume support)
+    done = db.get_processed_hashes()
+    pending = []
+    skipped = 0
+    for pdf_path in sorted(Path(args.pdf_dir).glob("*.pdf")):
+        digest = file_hash(str(pdf_path))
+        if digest in done:
+            skipped += 1
+            continue
+        done.add(digest)  # also skips duplicate files within this run
+        pending.append((pdf_path, digest))
+
+    print(f"{len(pending)} to process, {skipped} already done", file=sys.stderr)
+
+    out = open(args.output, "a", encoding="utf-8") if args.output else sys.stdout
+    batch = []
+    # Output lines of the records in batch, written only once it is saved, so
+    # a failed save leaves no lines that a resumed run would write again
+    batch_lines = []
+    failures = 0
+
+    def write(line):
+        out.write(json.dumps(line, ensure_ascii=False) + "\n")
+        out.flush()
+
+    def flush():
+        if batch:
+            db.save_cv_records(batch)
+            batch.clear()
+        for line in batch_lines:
+            write(line)
+        batch_lines.clear()
+
+    pool = ThreadPoolExecutor(max_workers=args.workers)
+    try:
+        futures = {
+            pool.submit(_process_one, ai_client, pdf_path, digest, jd_full, model,
+                        args.position, skills, args.consensus):
+                (pdf_path, digest)
+            for pdf_path, digest in pending
+        }
+        for future in as_completed(futures):
+            pdf_path, digest = futures[future]
+            line = {"file": pdf_path.name, "file_hash": digest}
+            try:
+                record = future.result()
+            except Exception as e:
+                failures += 1
+                line.update(status="error", error=str(e))
+                write(line)
+                continue
+
+            score_result = json.loads(record.score_breakdown)
+            line.update(
+                status="ok",
+                candidate_name=record.candidate_name,
+                position=record.position,
+                score=record.score,
+                recommendation=score_result.get("recommendation"),
+                summary=score_result.get("summary"),
+            )
+            if record.score_variance is not None:
+                line["score_variance"] = record.score_variance
+            if "skill_match" in score_result:
+                line["required_coverage"] = score_result["skill_match"]["required_coverage"]
+                line["auto_rejected"] = score_result.get("parse_status") == "auto_rejected"
+            batch.append(record)
+            batch_lines.append(line)
+            if len(batch) >= args.batch_size:
+                flush()
+    finally:
+        # On Ctrl-C, CVs not yet started are never sent to the LLM; calls
+        # already in flight finish but their results are dropped
+        pool.shutdown(wait=True, cancel_futures=True)
+        # Save whatever finished, even when interrupted
+        flush()
+        if out is not sys.stdout:
+            out.close()
+    # Near-duplicate signatures are computed once, after all saves
+    db.index_missing_signatures()
+    db.close()
+
+    print(f"Done: {len(pending) - failures} ok, {failures} failed", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def run_archive(args) -> int:
+    """Archive old records, or search the archives"""
+    db = Database(args.db) if args.db else Database()
+    if args.search is not None:
+        for row in db.search_archive(args.search, search_content=args.content, limit=args.limit):
+            print(json.dumps(row, ensure_ascii=False, default=str))
+        return 0
+    if args.older_than_days is None:
+        print("--older-than-days or --search is required", file=sys.stderr)
+        return 2
+
+    positions = [p.strip() for p in args.positions.split(",") if p.strip()]
+    moved = db.archive_records(args.older_than_days, positions or None)
+    if not moved:
+        # Still worth compacting space left by deletes
+        db.optimize()
+    for year, count in sorted(moved.items()):
+        print(f"{year}: {count} record(s) archived", file=sys.stderr)
+    print(f"Done: {sum(moved.values())} archived", file=sys.stderr)
+    return 0
+
+
+def _open_jsonl(path: str, mode: str):
+    """Open a JSONL file for text I/O; "-" is stdin/stdout, *.gz is gzipped"""
+    if path == "-":
+        return None
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", compresslevel=6, encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def run_export(args) -> int:
+    """Write history records and settings (without API keys) as JSON lines"""
+    db = Database(args.db) if args.db else Database()
+    out = _open_jsonl(args.output, "w") or sys.stdout
+    start = time.perf_counter()
+    try:
+        count = db.export_jsonl(out, position=args.position or None)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"Done: {count} record(s) exported in {time.perf_counter() - start:.1f}s",
+          file=sys.stderr)
+    return 0
+
+
+def run_import(args) -> int:
+    """Import history written by the export command"""
+    db = Database(args.db) if args.db else Database()
+    source = _open_jsonl(args.input, "r") or sys.stdin
+    start = time.perf_counter()
+    try:
+        stats = db.import_jsonl(source, apply_settings=not args.skip_settings,
+                                chunk_size=args.chunk_size)
+    except ValueError as e:
+        print(f"Import failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    print(f"Done: {stats['imported']} imported, {stats['skipped']} already present, "
+          f"{stats['settings']} setting(s) applied in {time.perf_counter() - start:.1f}s",
+          file=sys.stderr)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="interviewer-helper", description=__doc__.split("\n")[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    batch = sub.add_parser("batch", help="Screen a directory of CV PDFs against a JD")
+    batch.add_argument("--pdf-dir", required=True, help="Directory containing CV PDFs")
+    batch.add_argument("--jd", required=True, help="Job description text/markdown file")
+    batch.add_argument("--position", default="", help="Position name stored with each record")
+    batch.add_argument("--model", choices=["gemini", "claude", "fake"],
+                       help="AI model (default: saved setting)")
+    batch.add_argument("--required-skills", default="",
+                       help="Comma-separated required skills for the local pre-screen")
+    batch.add_argument("--nice-to-have", default="",
+                       help="Comma-separated nice-to-have skills for the local pre-screen")
+    batch.add_argument("--min-coverage", type=float, default=0,
+                       help="Auto-reject below this %% of required skills, before any AI call")
+    batch.add_argument("--consensus", action="store_true",
+                       help="Score each CV from several samples (more calls, steadier scores)")
+    batch.add_argument("--workers", type=int, default=4, help="Parallel candidates")
+    batch.add_argument("--batch-size", type=int, default=10,
+                       help="Records saved per database transaction")
+    batch.add_argument("--output", help="Append JSON lines to this file instead of stdout")
+    batch.add_argument("--db", help="History database path (default: data/history.db)")
+    batch.add_argument("--claude-key", help="Claude API key (default: ANTHROPIC_API_KEY or saved)")
+    batch.add_argument("--gemini-key", help="Gemini API key (default: GEMINI_API_KEY or saved)")
+    batch.set_defaults(func=run_batch)
+
+    archive = sub.add_parser("archive", help="Archive old records or search the archives")
+    archive.add_argument("--older-than-days", type=int,
+                         help="Archive records created more than this many days ago")
+    archive.add_argument("--positions", default="",
+                         help="Comma-separated positions to archive (default: all)")
+    archive.add_argument("--search", help="Print archived records whose name or position match")
+    archive.add_argument("--content", action="store_true",
+                         help="With --search, also match CV and report text (slower)")
+    archive.add_argument("--limit", type=int, default=100, help="Maximum search results")
+    archive.add_argument("--db", help="History database path (default: data/history.db)")
+    archive.set_defaults(func=run_archive)
+
+    export = sub.add_parser("export", help="Export history and settings as JSON lines")
+    export.add_argument("--output", default="-",
+                        help="Output file, gzipped if it ends in .gz (default: stdout)")
+    export.add_argument("--position", default="", help="Only export records of this position")
+    export.add_argument("--db", help="History database path (default: data/history.db)")
+    export.set_defaults(func=run_export)
+
+    import_ = sub.add_parser("import", help="Import history exported with the export command")
+    import_.add_argument("input", help="JSONL file from export, optionally .gz (- for stdin)")
+    import_.add_argument("--skip-settings", action="store_true",
+                         help="Only import records, keep the current settings")
+    import_.add_argument("--chunk-size", type=int, default=1000,
+                         help="Records per executemany batch")
+    import_.add_argument("--db", help="History database path (default: data/history.db)")
+    import_.set_defaults(func=run_import)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,68 +1,134 @@
 """Unified AI client for Claude and Gemini with PDF/image support"""
-from typing import Literal
-import anthropic
-from google import genai
-from google.genai import types
+import json
+import logging
+import time
+from typing import Iterable, Literal, Union
 
+from . import metrics
+from .pdf_parser import slim_pdf
+from .fake_llm import FakeLLM, MODEL_NAME as FAKE_MODEL
+
+
+logger = logging.getLogger(__name__)
+
+# Raw image bytes in any buffer form; str means legacy base64
+ImageData = Union[bytes, bytearray, memoryview, str]
 
 class AIClient:
     """Wrapper for Claude and Gemini APIs with multimodal support"""
 
-    def __init__(self, claude_key: str = None, gemini_key: str = None):
+    CLAUDE_MODEL = "claude-sonnet-4-20250514"
+    GEMINI_MODEL = "gemini-2.5-flash"
+
+    def __init__(self, claude_key: str = None, gemini_key: str = None, fake_llm: FakeLLM = None):
         self.claude_key = claude_key
         self.gemini_key = gemini_key
         self._claude_client = None
         self._gemini_client = None
+        self._fake_llm = fake_llm
 
     @property
     def claude(self):
         if not self._claude_client and self.claude_key:
+            # Provider SDKs are slow to import; load them on first use
+            import anthropic
             self._claude_client = anthropic.Anthropic(api_key=self.claude_key)
         return self._claude_client
 
     @property
     def gemini(self):
         if not self._gemini_client and self.gemini_key:
+            from google import genai
             self._gemini_client = genai.Client(api_key=self.gemini_key)
         return self._gemini_client
 
+    @property
+    def fake(self) -> FakeLLM:
+        if not self._fake_llm:
+            self._fake_llm = FakeLLM.from_env()
+        return self._fake_llm
+
     def chat(
         self,
         prompt: str,
-        model_provider: Literal["claude", "gemini"] = "gemini",
+        model_provider: Literal["claude", "gemini", "fake"] = "gemini",
         system_prompt: str = None
     ) -> str:
         """Send chat request to selected AI model.
 
         Args:
             prompt: User prompt
-            model_provider: "claude" or "gemini"
+            model_provider: "claude", "gemini" or "fake" (offline stand-in)
             system_prompt: Optional system instructions
 
         Returns:
             AI response text
         """
+        if model_provider == "fake":
+            return self._chat_fake(self.fake.complete, prompt)
         if model_provider == "claude":
             return self._chat_claude(prompt, system_prompt)
         else:
             return self._chat_gemini(prompt, system_prompt)
 
+    def chat_json(
+        self,
+        prompt: str,
+        schema: dict,
+        model_provider: Literal["claude", "gemini", "fake"] = "gemini",
+        schema_name: str = "submit_result"
+    ) -> str:
+        """Send chat request constrained to a JSON schema.
+
+        Uses Gemini's JSON response mode with `response_schema`, or a forced
+        Claude tool call whose `input_schema` is the schema.
+
+        Args:
+            prompt: User prompt
+            schema: JSON schema the response must follow
+            model_provider: "claude", "gemini" or "fake" (offline stand-in)
+            schema_name: Tool name used for Claude tool-use
+
+        Returns:
+            JSON text of the structured response
+        """
+        if model_provider == "fake":
+            return self._chat_fake(self.fake.complete_json, prompt, schema)
+        if model_provider == "claude":
+            return self._chat_claude_json(prompt, schema, schema_name)
+        else:
+            return self._chat_gemini_json(prompt, schema)
+
     def chat_with_pdf(
         self,
         prompt: str,
         pdf_bytes: bytes,
-        model_provider: Literal["claude", "gemini"] = "gemini"
+        model_provider: Literal["claude", "gemini", "fake"] = "gemini",
+        slim: bool = True
     ) -> str:
         """Send chat request with PDF file to AI model.
 
         Args:
             prompt: User prompt
             pdf_bytes: PDF file content as bytes
-            model_provider: "claude" or "gemini"
+            model_provider: "claude", "gemini" or "fake" (offline stand-in)
+            slim: Shrink the PDF (images, fonts, metadata, pages) before upload
 
         Returns:
             AI response text
         """
+        if model_provider == "fake":
+            return self._chat_fake(self.fake.complete, prompt)
+        if slim:
+            with metrics.stage("pdf_slim"):
+                pdf_bytes, stats = slim_pdf(pdf_bytes)
+            logger.info(
+                "Slimmed PDF %d -> %d bytes (%d pages) in %.0f ms",
+                stats["original_bytes"], stats["slim_bytes"], stats["pages"], stats["elapsed_ms"]
+            )
+            if stats["pages"] < stats["original_pages"]:
+                logger.warning("PDF cut to its first %d of %d pages for AI vision",
+                               stats["pages"], stats["original_pages"])
         if model_provider == "claude":
             return self._chat_claude_with_pdf(prompt, pdf_bytes)
         else:
@@ -71,23 +137,96 @@ class AIClient:
     def chat_with_images(
         self,
         prompt: str,
-        images_b64: list[str],
-        model_provider: Literal["claude", "gemini"] = "gemini"
+        images: Iterable[ImageData],
+        model_provider: Literal["claude", "gemini", "fake"] = "gemini"
     ) -> str:
         """Send chat request with images to AI model.
 
+        Images are consumed one at a time, so a generator such as
+        `pdf_parser.iter_pdf_images` never has every page rendered at once.
+
         Args:
             prompt: User prompt
-            images_b64: List of base64 encoded PNG images
-            model_provider: "claude" or "gemini"
+            images: PNG images as bytes, bytearray or memoryview (base64
+                strings are still accepted for compatibility)
+            model_provider: "claude", "gemini" or "fake" (offline stand-in)
 
         Returns:
             AI response text
         """
+        if model_provider == "fake":
+            return self._chat_fake(self.fake.complete, prompt)
         if model_provider == "claude":
-            return self._chat_claude_with_images(prompt, images_b64)
+            return self._chat_claude_with_images(prompt, images)
         else:
-            return self._chat_gemini_with_images(prompt, images_b64)
+            return self._chat_gemini_with_images(prompt, images)
+
+    def _create_claude(self, **kwargs):
+        """Call Claude messages API and record latency and token usage"""
+        start = time.perf_counter()
+        try:
+            response = self.claude.messages.create(
+                model=self.CLAUDE_MODEL,
+                max_tokens=8192,
+                **kwargs
+            )
+        except Exception as e:
+            metrics.record_call("claude", self.CLAUDE_MODEL,
+                                (time.perf_counter() - start) * 1000, error=type(e).__name__)
+            raise
+
+        usage = response.usage
+        cached = getattr(usage, "cache_read_input_tokens", 0) or 0
+        metrics.record_call(
+            "claude", self.CLAUDE_MODEL,
+            (time.perf_counter() - start) * 1000,
+            input_tokens=usage.input_tokens + cached,
+            output_tokens=usage.output_tokens,
+            cache_hit=cached > 0
+        )
+        return response
+
+    def _generate_gemini(self, **kwargs):
+        """Call Gemini generate_content and record latency and token usage"""
+        start = time.perf_counter()
+        try:
+            response = self.gemini.models.generate_content(
+                model=self.GEMINI_MODEL,
+                **kwargs
+            )
+        except Exception as e:
+            metrics.record_call("gemini", self.GEMINI_MODEL,
+                                (time.perf_counter() - start) * 1000, error=type(e).__name__)
+            raise
+
+        usage = response.usage_metadata
+        cached = (getattr(usage, "cached_content_token_count", 0) or 0) if usage else 0
+        metrics.record_call(
+            "gemini", self.GEMINI_MODEL,
+            (time.perf_counter() - start) * 1000,
+            input_tokens=(usage.prompt_token_count or 0) if usage else 0,
+            output_tokens=(usage.candidates_token_count or 0) if usage else 0,
+            cache_hit=cached > 0
+        )
+        return response
+
+    def _chat_fake(self, complete, prompt: str, *args) -> str:
+        """Call the offline fake provider, recording metrics like a real call"""
+        start = time.perf_counter()
+        try:
+            text = complete(prompt, *args)
+        except Exception as e:
+            metrics.record_call("fake", FAKE_MODEL,
+                                (time.perf_counter() - start) * 1000, error=type(e).__name__)
+            raise
+        # Rough token estimate: ~4 characters per token
+        metrics.record_call(
+            "fake", FAKE_MODEL,
+            (time.perf_counter() - start) * 1000,
+            input_tokens=len(prompt) // 4,
+            output_tokens=len(text) // 4
+        )
+        return text
 
     def _chat_claude(self, prompt: str, system_prompt: str = None) -> str:
         """Chat with Claude API"""
@@ -96,15 +235,34 @@ class AIClient:
 
         messages = [{"role": "user", "content": prompt}]
 
-        response = self.claude.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=8192,
+        response = self._create_claude(
             system=system_prompt or "You are a helpful assistant.",
             messages=messages
         )
 
         return response.content[0].text
 
+    def _chat_claude_json(self, prompt: str, schema: dict, schema_name: str) -> str:
+        """Chat with Claude API forcing a tool call that carries the JSON"""
+        if not self.claude:
+            raise ValueError("Claude API key not configured")
+
+        response = self._create_claude(
+            tools=[{
+                "name": schema_name,
+                "description": "Submit the result as structured JSON.",
+                "input_schema": schema
+            }],
+            tool_choice={"type": "tool", "name": schema_name},
+            messages=[{"role": "user", "content": prompt}]
+        )
+
+        for block in response.content:
+            if block.type == "tool_use":
+                return json.dumps(block.input, ensure_ascii=False)
+        # No tool call - hand back any text so the caller can repair it
+        return "".join(b.text for b in response.content if b.type == "text")
+
     def _chat_claude_with_pdf(self, prompt: str, pdf_bytes: bytes) -> str:
         """Chat with Claude API using PDF (via base64)"""
         if not self.claude:
@@ -128,38 +286,33 @@ class AIClient:
             ]
         }]
 
-        response = self.claude.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=8192,
-            messages=messages
-        )
+        response = self._create_claude(messages=messages)
 
         return response.content[0].text
 
-    def _chat_claude_with_images(self, prompt: str, images_b64: list[str]) -> str:
-        """Chat with Claude API using images"""
+    def _chat_claude_with_images(self, prompt: str, images: Iterable[ImageData]) -> str:
+        """Chat with Claude API using images (base64 is required on the wire)"""
         if not self.claude:
             raise ValueError("Claude API key not configured")
 
+        import base64
         content = []
-        for img_b64 in images_b64:
+        for image in images:
+            # Encode each image as it arrives; memoryviews are encoded without a copy
+            data = image if isinstance(image, str) else base64.b64encode(image).decode("ascii")
             content.append({
                 "type": "image",
                 "source": {
                     "type": "base64",
                     "media_type": "image/png",
-                    "data": img_b64
+                    "data": data
                 }
             })
         content.append({"type": "text", "text": prompt})
 
         messages = [{"role": "user", "content": content}]
 
-        response = self.claude.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=8192,
-            messages=messages
-        )
+        response = self._create_claude(messages=messages)
 
         return response.content[0].text
 
@@ -172,9 +325,22 @@ class AIClient:
         if system_prompt:
             full_prompt = f"{system_prompt}\n\n{prompt}"
 
-        response = self.gemini.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=full_prompt
+        response = self._generate_gemini(contents=full_prompt)
+
+        return response.text
+
+    def _chat_gemini_json(self, prompt: str, schema: dict) -> str:
+        """Chat with Gemini API in JSON mode with a response schema"""
+        if not self.gemini:
+            raise ValueError("Gemini API key not configured")
+
+        from google.genai import types
+        response = self._generate_gemini(
+            contents=prompt,
+            config=types.GenerateContentConfig(
+                response_mime_type="application/json",
+                response_schema=schema
+            )
         )
 
         return response.text
@@ -184,38 +350,36 @@ class AIClient:
         if not self.gemini:
             raise ValueError("Gemini API key not configured")
 
+        from google.genai import types
+
         # Gemini supports PDF natively via inline_data
         contents = [
             types.Part.from_bytes(data=pdf_bytes, mime_type="application/pdf"),
             prompt
         ]
 
-        response = self.gemini.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=contents
-        )
+        response = self._generate_gemini(contents=contents)
 
         return response.text
 
-    def _chat_gemini_with_images(self, prompt: str, images_b64: list[str]) -> str:
-        """Chat with Gemini API using images"""
+    def _chat_gemini_with_images(self, prompt: str, images: Iterable[ImageData]) -> str:
+        """Chat with Gemini API using images (sent as raw bytes)"""
         if not self.gemini:
             raise ValueError("Gemini API key not configured")
 
         import base64
+        from google.genai import types
         contents = []
 
-        for img_b64 in images_b64:
-            img_bytes = base64.b64decode(img_b64)
+        for image in images:
+            if isinstance(image, str):
+                image = base64.b64decode(image)
             contents.append(
-                types.Part.from_bytes(data=img_bytes, mime_type="image/png")
+                types.Part.from_bytes(data=bytes(image), mime_type="image/png")
             )
 
         contents.append(prompt)
 
-        response = self.gemini.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=contents
-        )
+        response = self._generate_gemini(contents=contents)
 
         return response.text
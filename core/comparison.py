@@ -0,0 +1,229 @@
+"""Compare candidates from their stored CV summaries.
+
+Comparisons never re-parse or re-analyze PDFs: they use the `cv_summary`
+saved with each record. Results are cached by the set of record IDs, the
+JD hash and the model, so repeating a comparison costs nothing.
+
+Selections too large for one prompt are compared as a tournament: the
+candidates are split into groups that are ranked in parallel, the best of
+each group advance, and the finalists get the full side-by-side comparison.
+"""
+import hashlib
+import json
+import logging
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+from . import metrics
+from .ai_client import AIClient
+from .pipeline import jd_hash
+from .prompt_templates import COMPARE_CVS_PROMPT, COMPARE_GROUP_PROMPT, COMPARE_GROUP_SCHEMA
+from .schema_validator import compile_schema
+
+
+logger = logging.getLogger(__name__)
+
+# Limits for one comparison call; larger selections go through group rounds
+COMPARE_GROUP_SIZE = 6
+COMPARE_MAX_CHARS = 40000
+ADVANCE_PER_GROUP = 2
+COMPARE_WORKERS = 4
+
+_validate_ranking = compile_schema(COMPARE_GROUP_SCHEMA)
+
+
+def comparison_key(record_ids: list[int], jd_digest: str, model: str) -> str:
+    """Cache key for a comparison: order-independent set of IDs, JD hash and model"""
+    ids = ",".join(str(i) for i in sorted(set(record_ids)))
+    return hashlib.sha256(f"{ids}|{jd_digest}|{model}".encode("utf-8")).hexdigest()
+
+
+def _summary_block(candidate: dict, with_id: bool = False) -> str:
+    score = candidate["score"] if candidate["score"] is not None else "N/A"
+    label = f"[{candidate['id']}] " if with_id else ""
+    return f"### {label}{candidate['candidate_name']} (score: {score})\n{candidate['cv_summary']}"
+
+
+def _fits_one_call(candidates: list[dict]) -> bool:
+    return (len(candidates) <= COMPARE_GROUP_SIZE
+            and sum(len(c["cv_summary"] or "") for c in candidates) <= COMPARE_MAX_CHARS)
+
+
+def _make_groups(candidates: list[dict]) -> list[list[dict]]:
+    """Split candidates into groups that each fit one call.
+
+    Candidates are dealt out round-robin in stored-score order (seeded like
+    a tournament) so strong candidates do not all land in one group.
+    """
+    total_chars = sum(len(c["cv_summary"] or "") for c in candidates)
+    count = max(math.ceil(len(candidates) / COMPARE_GROUP_SIZE),
+                math.ceil(total_chars / COMPARE_MAX_CHARS))
+    # Every group must be larger than the number advancing, or nothing is
+    # eliminated; this wins over the size limits, so a group may overflow them
+    count = max(1, min(count, len(candidates) // (ADVANCE_PER_GROUP + 1)))
+    seeded = sorted(candidates, key=lambda c: c["score"] if c["score"] is not None else -1,
+                    reverse=True)
+    return [group for group in (seeded[i::count] for i in range(count)) if group]
+
+
+def _rank_group(ai_client: AIClient, group: list[dict], jd_text: str, model: str):
+    """Rank one group; falls back to stored scores if the response is unusable.
+
+    Returns:
+        (candidates best first, notes text)
+    """
+    prompt = COMPARE_GROUP_PROMPT.format(
+        jd_text=jd_text,
+        candidates_summaries="\n\n".join(_summary_block(c, with_id=True) for c in group)
+    )
+    by_id = {c["id"]: c for c in group}
+    try:
+        data = json.loads(ai_client.chat_json(
+            prompt, COMPARE_GROUP_SCHEMA, model_provider=model, schema_name="submit_ranking"
+        ))
+        errors = _validate_ranking(data)
+        if errors:
+            raise ValueError("; ".join(errors))
+    except ValueError as e:
+        logger.warning("Group ranking unusable, using stored scores: %s", e)
+        data = {"ranking": [], "notes": "Ranked by stored score."}
+
+    ranked = [by_id.pop(i) for i in dict.fromkeys(data["ranking"]) if i in by_id]
+    # Anything the model left out keeps its stored-score order at the end
+    ranked += sorted(by_id.values(), key=lambda c: c["score"] if c["score"] is not None else -1,
+                     reverse=True)
+    return ranked, data["notes"]
+
+
+def _tournament(ai_client: AIClient, candidates: list[dict], jd_text: str, model: str):
+    """Run group rounds until the remaining candidates fit one comparison.
+
+    Every round must eliminate someone; if one does not, the remaining
+    candidates go straight to the final comparison.
+
+    Returns:
+        (finalists, markdown lines describing the group rounds)
+    """
+    notes = []
+    round_number = 0
+    while not _fits_one_call(candidates) and len(candidates) > ADVANCE_PER_GROUP:
+        round_number += 1
+        groups = _make_groups(candidates)
+
+        def rank(group):
+            return _rank_group(ai_client, group, jd_text, model)
+
+        with metrics.stage("compare_group_round"):
+            with ThreadPoolExecutor(max_workers=min(COMPARE_WORKERS, len(groups))) as pool:
+                results = list(pool.map(metrics.bind(rank), groups))
+
+        advancing = []
+        for number, (ranked, group_notes) in enumerate(results, start=1):
+            advancing.extend(ranked[:min(ADVANCE_PER_GROUP, len(ranked) - 1)])
+            names = ", ".join(c["candidate_name"] for c in ranked)
+            notes.append(f"- **Round {round_number}, group {number}:** {names}. {group_notes}")
+        if len(advancing) >= len(candidates):
+            break
+        candidates = advancing
+    return candidates, notes
+
+
+def compare_candidates(
+    ai_client: AIClient,
+    candidates: list[dict],
+    jd_text: str,
+    model: str = "gemini"
+) -> str:
+    """Compare candidates in one COMPARE_CVS_PROMPT call.
+
+    Args:
+        ai_client: Configured AI client
+        candidates: Dicts with candidate_name, score and cv_summary
+        jd_text: Job description text
+        model: "claude", "gemini" or "fake"
+
+    Returns:
+        Comparison table and ranking in markdown
+    """
+    summaries = "\n\n".join(_summary_block(c) for c in candidates)
+    prompt = COMPARE_CVS_PROMPT.format(
+        jd_text=jd_text,
+        candidates_summaries=summaries,
+        candidate_names=" | ".join(c["candidate_name"] for c in candidates)
+    )
+    return ai_client.chat(prompt, model_provider=model)
+
+
+def compare_records(
+    ai_client: AIClient,
+    db,
+    record_ids: list[int],
+    model: str = "gemini",
+    jd_text: str = None
+) -> tuple[str, bool]:
+    """Compare saved records from their stored summaries.
+
+    Args:
+        ai_client: Configured AI client
+        db: Database with get_compare_inputs and the compare cache methods
+        record_ids: Records to compare
+        model: "claude", "gemini" or "fake"
+        jd_text: Job description; defaults to the JD of the most recently
+            saved selected record
+
+    Returns:
+        (comparison markdown, whether it came from the cache)
+    """
+    candidates = db.get_compare_inputs(list(dict.fromkeys(record_ids)))
+    if len(candidates) < 2:
+        raise ValueError("Select at least two saved candidates to compare")
+    if not jd_text:
+        jd_text = max(candidates, key=lambda c: c["id"])["jd_text"] or ""
+    digest = jd_hash(jd_text)
+    key = comparison_key([c["id"] for c in candidates], digest, model)
+
+    cached = db.get_cached_comparison(key)
+    metrics.record_cache("compare", cached is not None)
+    if cached is not None:
+        return cached, True
+
+    finalists, round_notes = _tournament(ai_client, candidates, jd_text, model)
+    with metrics.stage("compare_final"):
+        result = compare_candidates(ai_client, finalists, jd_text, model)
+    if round_notes:
+        result += (
+            f"\n\n---\n\n## Group Rounds\n\n{len(candidates)} candidates were ranked in "
+            f"groups; the top {ADVANCE_PER_GROUP} of each group advanced to the final "
+            f"comparison above.\n\n" + "\n".join(round_notes)
+        )
+    db.save_comparison(key, [c["id"] for c in candidates], digest, result)
+    return result, False
+
+
+def compare_top_k(
+    ai_client: AIClient,
+    db,
+    position: str,
+    k: int = 5,
+    model: str = "gemini"
+) -> tuple[str, bool]:
+    """Compare the current top-K of a position's leaderboard.
+
+    The cached result is reused until the top-K membership or the JD of
+    the most recently saved top-K record changes.
+
+    Args:
+        ai_client: Configured AI client
+        db: Database with get_leaderboard / get_compare_inputs / compare cache
+        position: Position to compare
+        k: Number of top candidates
+        model: "claude", "gemini" or "fake"
+
+    Returns:
+        (comparison markdown, whether it came from the cache)
+    """
+    # Unscored records (auto-rejected or failed parses) are not compared
+    top = db.get_leaderboard(position, limit=k, scored_only=True)
+    if len(top) < 2:
+        raise ValueError("At least two scored candidates are needed to compare")
+    return compare_records(ai_client, db, [row["record_id"] for row in top], model)
@@ -0,0 +1,77 @@
+"""Split long CV text into chunks on page and section boundaries"""
+import re
+
+from .pdf_parser import PAGE_BREAK
+
+
+# Lines that look like a CV section heading: a known section name, or a
+# short line in capitals / ending with a colon
+_SECTION_NAMES = (
+    "summary|profile|objective|experience|employment|work history|education|"
+    "skills|technical skills|certifications|projects|publications|awards|"
+    "honors|grants|teaching|research|presentations|languages|references|portfolio"
+)
+_HEADING_RE = re.compile(
+    rf"^\s*(?:(?:{_SECTION_NAMES})\b.{{0,30}}|[A-Z][A-Z &/-]{{2,40}}|[^\n]{{2,40}}:)\s*$",
+    re.IGNORECASE | re.MULTILINE
+)
+
+
+def _split_sections(page: str) -> list[str]:
+    """Split one page at section headings (each piece starts with its heading)"""
+    starts = [m.start() for m in _HEADING_RE.finditer(page)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    bounds = starts + [len(page)]
+    return [page[a:b] for a, b in zip(bounds, bounds[1:]) if page[a:b].strip()]
+
+
+def _split_hard(text: str, max_chars: int) -> list[str]:
+    """Split an oversized piece on blank lines, then lines, then characters"""
+    for sep in ("\n\n", "\n"):
+        parts = text.split(sep)
+        if len(parts) > 1:
+            return _pack([p + sep for p in parts], max_chars)
+    return [text[i:i + max_chars] for i in range(0, len(text), max_chars)]
+
+
+def _pack(pieces: list[str], max_chars: int) -> list[str]:
+    """Greedily pack consecutive pieces into chunks of at most max_chars"""
+    chunks = []
+    current = ""
+    for piece in pieces:
+        if len(piece) > max_chars:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.extend(_split_hard(piece, max_chars))
+        elif len(current) + len(piece) > max_chars:
+            chunks.append(current)
+            current = piece
+        else:
+            current += piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def split_cv_text(cv_text: str, max_chars: int = 12000) -> list[str]:
+    """Split CV text into chunks no longer than max_chars.
+
+    Breaks prefer page boundaries, then section headings, then paragraphs,
+    so each chunk holds whole sections where possible.
+
+    Args:
+        cv_text: Extracted CV text (pages separated by PAGE_BREAK)
+        max_chars: Maximum characters per chunk
+
+    Returns:
+        List of non-empty chunks in document order
+    """
+    pieces = []
+    for page in cv_text.split(PAGE_BREAK):
+        if len(page) <= max_chars:
+            pieces.append(page)
+        else:
+            pieces.extend(_split_sections(page))
+    return [chunk for chunk in _pack(pieces, max_chars) if chunk.strip()]
@@ -1,7 +1,154 @@
 """CV scoring logic"""
+import copy
 import json
+import re
+import statistics
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from . import metrics
 from .ai_client import AIClient
-from .prompt_templates import SCORING_PROMPT
+from .prompt_templates import SCORING_PROMPT, SCORING_SCHEMA, SCORE_REPAIR_PROMPT
+from .schema_validator import compile_schema
+
+
+_validate_score = compile_schema(SCORING_SCHEMA)
+
+# Max points per breakdown category, taken from the schema
+_CATEGORY_MAX = {
+    name: sub["properties"]["score"]["maximum"]
+    for name, sub in SCORING_SCHEMA["properties"]["breakdown"]["properties"].items()
+}
+_RECOMMENDATIONS = SCORING_SCHEMA["properties"]["recommendation"]["enum"]
+
+# Consensus scoring: start with CONSENSUS_SAMPLES parallel samples and add
+# CONSENSUS_BATCH more while the overall scores' standard deviation exceeds
+# CONSENSUS_MAX_STDEV points, up to CONSENSUS_MAX_SAMPLES
+CONSENSUS_SAMPLES = 3
+CONSENSUS_BATCH = 2
+CONSENSUS_MAX_SAMPLES = 7
+CONSENSUS_MAX_STDEV = 5.0
+
+# Parse outcome counters: valid, repaired_local, repaired_remote, failed
+_parse_stats = Counter()
+# Consensus counters: runs, samples, extended (runs that needed extra samples)
+_consensus_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def _track(outcome: str):
+    with _stats_lock:
+        _parse_stats[outcome] += 1
+    metrics.record("score_parse", outcome, error=None if outcome != "failed" else "parse")
+
+
+def get_scoring_stats() -> dict:
+    """Get score parsing outcome counts and failure rate.
+
+    Returns:
+        Dict of outcome counts plus "total" and "failure_rate"
+    """
+    with _stats_lock:
+        stats = dict(_parse_stats)
+    total = sum(stats.values())
+    stats["total"] = total
+    stats["failure_rate"] = stats.get("failed", 0) / total if total else 0.0
+    return stats
+
+
+def get_consensus_stats() -> dict:
+    """Get consensus scoring counts and the average samples per run"""
+    with _stats_lock:
+        stats = dict(_consensus_stats)
+    runs = stats.get("runs", 0)
+    stats["avg_samples"] = stats.get("samples", 0) / runs if runs else 0.0
+    return stats
+
+
+def _extract_json(text: str):
+    """Best-effort parse of a JSON object from model output.
+
+    Strips code fences, keeps the outermost object and drops trailing
+    commas. Returns None if nothing parseable is found.
+    """
+    if not text:
+        return None
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+
+    json_start = text.find("{")
+    json_end = text.rfind("}") + 1
+    if json_start == -1 or json_end <= json_start:
+        return None
+    json_str = text[json_start:json_end]
+    json_str = re.sub(r",\s*([}\]])", r"\1", json_str)
+    try:
+        return json.loads(json_str)
+    except json.JSONDecodeError:
+        return None
+
+
+def _to_int(value, upper: int) -> int:
+    """Coerce a score-like value to an int clamped to [0, upper]"""
+    if isinstance(value, str):
+        match = re.search(r"-?\d+(\.\d+)?", value)
+        value = float(match.group()) if match else 0
+    try:
+        value = int(round(float(value)))
+    except (TypeError, ValueError):
+        value = 0
+    return max(0, min(upper, value))
+
+
+def _repair_score(data: dict) -> dict:
+    """Fix common schema violations locally without another AI call"""
+    breakdown = data.get("breakdown")
+    if not isinstance(breakdown, dict):
+        breakdown = {}
+    data["breakdown"] = breakdown
+
+    for name, max_score in _CATEGORY_MAX.items():
+        item = breakdown.get(name)
+        if not isinstance(item, dict):
+            item = {"score": item} if item is not None else {"score": 0}
+        item["score"] = _to_int(item.get("score", 0), max_score)
+        item_schema = SCORING_SCHEMA["properties"]["breakdown"]["properties"][name]
+        for field in item_schema["required"]:
+            if field == "score":
+                continue
+            if field == "notes":
+                item[field] = str(item.get(field) or "")
+            else:
+                values = item.get(field) or []
+                if isinstance(values, str):
+                    values = [v.strip() for v in values.split(",") if v.strip()]
+                item[field] = [str(v) for v in values]
+        breakdown[name] = item
+
+    if "overall_score" in data:
+        data["overall_score"] = _to_int(data["overall_score"], 100)
+    else:
+        data["overall_score"] = sum(item["score"] for item in breakdown.values())
+
+    data["summary"] = str(data.get("summary") or "")
+
+    recommendation = str(data.get("recommendation") or "").strip().lower()
+    for option in _RECOMMENDATIONS:
+        if recommendation == option.lower():
+            data["recommendation"] = option
+            break
+    else:
+        # Derive from score when missing or not one of the allowed labels
+        score = data["overall_score"]
+        data["recommendation"] = (
+            "Strong Hire" if score >= 85 else
+            "Hire" if score >= 70 else
+            "Maybe" if score >= 50 else
+            "No Hire"
+        )
+    return data
 
 
 def score_cv(
@@ -12,6 +159,10 @@ def score_cv(
 ) -> dict:
     """Score CV against job description.
 
+    Requests schema-constrained JSON from the provider, validates it locally
+    and repairs it if needed: first locally, then with one short repair call
+    that only resends the invalid JSON, never the CV.
+
     Args:
         ai_client: Configured AI client
         cv_summary: Analyzed CV summary
@@ -19,29 +170,157 @@ def score_cv(
         model: "claude" or "gemini"
 
     Returns:
-        Score breakdown dict
+        Score breakdown dict. "parse_status" records how it was obtained.
     """
     prompt = SCORING_PROMPT.format(
         cv_summary=cv_summary,
         jd_text=jd_text
     )
 
-    response = ai_client.chat(prompt, model_provider=model)
+    response = ai_client.chat_json(
+        prompt, SCORING_SCHEMA, model_provider=model, schema_name="submit_score"
+    )
 
-    # Extract JSON from response
-    try:
-        # Find JSON block in response
-        json_start = response.find("{")
-        json_end = response.rfind("}") + 1
-        if json_start != -1 and json_end > json_start:
-            json_str = response[json_start:json_end]
-            return json.loads(json_str)
-    except json.JSONDecodeError:
-        pass
+    data = _extract_json(response)
+    if isinstance(data, dict) and not _validate_score(data):
+        _track("valid")
+        data["parse_status"] = "valid"
+        return data
+
+    # Local repair
+    if isinstance(data, dict):
+        data = _repair_score(data)
+        errors = _validate_score(data)
+        if not errors:
+            _track("repaired_local")
+            data["parse_status"] = "repaired_local"
+            return data
+    else:
+        errors = ["$: response is not a JSON object"]
 
-    # Fallback if parsing fails
+    # One cheap repair call with only the broken JSON and its errors
+    repair_prompt = SCORE_REPAIR_PROMPT.format(
+        errors="\n".join(f"- {e}" for e in errors),
+        raw_response=response
+    )
+    repaired = _extract_json(ai_client.chat_json(
+        repair_prompt, SCORING_SCHEMA, model_provider=model, schema_name="submit_score"
+    ))
+    if isinstance(repaired, dict):
+        repaired = _repair_score(repaired)
+        if not _validate_score(repaired):
+            _track("repaired_remote")
+            repaired["parse_status"] = "repaired_remote"
+            return repaired
+
+    # Fallback if parsing fails - no score rather than a misleading zero
+    _track("failed")
     return {
-        "overall_score": 0,
+        "overall_score": None,
+        "parse_status": "failed",
         "error": "Failed to parse score",
+        "validation_errors": errors,
         "raw_response": response
     }
+
+
+def _aggregate(samples: list[dict]) -> dict:
+    """Combine valid score samples into one result.
+
+    Each sub-score is the median across samples and the overall score is
+    their sum, so the stored breakdown always adds up to overall_score.
+    Text fields (notes, matched skills, summary, recommendation) come from
+    the representative sample: the one whose sub-scores are closest to the
+    medians. Its index in consensus["scores"] is stored as "representative".
+    """
+    scores = [s["overall_score"] for s in samples]
+    medians = {
+        name: int(round(statistics.median(s["breakdown"][name]["score"] for s in samples)))
+        for name in _CATEGORY_MAX
+    }
+    overall = min(100, sum(medians.values()))
+
+    def distance(index: int) -> tuple:
+        sample = samples[index]
+        return (
+            sum(abs(sample["breakdown"][name]["score"] - m) for name, m in medians.items()),
+            abs(sample["overall_score"] - overall),
+        )
+
+    representative = min(range(len(samples)), key=distance)
+    result = copy.deepcopy(samples[representative])
+    result["overall_score"] = overall
+    for name, score in medians.items():
+        result["breakdown"][name]["score"] = score
+    result["consensus"] = {
+        "samples": len(samples),
+        "scores": scores,
+        "variance": round(float(statistics.pvariance(scores)), 2),
+        "representative": representative,
+    }
+    return result
+
+
+def score_cv_consensus(
+    ai_client: AIClient,
+    cv_summary: str,
+    jd_text: str,
+    model: str = "gemini",
+    samples: int = CONSENSUS_SAMPLES,
+    max_samples: int = CONSENSUS_MAX_SAMPLES,
+    max_stdev: float = CONSENSUS_MAX_STDEV
+) -> dict:
+    """Score a CV from several parallel samples, adding samples only while they disagree.
+
+    Args:
+        ai_client: Configured AI client
+        cv_summary: Analyzed CV summary
+        jd_text: Job description
+        model: "claude", "gemini" or "fake"
+        samples: Samples in the first round
+        max_samples: Upper bound on samples
+        max_stdev: Overall-score standard deviation (points) above which
+            more samples are launched
+
+    Returns:
+        Score breakdown dict like `score_cv` (see _aggregate), plus
+        "consensus" with the sample count, sample scores, their variance and
+        the representative sample. If no sample could be parsed, the first
+        failed result is returned.
+    """
+    results = []
+    errors = []
+
+    def run_round(count: int):
+        def one(_):
+            try:
+                return score_cv(ai_client, cv_summary, jd_text, model)
+            except Exception as e:
+                errors.append(e)
+                return None
+
+        with ThreadPoolExecutor(max_workers=count) as pool:
+            results.extend(r for r in pool.map(metrics.bind(one), range(count)) if r is not None)
+
+    run_round(max(1, samples))
+    total = max(1, samples)
+    while total < max_samples:
+        valid = [r for r in results if r.get("overall_score") is not None]
+        if not valid:
+            break  # parsing or the provider is failing, more samples will not help
+        if len(valid) > 1 and statistics.pstdev(r["overall_score"] for r in valid) <= max_stdev:
+            break
+        count = min(CONSENSUS_BATCH, max_samples - total)
+        run_round(count)
+        total += count
+
+    if not results:
+        raise errors[0]
+    valid = [r for r in results if r.get("overall_score") is not None]
+    with _stats_lock:
+        _consensus_stats["runs"] += 1
+        _consensus_stats["samples"] += total
+        _consensus_stats["extended"] += total > samples
+    if not valid:
+        return results[0]
+    return _aggregate(valid)
@@ -94,11 +94,22 @@ def _get_or_create_salt() -> bytes:
     return salt
 
 
-def encrypt(plaintext: str) -> str:
+def derive_key() -> bytes:
+    """Derive the encryption key for this machine.
+
+    The PBKDF2 derivation is slow (~0.1 s). Callers encrypting or decrypting
+    several values at once derive the key once and pass it to
+    encrypt/decrypt, then let it go; it is never kept beyond that call.
+    """
+    return _derive_key(_get_or_create_salt())
+
+
+def encrypt(plaintext: str, key: Optional[bytes] = None) -> str:
     """Encrypt a string value.
 
     Args:
         plaintext: The value to encrypt
+        key: Key from derive_key (derived here if not given)
 
     Returns:
         Encrypted value with prefix marker
@@ -110,9 +121,7 @@ def encrypt(plaintext: str) -> str:
     if plaintext.startswith(ENCRYPTED_PREFIX):
         return plaintext
 
-    salt = _get_or_create_salt()
-    key = _derive_key(salt)
-    fernet = Fernet(key)
+    fernet = Fernet(key or derive_key())
 
     encrypted = fernet.encrypt(plaintext.encode())
     return ENCRYPTED_PREFIX + base64.urlsafe_b64encode(encrypted).decode()
@@ -123,12 +132,13 @@ class DecryptionError(Exception):
     pass
 
 
-def decrypt(ciphertext: str, silent: bool = True) -> str:
+def decrypt(ciphertext: str, silent: bool = True, key: Optional[bytes] = None) -> str:
     """Decrypt an encrypted string value.
 
     Args:
         ciphertext: The encrypted value with prefix marker
         silent: If True, return empty string on failure. If False, raise DecryptionError.
+        key: Key from derive_key (derived here if not given)
 
     Returns:
         Decrypted plaintext, or original value if not encrypted
@@ -144,9 +154,7 @@ def decrypt(ciphertext: str, silent: bool = True) -> str:
         return ciphertext
 
     try:
-        salt = _get_or_create_salt()
-        key = _derive_key(salt)
-        fernet = Fernet(key)
+        fernet = Fernet(key or derive_key())
 
         # Remove prefix and decode
         encrypted_b64 = ciphertext[len(ENCRYPTED_PREFIX):]
@@ -0,0 +1,195 @@
+"""Offline stand-in LLM provider for load testing and demos.
+
+Returns canned but realistically shaped responses for the app's prompts,
+with configurable latency and error injection. Select it with
+`model_provider="fake"` on AIClient.
+
+Set IH_ENABLE_FAKE_LLM=1 to offer it as a model choice in the UI.
+
+Environment configuration (used by `FakeLLM.from_env`):
+    IH_FAKE_LATENCY     "lognormal:<median_ms>:<sigma>" (default lognormal:1500:0.4),
+                        "uniform:<min_ms>:<max_ms>" or "fixed:<ms>"
+    IH_FAKE_ERROR_RATE  Probability of a simulated provider error (default 0)
+    IH_FAKE_SEED        Seed for reproducible runs
+"""
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+
+
+MODEL_NAME = "fake-llm"
+
+# Instances built from the environment are shared so that every AIClient
+# draws from one random stream, like clients of one real backend
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+class FakeLLMError(RuntimeError):
+    """Simulated provider failure (rate limit, overload, timeout)"""
+    pass
+
+
+_CV_SUMMARY = """## Full Name
+Alex Nguyen — Ho Chi Minh City, alex.nguyen@example.com
+
+## Professional Summary
+Backend engineer with {years} years building distributed services in Python and Go.
+Led migration of a monolith to microservices on Kubernetes. Mentors junior developers.
+
+## Work Experience
+- **Senior Backend Engineer**, Acme Payments (2021 – Present): cut p99 API latency by 40%, owned PostgreSQL sharding.
+- **Backend Engineer**, Blue Logistics (2018 – 2021): built event pipeline on Kafka processing 2M events/day.
+
+## Technical Skills
+- **Backend:** Python, Go, FastAPI, gRPC
+- **Database:** PostgreSQL, Redis
+- **Cloud:** AWS, Kubernetes, Docker, Terraform
+- **Tools:** GitHub Actions, Grafana, Sentry
+
+## Education
+B.Sc. Computer Science, HCMC University of Technology, 2018
+
+## Certifications
+AWS Certified Solutions Architect – Associate"""
+
+_CATEGORIES = [
+    ("Technical Deep-Dive", 7),
+    ("Experience Validation", 5),
+    ("Scenario-Based", 5),
+    ("Independent Work & AI Usage", 3),
+    ("Growth Mindset", 3),
+    ("Red Flags to Probe", 3),
+]
+
+
+def _questions_markdown() -> str:
+    sections = []
+    for i, (category, count) in enumerate(_CATEGORIES, start=1):
+        rows = "\n".join(
+            f"| {n} | Sample {category.lower()} question {n} about PostgreSQL and Kubernetes? "
+            f"| Assess {category.lower()} |"
+            for n in range(1, count + 1)
+        )
+        sections.append(
+            f"### {i}. {category}\n\n| # | Question | Purpose |\n|---|----------|---------|\n{rows}"
+        )
+    sections.append(
+        "### Assessment Notes\n"
+        "- Key strengths to validate: distributed systems, database scaling\n"
+        "- Potential concerns to explore: limited frontend exposure\n"
+        "- Recommended focus areas: system design, ownership"
+    )
+    return "\n\n".join(sections)
+
+
+def _parse_latency(spec: str):
+    """Parse a latency spec string into a sampler function (returns ms)"""
+    kind, *params = spec.split(":")
+    values = [float(p) for p in params]
+    if kind == "fixed":
+        return lambda rng: values[0]
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "lognormal":
+        median, sigma = values
+        return lambda rng: median * rng.lognormvariate(0, sigma)
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+class FakeLLM:
+    """Deterministic-shape fake model with latency and error injection"""
+
+    def __init__(
+        self,
+        latency: str = "lognormal:1500:0.4",
+        error_rate: float = 0.0,
+        seed: int = None
+    ):
+        self.latency = latency
+        self.error_rate = error_rate
+        self._sample_latency = _parse_latency(latency)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "FakeLLM":
+        """Get the shared FakeLLM configured by IH_FAKE_* environment variables"""
+        seed = os.getenv("IH_FAKE_SEED")
+        config = (
+            os.getenv("IH_FAKE_LATENCY", "lognormal:1500:0.4"),
+            float(os.getenv("IH_FAKE_ERROR_RATE", "0")),
+            int(seed) if seed else None
+        )
+        with _shared_lock:
+            if config not in _shared:
+                _shared[config] = cls(*config)
+            return _shared[config]
+
+    def _simulate(self):
+        """Sleep for a sampled latency and maybe raise a simulated error"""
+        with self._lock:
+            delay_ms = self._sample_latency(self._rng)
+            fail = self._rng.random() < self.error_rate
+        time.sleep(max(delay_ms, 0) / 1000)
+        if fail:
+            raise FakeLLMError("Simulated provider error (503 overloaded)")
+
+    def _score(self, prompt: str) -> dict:
+        """Plausible score derived from the prompt so equal inputs score alike"""
+        digest = int(hashlib.sha256(prompt.encode()).hexdigest()[:8], 16)
+        with self._lock:
+            noise = self._rng.randint(-3, 3)
+        required = max(0, min(40, 20 + digest % 21 + noise))
+        experience = 10 + digest % 16
+        nice = 5 + digest % 16
+        education = 4 + digest % 7
+        modernity = 2 + digest % 4
+        overall = required + experience + nice + education + modernity
+        return {
+            "overall_score": overall,
+            "breakdown": {
+                "required_skills": {"score": required, "matched": ["Python", "PostgreSQL"],
+                                    "missing": ["Kubernetes"] if required < 30 else []},
+                "experience_level": {"score": experience, "notes": "Solid backend tenure"},
+                "nice_to_have": {"score": nice, "matched": ["Docker"]},
+                "education": {"score": education, "notes": "Relevant CS degree"},
+                "tech_modernity": {"score": modernity, "notes": "Modern cloud stack"},
+            },
+            "summary": "Strong backend profile with relevant database experience.",
+            "recommendation": ("Strong Hire" if overall >= 85 else "Hire" if overall >= 70
+                               else "Maybe" if overall >= 50 else "No Hire"),
+        }
+
+    def complete(self, prompt: str) -> str:
+        """Return a canned response shaped like the prompt's expected output"""
+        self._simulate()
+        if prompt.startswith(("Analyze this resume", "Merge these partial analyses")):
+            years = 3 + len(prompt) % 8
+            return _CV_SUMMARY.format(years=years)
+        if prompt.startswith("You are an expert technical interviewer"):
+            return _questions_markdown()
+        if prompt.startswith("Score this candidate"):
+            return f"```json\n{json.dumps(self._score(prompt), indent=2)}\n```"
+        if prompt.startswith("Compare these candidates"):
+            return ("| Aspect | Candidates |\n|--------|------------|\n"
+                    "| Overall match | See individual scores |\n\n"
+                    "**Ranking:** ordered by overall match.")
+        return "Fake response."
+
+    def complete_json(self, prompt: str, schema: dict) -> str:
+        """Return schema-shaped JSON for the scoring, group-ranking and translation schemas"""
+        self._simulate()
+        if "translations" in schema.get("properties", {}):
+            texts = json.loads(prompt.split("Texts:\n", 1)[1])
+            return json.dumps({"translations": [f"[translated] {t}" for t in texts]})
+        if "ranking" in schema.get("properties", {}):
+            ids = [int(i) for i in re.findall(r"^### \[(\d+)\]", prompt, re.MULTILINE)]
+            # Stable pseudo-ranking: order by a hash of each candidate's ID
+            ids.sort(key=lambda i: hashlib.sha256(str(i).encode()).hexdigest())
+            return json.dumps({"ranking": ids, "notes": "Ranked by overall fit."})
+        return json.dumps(self._score(prompt))
@@ -0,0 +1,111 @@
+"""Durable background job queue for CV processing.
+
+Jobs live in the database's `jobs` table, so they survive browser
+refreshes and server restarts. Worker threads claim queued jobs and run the
+pipeline with `iter_pipeline`, persisting each completed stage. A job
+interrupted by a restart resumes after its last completed stage.
+"""
+import logging
+import threading
+from typing import Callable
+
+from . import metrics, profiling
+from .ai_client import AIClient
+from .pipeline import iter_pipeline
+
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueue:
+    """Worker pool that drains the jobs table.
+
+    Args:
+        db: Database with the job methods (create_job, claim_next_job, ...)
+        client_factory: Returns a configured AIClient for a job
+        on_complete: Called with (job, final state) to save the result with
+            db.finish_job, which also marks the job done; returns the
+            saved record ID
+        workers: Number of worker threads
+    """
+
+    def __init__(
+        self,
+        db,
+        client_factory: Callable[[], AIClient],
+        on_complete: Callable,
+        workers: int = 2
+    ):
+        self.db = db
+        self.client_factory = client_factory
+        self.on_complete = on_complete
+        self.workers = workers
+        self._wakeup = threading.Event()
+        self._started = False
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Requeue interrupted jobs and start worker threads (idempotent)"""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        requeued = self.db.requeue_interrupted_jobs()
+        if requeued:
+            logger.info("Resuming %d interrupted job(s)", requeued)
+        for i in range(self.workers):
+            threading.Thread(target=self._worker, name=f"job-worker-{i}", daemon=True).start()
+        self._wakeup.set()
+
+    def enqueue(self, pdf_path: str, params: dict, state: dict = None) -> int:
+        """Add a job (optionally with reused stage results) and wake a worker.
+
+        Returns:
+            The job ID
+        """
+        job_id = self.db.create_job(pdf_path, params, state)
+        self.start()
+        self._wakeup.set()
+        return job_id
+
+    def retry(self, job_id: int) -> bool:
+        """Requeue a failed job"""
+        if self.db.retry_job(job_id):
+            self._wakeup.set()
+            return True
+        return False
+
+    def _worker(self):
+        while True:
+            job = self.db.claim_next_job()
+            if job is None:
+                # Idle: wait for a new job (or poll occasionally)
+                self._wakeup.wait(timeout=5)
+                self._wakeup.clear()
+                continue
+            self._run(job)
+
+    def _run(self, job):
+        try:
+            self._execute(job)
+        except Exception as e:
+            logger.exception("Job %s failed", job.id)
+            self.db.fail_job(job.id, str(e))
+
+    @profiling.profiled("job")
+    def _execute(self, job) -> int:
+        """Run a job's remaining stages and save its record. Returns the record ID."""
+        params = job.params
+        ai_client = self.client_factory()
+        # Metrics of resumed jobs accumulate under the same run
+        with metrics.run(f"job-{job.id}"):
+            state = job.state
+            for stage, state in iter_pipeline(
+                ai_client, job.pdf_path, params["jd_full"], params["model"],
+                state=job.state, skills=params.get("skills"),
+                question_bank=self.db if params.get("reuse_questions") else None,
+                consensus=bool(params.get("consensus"))
+            ):
+                self.db.update_job_stage(job.id, stage, state)
+            with metrics.stage("db_save"):
+                return self.on_complete(job, state)
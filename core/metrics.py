@@ -0,0 +1,138 @@
+"""Latency, token and cost instrumentation for the CV pipeline.
+
+Stages and AI calls report events to a sink registered by the app
+(normally `Database.record_metric`). Without a sink, recording is a no-op,
+so core modules stay usable on their own.
+"""
+import contextvars
+import math
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+
+# USD per 1M tokens: (input, output)
+PRICING = {
+    "claude-sonnet-4-20250514": (3.00, 15.00),
+    "gemini-2.5-flash": (0.30, 2.50),
+}
+
+# Latency histogram resolution: each bucket is 10% wider than the previous
+BUCKET_GROWTH = 1.1
+
+_sink: Optional[Callable[[dict], None]] = None
+_current_run = contextvars.ContextVar("metrics_run_id", default=None)
+
+
+def set_sink(sink: Optional[Callable[[dict], None]]):
+    """Register the function that receives metric events"""
+    global _sink
+    _sink = sink
+
+
+def estimate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
+    """Estimate USD cost of a call from token counts"""
+    input_price, output_price = PRICING.get(model, (0.0, 0.0))
+    return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+
+def latency_bucket(latency_ms: float) -> int:
+    """Map a latency to its histogram bucket index"""
+    return int(math.log(max(latency_ms, 1.0), BUCKET_GROWTH))
+
+
+def bucket_latency(bucket: int) -> float:
+    """Representative latency (geometric midpoint) of a histogram bucket"""
+    return BUCKET_GROWTH ** (bucket + 0.5)
+
+
+def current_run() -> Optional[str]:
+    """ID of the pipeline run the current context belongs to"""
+    return _current_run.get()
+
+
+def record(kind: str, name: str, **fields):
+    """Send a metric event to the sink. Never raises."""
+    if _sink is None:
+        return
+    event = {
+        "run_id": _current_run.get(),
+        "kind": kind,
+        "name": name,
+        "provider": None,
+        "model": None,
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "latency_ms": None,
+        "cache_hit": False,
+        "error": None,
+        "cost": 0.0,
+    }
+    event.update(fields)
+    try:
+        _sink(event)
+    except Exception:
+        # Instrumentation must never break the pipeline
+        pass
+
+
+def record_call(
+    provider: str,
+    model: str,
+    latency_ms: float,
+    input_tokens: int = 0,
+    output_tokens: int = 0,
+    cache_hit: bool = False,
+    error: str = None
+):
+    """Record one AI provider call"""
+    record(
+        "call", f"ai:{provider}",
+        provider=provider,
+        model=model,
+        latency_ms=latency_ms,
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        cache_hit=cache_hit,
+        error=error,
+        cost=estimate_cost(model, input_tokens, output_tokens)
+    )
+
+
+def record_cache(name: str, hit: bool):
+    """Record a lookup in one of the app's local caches"""
+    record("cache", name, cache_hit=hit)
+
+
+@contextmanager
+def run(run_id: str = None):
+    """Group all events in this context under one pipeline run (candidate)"""
+    token = _current_run.set(run_id or uuid.uuid4().hex)
+    try:
+        yield _current_run.get()
+    finally:
+        _current_run.reset(token)
+
+
+@contextmanager
+def stage(name: str):
+    """Time a pipeline stage and record its latency and any error"""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        record("stage", name, latency_ms=(time.perf_counter() - start) * 1000,
+               error=type(e).__name__)
+        raise
+    record("stage", name, latency_ms=(time.perf_counter() - start) * 1000)
+
+
+def bind(fn: Callable) -> Callable:
+    """Wrap fn so it runs with the caller's metrics context in worker threads"""
+    ctx = contextvars.copy_context()
+
+    def wrapper(*args, **kwargs):
+        return ctx.copy().run(fn, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,101 @@
+"""Near-duplicate CV detection with MinHash signatures and LSH banding.
+
+Each CV's text is normalized and cut into overlapping word shingles. A
+MinHash signature estimates the Jaccard similarity of two shingle sets;
+LSH splits the signature into bands so that only records sharing at least
+one band bucket have to be compared, keeping lookups sub-linear in the
+size of the history.
+
+Signatures use one-permutation hashing: each shingle hash is routed to
+one of NUM_PERM bins by its low bits and the bin keeps the minimum of the
+remaining bits. Empty bins are filled from the next non-empty bin (rotation
+densification). That needs a single pass over the shingles instead of one
+pass per permutation, so saving a record stays cheap.
+"""
+import hashlib
+import re
+from array import array
+
+
+NUM_PERM = 128
+BANDS = 16  # 16 bands x 8 rows: pairs above ~0.7 similarity usually collide
+ROWS = NUM_PERM // BANDS
+SHINGLE_WORDS = 5
+MIN_WORDS = 50  # shorter texts (e.g. vision-only placeholders) are not indexed
+DUPLICATE_THRESHOLD = 0.8
+
+_BIN_BITS = NUM_PERM.bit_length() - 1  # NUM_PERM must be a power of two
+_VALUE_BITS = 64 - _BIN_BITS
+_EMPTY = 1 << _VALUE_BITS
+
+_WORD_RE = re.compile(r"[a-z0-9+#]+")
+
+
+def _hash64(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+def shingles(text: str, size: int = SHINGLE_WORDS) -> set[int]:
+    """Hashed word shingles of lowercased text (whitespace/punctuation ignored).
+
+    Returns an empty set for texts shorter than MIN_WORDS words.
+    """
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < max(size, MIN_WORDS):
+        return set()
+    return {
+        _hash64(" ".join(words[i:i + size]).encode())
+        for i in range(len(words) - size + 1)
+    }
+
+
+def minhash(text: str) -> array:
+    """MinHash signature of a text (NUM_PERM unsigned 64-bit values).
+
+    Returns an empty array for text too short to index.
+    """
+    hashed = shingles(text)
+    if not hashed:
+        return array("Q")
+
+    bins = [_EMPTY] * NUM_PERM
+    mask = NUM_PERM - 1
+    for h in hashed:
+        value = h >> _BIN_BITS
+        if value < bins[h & mask]:
+            bins[h & mask] = value
+
+    # Densify: an empty bin borrows the next non-empty bin's value, tagged
+    # with the distance so borrowed and genuine values never collide
+    signature = array("Q", bins)
+    for i in range(NUM_PERM):
+        if bins[i] == _EMPTY:
+            distance = 1
+            while bins[(i + distance) & mask] == _EMPTY:
+                distance += 1
+            signature[i] = (distance << _VALUE_BITS) | bins[(i + distance) & mask]
+    return signature
+
+
+def band_keys(signature: array) -> list[int]:
+    """LSH bucket key for each band (signed 64-bit, to fit SQLite INTEGER)"""
+    keys = []
+    for band in range(BANDS):
+        chunk = signature[band * ROWS:(band + 1) * ROWS].tobytes()
+        digest = hashlib.blake2b(chunk, digest_size=8, person=band.to_bytes(2, "little"))
+        keys.append(int.from_bytes(digest.digest(), "little", signed=True))
+    return keys
+
+
+def similarity(sig_a: array, sig_b: array) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    if not sig_a or len(sig_a) != len(sig_b):
+        return 0.0
+    return sum(a == b for a, b in zip(sig_a, sig_b)) / len(sig_a)
+
+
+def signature_from_bytes(blob: bytes) -> array:
+    """Restore a signature stored with `array.tobytes()`"""
+    signature = array("Q")
+    signature.frombytes(blob)
+    return signature
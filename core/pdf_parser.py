@@ -1,7 +1,22 @@
 """PDF text extraction using PyMuPDF with fallback to image extraction"""
-import fitz  # PyMuPDF
 import base64
+import threading
+import time
 from pathlib import Path
+from typing import Iterator
+
+
+# Separates pages in extracted text (form feed, as pdftotext does)
+PAGE_BREAK = "\f"
+
+# Scanned CVs are cut to this many leading pages before AI vision (see slim_pdf)
+MAX_VISION_PAGES = 10
+
+
+def _fitz():
+    """Import PyMuPDF on first use to keep app startup fast"""
+    import fitz  # PyMuPDF
+    return fitz
 
 
 def extract_text_from_pdf(pdf_path: str) -> str:
@@ -11,8 +26,10 @@ def extract_text_from_pdf(pdf_path: str) -> str:
         pdf_path: Path to PDF file
 
     Returns:
-        Extracted text content (may be empty for image-based PDFs)
+        Extracted text content, pages separated by PAGE_BREAK
+        (may be empty for image-based PDFs)
     """
+    fitz = _fitz()
     text_parts = []
 
     with fitz.open(pdf_path) as doc:
@@ -21,11 +38,12 @@ def extract_text_from_pdf(pdf_path: str) -> str:
             if text.strip():
                 text_parts.append(text)
 
-    return "\n".join(text_parts)
+    return PAGE_BREAK.join(text_parts)
 
 
 def is_image_based_pdf(pdf_path: str) -> bool:
     """Check if PDF is image-based (scanned) with no text layer."""
+    fitz = _fitz()
     with fitz.open(pdf_path) as doc:
         for page in doc:
             if page.get_text().strip():
@@ -33,9 +51,47 @@ def is_image_based_pdf(pdf_path: str) -> bool:
     return True
 
 
+def iter_pdf_images(pdf_path: str, dpi: int = 150) -> Iterator[bytes]:
+    """Render PDF pages to PNG images one page at a time.
+
+    Only the current page's image is held in memory, so callers that
+    upload or encode each image as it arrives keep peak memory flat.
+
+    Args:
+        pdf_path: Path to PDF file
+        dpi: Resolution for rendering (default 150)
+
+    Yields:
+        Raw PNG bytes for each page
+    """
+    fitz = _fitz()
+    zoom = dpi / 72  # 72 is default PDF resolution
+    mat = fitz.Matrix(zoom, zoom)
+
+    with fitz.open(pdf_path) as doc:
+        for page in doc:
+            yield page.get_pixmap(matrix=mat).tobytes("png")
+
+
+def pdf_to_images(pdf_path: str, dpi: int = 150) -> list[bytes]:
+    """Convert PDF pages to raw PNG images.
+
+    Args:
+        pdf_path: Path to PDF file
+        dpi: Resolution for rendering (default 150)
+
+    Returns:
+        List of PNG bytes, one per page
+    """
+    return list(iter_pdf_images(pdf_path, dpi))
+
+
 def pdf_to_base64_images(pdf_path: str, dpi: int = 150) -> list[str]:
     """Convert PDF pages to base64 encoded PNG images.
 
+    Prefer `iter_pdf_images`; base64 is only needed for wire formats that
+    require it, and `AIClient.chat_with_images` encodes per image itself.
+
     Args:
         pdf_path: Path to PDF file
         dpi: Resolution for rendering (default 150)
@@ -43,20 +99,93 @@ def pdf_to_base64_images(pdf_path: str, dpi: int = 150) -> list[str]:
     Returns:
         List of base64 encoded PNG images
     """
-    images = []
-    zoom = dpi / 72  # 72 is default PDF resolution
+    return [base64.b64encode(img).decode("ascii") for img in iter_pdf_images(pdf_path, dpi)]
 
-    with fitz.open(pdf_path) as doc:
-        for page in doc:
-            mat = fitz.Matrix(zoom, zoom)
-            pix = page.get_pixmap(matrix=mat)
-            img_bytes = pix.tobytes("png")
-            b64 = base64.b64encode(img_bytes).decode("utf-8")
-            images.append(b64)
 
-    return images
+def get_pdf_page_count(pdf_path: str) -> int:
+    """Number of pages in a PDF"""
+    fitz = _fitz()
+    with fitz.open(pdf_path) as doc:
+        return doc.page_count
 
 
 def get_pdf_as_bytes(pdf_path: str) -> bytes:
     """Read PDF file as bytes for API upload."""
     return Path(pdf_path).read_bytes()
+
+
+# Cumulative slimming results for this process (shown in the Metrics tab)
+_slim_stats = {"count": 0, "original_bytes": 0, "slim_bytes": 0, "total_ms": 0.0}
+_slim_lock = threading.Lock()
+
+
+def slim_pdf(
+    pdf_bytes: bytes,
+    max_pages: int = MAX_VISION_PAGES,
+    image_dpi: int = 150,
+    jpeg_quality: int = 75
+) -> tuple[bytes, dict]:
+    """Shrink a PDF before sending it to a vision model.
+
+    Limits pages, downsamples images above `image_dpi`, subsets embedded
+    fonts, drops metadata and attachments, and recompresses streams. If the
+    result is not smaller, the original bytes are returned.
+
+    Args:
+        pdf_bytes: Original PDF content
+        max_pages: Keep at most this many leading pages
+        image_dpi: Target resolution for downsampled images
+        jpeg_quality: JPEG quality for re-encoded images
+
+    Returns:
+        (slimmed PDF bytes, stats dict with sizes, pages and elapsed ms)
+    """
+    fitz = _fitz()
+    start = time.perf_counter()
+
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        original_pages = doc.page_count
+        if doc.page_count > max_pages:
+            doc.select(range(max_pages))
+
+        for name in doc.embfile_names():
+            doc.embfile_del(name)
+        doc.set_metadata({})
+        doc.del_xml_metadata()
+
+        # Optional steps depend on the installed PyMuPDF version
+        if hasattr(doc, "rewrite_images"):
+            doc.rewrite_images(
+                dpi_threshold=int(image_dpi * 1.2), dpi_target=image_dpi, quality=jpeg_quality
+            )
+        try:
+            doc.subset_fonts()
+        except Exception:
+            pass  # fonts that cannot be subset are kept as-is
+
+        slim_bytes = doc.tobytes(garbage=4, deflate=True, clean=True)
+
+    if len(slim_bytes) >= len(pdf_bytes):
+        slim_bytes = pdf_bytes
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    stats = {
+        "original_bytes": len(pdf_bytes),
+        "slim_bytes": len(slim_bytes),
+        "saved_bytes": len(pdf_bytes) - len(slim_bytes),
+        "original_pages": original_pages,
+        "pages": min(original_pages, max_pages),
+        "elapsed_ms": round(elapsed_ms, 1),
+    }
+    with _slim_lock:
+        _slim_stats["count"] += 1
+        _slim_stats["original_bytes"] += stats["original_bytes"]
+        _slim_stats["slim_bytes"] += stats["slim_bytes"]
+        _slim_stats["total_ms"] += elapsed_ms
+    return slim_bytes, stats
+
+
+def get_slim_stats() -> dict:
+    """Get cumulative PDF slimming results for this process"""
+    with _slim_lock:
+        return dict(_slim_stats)
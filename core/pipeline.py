@@ -0,0 +1,207 @@
+"""CV processing pipeline shared by the UI and the batch CLI.
+
+The pipeline runs in stages (analysis, questions, score). `iter_pipeline`
+yields after each stage so callers can stream progress or persist it, and
+it skips stages whose results are already present in the state it is given.
+"""
+import hashlib
+from pathlib import Path
+from typing import Iterator
+
+from . import metrics
+from .ai_client import AIClient
+from .pdf_parser import (
+    MAX_VISION_PAGES, extract_text_from_pdf, get_pdf_as_bytes, get_pdf_page_count
+)
+from .question_generator import analyze_cv, analyze_cv_from_pdf, generate_interview_questions
+from .cv_scorer import score_cv, score_cv_consensus
+from .skill_matcher import match_skills
+
+
+STAGES = ("analysis", "questions", "score")
+
+# Stored as cv_text when the CV had to be read through AI vision
+IMAGE_PDF_PLACEHOLDER = "[Image-based PDF - analyzed via AI vision]"
+
+# Put before the summary of a scanned CV cut to MAX_VISION_PAGES, so the
+# UI, reports and scoring all know the rest of the CV was not read
+TRUNCATED_PDF_NOTE = (
+    "> ⚠️ Scanned CV: only the first {analyzed} of {total} pages were analyzed.\n\n"
+)
+
+# Stored as summary/questions of candidates rejected by the skill pre-screen
+PRESCREEN_REJECTED_TEXT = "_Not analyzed: auto-rejected by the skill pre-screen._"
+
+
+def prescreen_rejection(skill_match: dict, min_coverage: float) -> dict:
+    """Score result for a candidate rejected before any LLM call"""
+    missing = ", ".join(skill_match["missing_required"])
+    return {
+        "overall_score": None,
+        "parse_status": "auto_rejected",
+        "recommendation": "No Hire",
+        "summary": (
+            f"Required-skill coverage {skill_match['required_coverage']:.0%} is below "
+            f"the {min_coverage:.0%} threshold. Missing: {missing}."
+        ),
+        "skill_match": skill_match,
+    }
+
+
+def _prescreen(state: dict, cv_text: str, skills: dict) -> bool:
+    """Match skills into state; on rejection fill every result and return True"""
+    if not (skills and cv_text.strip() and (skills.get("required") or skills.get("nice_to_have"))):
+        return False
+    with metrics.stage("skill_match"):
+        state["skill_match"] = match_skills(
+            cv_text, skills.get("required", []), skills.get("nice_to_have", [])
+        )
+    min_coverage = skills.get("min_coverage")
+    if not min_coverage or state["skill_match"]["required_coverage"] >= min_coverage:
+        return False
+    state.update(
+        cv_text=cv_text,
+        cv_summary=PRESCREEN_REJECTED_TEXT,
+        questions=PRESCREEN_REJECTED_TEXT,
+        score_result=prescreen_rejection(state["skill_match"], min_coverage),
+    )
+    return True
+
+
+def build_jd_text(
+    jd_mode: str,
+    jd_text: str,
+    jd_required: str = "",
+    jd_nice_to_have: str = "",
+    jd_experience=""
+) -> str:
+    """Build the job description text from free-text or structured input"""
+    if jd_mode == "Structured":
+        return f"""
+## Required Skills
+{jd_required}
+
+## Nice to Have
+{jd_nice_to_have}
+
+## Experience Required
+{jd_experience} years
+"""
+    return jd_text
+
+
+def file_hash(pdf_path: str) -> str:
+    """SHA-256 of a file's contents, read in chunks"""
+    digest = hashlib.sha256()
+    with open(pdf_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def jd_hash(jd_text: str) -> str:
+    """SHA-256 of a job description, ignoring whitespace differences"""
+    return hashlib.sha256(" ".join(jd_text.split()).encode("utf-8")).hexdigest()
+
+
+def iter_pipeline(
+    ai_client: AIClient,
+    pdf_path: str,
+    jd_full: str,
+    model: str = "gemini",
+    state: dict = None,
+    skills: dict = None,
+    question_bank=None,
+    consensus: bool = False
+) -> Iterator[tuple[str, dict]]:
+    """Run the pipeline stage by stage.
+
+    Args:
+        ai_client: Configured AI client
+        pdf_path: Path to the CV PDF
+        jd_full: Job description text
+        model: "claude", "gemini" or "fake"
+        state: Results of already completed stages (for resuming), or
+            cv_text and a cv_summary reused from a near-duplicate CV
+        skills: Optional local pre-screen with "required" and "nice_to_have"
+            skill lists and "min_coverage" (0-1, or None to never reject)
+        question_bank: Optional Database whose question bank is reused
+        consensus: Score from several samples (see score_cv_consensus)
+
+    Yields:
+        (stage name, state dict) after each stage that ran. State holds
+        cv_text, cv_summary, questions and score_result as they complete,
+        plus skill_match when pre-screening. A rejected candidate yields a
+        single "prescreen" stage with every result filled in.
+    """
+    state = dict(state or {})
+
+    if "cv_summary" not in state:
+        # Check if PDF is image-based (scanned) or has text layer
+        with metrics.stage("pdf_parse"):
+            cv_text = extract_text_from_pdf(pdf_path)
+
+        if _prescreen(state, cv_text, skills):
+            yield "prescreen", state
+            return
+
+        # Analyze CV - use direct PDF vision if text extraction fails
+        with metrics.stage("cv_analysis"):
+            if cv_text.strip():
+                state["cv_summary"] = analyze_cv(ai_client, cv_text, model)
+            else:
+                pdf_bytes = get_pdf_as_bytes(pdf_path)
+                state["cv_summary"] = analyze_cv_from_pdf(ai_client, pdf_bytes, model)
+                cv_text = IMAGE_PDF_PLACEHOLDER
+                total_pages = get_pdf_page_count(pdf_path)
+                if total_pages > MAX_VISION_PAGES:
+                    state["cv_summary"] = TRUNCATED_PDF_NOTE.format(
+                        analyzed=MAX_VISION_PAGES, total=total_pages
+                    ) + state["cv_summary"]
+        state["cv_text"] = cv_text
+        yield "analysis", state
+    elif ("skill_match" not in state and "score_result" not in state
+          and state.get("cv_text") not in (None, IMAGE_PDF_PLACEHOLDER)):
+        # Summary reused from a near-duplicate: this CV still gets pre-screened
+        if _prescreen(state, state["cv_text"], skills):
+            yield "prescreen", state
+            return
+
+    if "questions" not in state:
+        with metrics.stage("questions"):
+            state["questions"] = generate_interview_questions(
+                ai_client, state["cv_summary"], jd_full, model, question_bank=question_bank
+            )
+        yield "questions", state
+
+    if "score_result" not in state:
+        with metrics.stage("scoring"):
+            scorer = score_cv_consensus if consensus else score_cv
+            state["score_result"] = scorer(ai_client, state["cv_summary"], jd_full, model)
+        if "skill_match" in state:
+            state["score_result"]["skill_match"] = state["skill_match"]
+        yield "score", state
+
+
+def run_pipeline(
+    ai_client: AIClient,
+    pdf_path: str,
+    jd_full: str,
+    model: str = "gemini",
+    skills: dict = None,
+    question_bank=None,
+    consensus: bool = False
+) -> dict:
+    """Run all pipeline stages and return the final state"""
+    state = {}
+    for _, state in iter_pipeline(
+        ai_client, pdf_path, jd_full, model, skills=skills, question_bank=question_bank,
+        consensus=consensus
+    ):
+        pass
+    return state
+
+
+def candidate_name_from_path(pdf_path: str) -> str:
+    """Derive a readable candidate name from a CV file name"""
+    return Path(pdf_path).stem.replace("_", " ").replace("-", " ").strip() or "Unknown"
@@ -0,0 +1,192 @@
+"""Opt-in request profiling with cProfile and tracemalloc.
+
+Wrap a handler with `profiled(name)`. When profiling is enabled, a sampled
+share of calls runs under cProfile with tracemalloc tracing; each profiled
+call writes `<timestamp>_<name>.prof` (load with pstats or snakeviz) and a
+`.txt` report with the top functions by cumulative time and the top
+allocation sites under `data/profiles/`.
+
+Only one call is profiled at a time; calls arriving meanwhile run normally,
+so overhead stays bounded by the sample rate even under load.
+
+Environment configuration (overrides Settings):
+    IH_PROFILE              "1" to enable, "0" to disable
+    IH_PROFILE_SAMPLE_RATE  Share of calls to profile, 0-1 (default 0.1)
+    IH_PROFILE_TOP          Entries per report section (default 25)
+"""
+import cProfile
+import functools
+import inspect
+import io
+import logging
+import os
+import pstats
+import random
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR = Path(__file__).parent.parent / "data" / "profiles"
+
+_config = {
+    "enabled": os.getenv("IH_PROFILE") == "1",
+    "sample_rate": float(os.getenv("IH_PROFILE_SAMPLE_RATE", "0.1")),
+    "top_n": int(os.getenv("IH_PROFILE_TOP", "25")),
+}
+_busy = threading.Lock()
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def configure(enabled: bool = None, sample_rate: float = None):
+    """Apply profiling settings; values set by environment variables win"""
+    if enabled is not None and os.getenv("IH_PROFILE") is None:
+        _config["enabled"] = enabled
+    if sample_rate is not None and os.getenv("IH_PROFILE_SAMPLE_RATE") is None:
+        _config["sample_rate"] = max(0.0, min(1.0, sample_rate))
+
+
+def get_profiling_stats() -> dict:
+    """Get profiling settings and counts of profiled / skipped calls"""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats.update(_config)
+    return stats
+
+
+def _count(key: str):
+    with _stats_lock:
+        _stats[key] += 1
+
+
+class _Session:
+    """One profiled call: cProfile plus a tracemalloc diff"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.profile = cProfile.Profile()
+        self.started_tracing = not tracemalloc.is_tracing()
+        if self.started_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        self.before = tracemalloc.take_snapshot()
+        self.start = time.perf_counter()
+
+    def finish(self, error: BaseException = None):
+        elapsed = time.perf_counter() - self.start
+        after = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        if self.started_tracing:
+            tracemalloc.stop()
+        try:
+            self._write(elapsed, peak, after, error)
+        except OSError:
+            logger.exception("Could not write profile for %s", self.name)
+
+    def _write(self, elapsed: float, peak: int, after, error):
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        stem = f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{self.name}"
+        self.profile.dump_stats(PROFILE_DIR / f"{stem}.prof")
+
+        top_n = _config["top_n"]
+        functions = io.StringIO()
+        pstats.Stats(self.profile, stream=functions).sort_stats("cumulative").print_stats(top_n)
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        allocations = after.filter_traces(filters).compare_to(
+            self.before.filter_traces(filters), "lineno"
+        )[:top_n]
+
+        lines = [
+            f"{self.name}: {elapsed * 1000:.0f} ms, peak traced memory {peak / 1024 / 1024:.1f} MB"
+            + (f", raised {type(error).__name__}" if error else ""),
+            "",
+            f"Top {top_n} allocation sites (growth since the call started):",
+            *(str(stat) for stat in allocations),
+            "",
+            f"Top {top_n} functions by cumulative time:",
+            functions.getvalue(),
+        ]
+        (PROFILE_DIR / f"{stem}.txt").write_text("\n".join(lines), encoding="utf-8")
+        logger.info("Profile written: %s (%.0f ms, peak %.1f MB)",
+                    stem, elapsed * 1000, peak / 1024 / 1024)
+
+
+def _start(name: str):
+    """Start a session if this call is sampled and no other call is profiled"""
+    if not _config["enabled"] or random.random() >= _config["sample_rate"]:
+        return None
+    if not _busy.acquire(blocking=False):
+        _count("skipped_busy")
+        return None
+    try:
+        session = _Session(name)
+    except Exception:
+        _busy.release()
+        raise
+    _count("profiled")
+    return session
+
+
+def _stop(session: _Session, error: BaseException = None):
+    try:
+        session.finish(error)
+    finally:
+        _busy.release()
+
+
+def profiled(name: str):
+    """Decorator: profile sampled calls of a function or generator function.
+
+    Generators are profiled across their whole iteration; the profiler only
+    runs while the generator itself executes, not while its consumer does.
+    """
+    def decorator(fn):
+        if inspect.isgeneratorfunction(fn):
+            @functools.wraps(fn)
+            def gen_wrapper(*args, **kwargs):
+                session = _start(name)
+                if session is None:
+                    return (yield from fn(*args, **kwargs))
+                gen = fn(*args, **kwargs)
+                error = None
+                try:
+                    while True:
+                        session.profile.enable()
+                        try:
+                            item = next(gen)
+                        except StopIteration as stop:
+                            return stop.value
+                        finally:
+                            session.profile.disable()
+                        yield item
+                except GeneratorExit:
+                    raise  # consumer stopped early
+                except BaseException as e:
+                    error = e
+                    raise
+                finally:
+                    gen.close()
+                    _stop(session, error)
+            return gen_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            session = _start(name)
+            if session is None:
+                return fn(*args, **kwargs)
+            error = None
+            try:
+                return session.profile.runcall(fn, *args, **kwargs)
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                _stop(session, error)
+        return wrapper
+    return decorator
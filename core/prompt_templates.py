@@ -16,6 +16,42 @@ Extract and return:
 Format as structured markdown."""
 
 
+# Map step for long CVs: each chunk is summarized on its own
+CV_CHUNK_PROMPT = """Analyze this resume excerpt (part {part} of {total}) and extract every fact it contains.
+
+Resume excerpt:
+{chunk_text}
+
+List, as markdown bullet points under matching headings:
+- Name and contact info
+- Work experience (company, role, dates, key achievements)
+- Technical skills
+- Education
+- Certifications
+- Publications, projects or other notable items
+
+Only include what appears in this excerpt. Do not guess missing sections."""
+
+
+# Reduce step: merge chunk analyses into the standard CV summary
+CV_MERGE_PROMPT = """Merge these partial analyses of one resume into a single structured summary.
+
+{partials}
+
+Combine duplicates, keep work experience in reverse chronological order, and
+summarize long publication or project lists to the most relevant items.
+
+Extract and return:
+1. **Full Name** and contact info (location, email if visible)
+2. **Professional Summary** (2-3 sentences)
+3. **Work Experience** (company, role, dates, key achievements for each)
+4. **Technical Skills** (categorized: backend, frontend, database, cloud, tools)
+5. **Education** (degree, school, year)
+6. **Certifications** (if any)
+
+Format as structured markdown."""
+
+
 QUESTION_GENERATION_PROMPT = """You are an expert technical interviewer. Based on the CV analysis and Job Description, generate comprehensive interview questions.
 
 ## CV Summary:
@@ -55,6 +91,34 @@ Also include a brief "Assessment Notes" section highlighting:
 - Recommended focus areas"""
 
 
+# Reduced question prompt: some categories are already filled from the
+# question bank, so only the gap is generated
+QUESTION_GAP_PROMPT = """You are an expert technical interviewer. Based on the CV analysis and Job Description, generate the missing interview questions.
+
+## CV Summary:
+{cv_summary}
+
+## Job Description:
+{jd_text}
+
+## Already selected (do not repeat or rephrase these):
+{existing_questions}
+
+## Generate only these categories:
+
+{gap_categories}
+
+## Output Format:
+For each category above, use its heading as given and a markdown table:
+| # | Question | Purpose |
+|---|----------|---------|
+
+Also include a brief "Assessment Notes" section highlighting:
+- Key strengths to validate
+- Potential concerns to explore
+- Recommended focus areas"""
+
+
 SCORING_PROMPT = """Score this candidate's fit for the position (0-100).
 
 ## CV Summary:
@@ -116,3 +180,98 @@ COMPARE_CVS_PROMPT = """Compare these candidates for the same position.
 |--------|-------------------|
 
 End with a ranking recommendation and rationale."""
+
+
+# Group round of a large comparison: rank a subset, best first
+COMPARE_GROUP_PROMPT = """Rank these candidates for the same position, best fit first.
+
+## Job Description:
+{jd_text}
+
+## Candidates (each identified by the ID in brackets):
+{candidates_summaries}
+
+Return "ranking": every candidate ID above, best fit first, and "notes":
+one short sentence per candidate explaining its place."""
+
+
+COMPARE_GROUP_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "ranking": {"type": "array", "items": {"type": "integer"}},
+        "notes": {"type": "string"},
+    },
+    "required": ["ranking", "notes"],
+}
+
+
+def _score_item(max_score: int, *extra: str) -> dict:
+    """Schema for one breakdown entry with a bounded integer score"""
+    properties = {"score": {"type": "integer", "minimum": 0, "maximum": max_score}}
+    for field in extra:
+        if field == "notes":
+            properties[field] = {"type": "string"}
+        else:
+            properties[field] = {"type": "array", "items": {"type": "string"}}
+    return {"type": "object", "properties": properties, "required": ["score", *extra]}
+
+
+# JSON schema for SCORING_PROMPT output. Sent to providers as a structured
+# output constraint and compiled locally to validate/repair responses.
+SCORING_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "overall_score": {"type": "integer", "minimum": 0, "maximum": 100},
+        "breakdown": {
+            "type": "object",
+            "properties": {
+                "required_skills": _score_item(40, "matched", "missing"),
+                "experience_level": _score_item(25, "notes"),
+                "nice_to_have": _score_item(20, "matched"),
+                "education": _score_item(10, "notes"),
+                "tech_modernity": _score_item(5, "notes"),
+            },
+            "required": [
+                "required_skills", "experience_level", "nice_to_have",
+                "education", "tech_modernity"
+            ],
+        },
+        "summary": {"type": "string"},
+        "recommendation": {
+            "type": "string",
+            "enum": ["Strong Hire", "Hire", "Maybe", "No Hire"],
+        },
+    },
+    "required": ["overall_score", "breakdown", "summary", "recommendation"],
+}
+
+
+SCORE_REPAIR_PROMPT = """The JSON below was meant to match the scoring schema but failed validation.
+
+## Validation errors:
+{errors}
+
+## Invalid JSON:
+{raw_response}
+
+Return only the corrected JSON object. Keep every score and assessment that is already valid; fix only the listed problems."""
+
+
+# Translation of generated report content; texts are sent as a JSON array
+TRANSLATE_PROMPT = """Translate each text in the JSON array below into {language_name}.
+
+Keep markdown formatting, names, company names and technology terms unchanged.
+Return "translations": the translated texts, in the same order and with the
+same number of items.
+
+Texts:
+{texts_json}"""
+
+
+TRANSLATE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "translations": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["translations"],
+}
@@ -0,0 +1,290 @@
+"""Question bank: reuse previously generated interview questions.
+
+Generated question tables are parsed into rows tagged with their category
+and the skills they mention, and stored in the database. For a new
+candidate, the skill-specific category (Scenario-Based) is filled with
+banked questions about skills the candidate claims and the JD asks for,
+and generic categories (Independent Work, Growth Mindset) with the most
+used banked questions. Only the remaining gap, always including the
+candidate-specific categories, goes through a reduced LLM prompt.
+
+Candidate-specific categories are never banked: Technical Deep-Dive
+questions name the candidate's own projects and employers.
+"""
+import re
+import threading
+import time
+from collections import Counter
+
+from . import metrics
+from .ai_client import AIClient
+from .prompt_templates import QUESTION_GAP_PROMPT, QUESTION_GENERATION_PROMPT
+from .skill_matcher import SKILL_ALIASES, match_skills
+
+
+# (name, description, questions wanted, reuse kind). Reuse kinds: "skill"
+# questions are reused by skill, "generic" ones for anyone, "candidate"
+# ones are always generated for the specific CV and never banked.
+CATEGORIES = [
+    ("Technical Deep-Dive",
+     "Verify claimed technical skills. Ask about specific technologies mentioned in CV.",
+     6, "candidate"),
+    ("Experience Validation",
+     "Verify work experience claims. Ask about specific projects, achievements, numbers.",
+     4, "candidate"),
+    ("Scenario-Based",
+     "Problem-solving scenarios relevant to the job requirements.",
+     4, "skill"),
+    ("Independent Work & AI Usage",
+     "Assess ability to work independently and use AI tools productively.",
+     3, "generic"),
+    ("Growth Mindset",
+     "Evaluate learning ability, adaptability, career goals.",
+     3, "generic"),
+    ("Red Flags to Probe",
+     "Address any gaps, inconsistencies, or concerns from CV.",
+     2, "candidate"),
+]
+_REUSE_KIND = {name: kind for name, _, _, kind in CATEGORIES}
+# Language-neutral category keys (also the ui.i18n translation keys)
+CATEGORY_KEYS = {
+    name: "_".join(re.findall(r"[a-z]+", name.lower())) for name, _, _, _ in CATEGORIES
+}
+_TAXONOMY = list(SKILL_ALIASES)
+
+_HEADING_RE = re.compile(r"^#{2,4}\s*(?:\d+\.\s*)?(.+?)\s*(?:\(.*\))?\s*$")
+
+# Cumulative reuse results for this process (shown in the Metrics tab)
+_bank_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def _category_for(heading: str):
+    heading = heading.lower()
+    for name, _, _, _ in CATEGORIES:
+        # "Red Flags" and "Red Flags to Probe" both map to the category
+        if heading.startswith(name.lower()[:9]):
+            return name
+    return None
+
+
+def parse_questions(markdown: str) -> tuple[list[dict], str]:
+    """Parse generated question tables.
+
+    Args:
+        markdown: Question generation output
+
+    Returns:
+        (questions as dicts with category, question and purpose,
+        the Assessment Notes section text or "")
+    """
+    questions = []
+    notes = []
+    category = None
+    in_notes = False
+    for line in markdown.splitlines():
+        heading = _HEADING_RE.match(line.strip()) if line.lstrip().startswith("#") else None
+        if heading:
+            in_notes = "assessment notes" in heading.group(1).lower()
+            category = None if in_notes else _category_for(heading.group(1))
+            continue
+        if in_notes:
+            notes.append(line)
+            continue
+        if category is None or not line.lstrip().startswith("|"):
+            continue
+        cells = [cell.strip() for cell in line.strip().strip("|").split("|")]
+        if len(cells) < 2 or set(cells[1]) <= set("-: ") or cells[1].lower() == "question":
+            continue
+        questions.append({
+            "category": category,
+            "question": cells[1],
+            "purpose": cells[2] if len(cells) > 2 else "",
+        })
+    return questions, "\n".join(notes).strip()
+
+
+def structure_questions(markdown: str) -> dict:
+    """Language-neutral form of generated questions, for storage.
+
+    Returns:
+        Dict with "questions" (category key, question, purpose) and "notes"
+    """
+    questions, notes = parse_questions(markdown or "")
+    return {
+        "questions": [dict(q, category=CATEGORY_KEYS[q["category"]]) for q in questions],
+        "notes": notes,
+    }
+
+
+def tag_skills(text: str) -> list[str]:
+    """Canonical taxonomy skills mentioned in text"""
+    return match_skills(text, _TAXONOMY)["matched_required"]
+
+
+def _pick_skill_questions(rows: list[dict], cv_skills: set, relevant: set, count: int) -> list[dict]:
+    """Pick banked questions about the candidate's relevant skills, spreading over skills"""
+    usable = [
+        row for row in rows
+        if row["skills"] and set(row["skills"]) <= cv_skills and relevant & set(row["skills"])
+    ]
+    picked = []
+    covered = set()
+    # First pass prefers questions that cover a new skill, second fills up
+    for prefer_new in (True, False):
+        for row in usable:
+            if len(picked) >= count:
+                return picked
+            if row in picked or (prefer_new and set(row["skills"]) <= covered):
+                continue
+            picked.append(row)
+            covered.update(row["skills"])
+    return picked
+
+
+def _render(selected: dict, notes: str) -> str:
+    """Render categories in the standard order as the usual markdown tables"""
+    sections = []
+    for number, (name, _, _, _) in enumerate(CATEGORIES, start=1):
+        rows = selected.get(name, [])
+        if not rows:
+            continue
+        table = "\n".join(
+            f"| {i} | {row['question']} | {row['purpose']} |" for i, row in enumerate(rows, start=1)
+        )
+        sections.append(
+            f"### {number}. {name}\n\n| # | Question | Purpose |\n|---|----------|---------|\n{table}"
+        )
+    if notes:
+        sections.append(f"### Assessment Notes\n{notes}")
+    return "\n\n".join(sections)
+
+
+def _bankable(questions: list[dict]) -> list[dict]:
+    """Generated questions worth storing, tagged with their skills"""
+    rows = []
+    for q in questions:
+        kind = _REUSE_KIND.get(q["category"])
+        if kind == "candidate":
+            continue
+        skills = tag_skills(f"{q['question']} {q['purpose']}")
+        if kind == "skill" and not skills:
+            continue  # could never be matched to a candidate
+        rows.append(dict(q, skills=skills))
+    return rows
+
+
+def _track(reused: int, generated: int, gap: bool, elapsed_ms: float):
+    with _stats_lock:
+        _bank_stats["runs"] += 1
+        _bank_stats["reused"] += reused
+        _bank_stats["generated"] += generated
+        _bank_stats["gap_calls" if gap else "full_calls"] += 1
+        _bank_stats["gap_ms" if gap else "full_ms"] += elapsed_ms
+    metrics.record_cache("question_bank", reused > 0)
+
+
+def get_question_bank_stats() -> dict:
+    """Get question reuse ratio and estimated generation time saved.
+
+    Time saved compares the average reduced (gap) call with the average
+    full generation call seen in this process.
+
+    Returns:
+        Dict with runs, reused, generated, reuse_ratio, avg_full_ms,
+        avg_gap_ms and est_saved_ms (None until both kinds of call ran)
+    """
+    with _stats_lock:
+        stats = dict(_bank_stats)
+    total = stats.get("reused", 0) + stats.get("generated", 0)
+    full_calls = stats.get("full_calls", 0)
+    gap_calls = stats.get("gap_calls", 0)
+    avg_full = stats.get("full_ms", 0) / full_calls if full_calls else None
+    avg_gap = stats.get("gap_ms", 0) / gap_calls if gap_calls else None
+    return {
+        "runs": stats.get("runs", 0),
+        "reused": stats.get("reused", 0),
+        "generated": stats.get("generated", 0),
+        "reuse_ratio": stats.get("reused", 0) / total if total else 0.0,
+        "avg_full_ms": avg_full,
+        "avg_gap_ms": avg_gap,
+        "est_saved_ms": gap_calls * (avg_full - avg_gap)
+        if avg_full is not None and avg_gap is not None else None,
+    }
+
+
+def generate_with_bank(
+    ai_client: AIClient,
+    cv_summary: str,
+    jd_text: str,
+    model: str,
+    bank
+) -> str:
+    """Generate interview questions, reusing banked ones where they fit.
+
+    Args:
+        ai_client: Configured AI client
+        cv_summary: Analyzed CV summary
+        jd_text: Job description text
+        model: "claude", "gemini" or "fake"
+        bank: Database with find_bank_questions / add_bank_questions /
+            mark_bank_questions_used
+
+    Returns:
+        Interview questions in markdown format
+    """
+    cv_skills = set(tag_skills(cv_summary))
+    relevant = (cv_skills & set(tag_skills(jd_text))) or cv_skills
+
+    selected = {}
+    for name, _, count, kind in CATEGORIES:
+        if kind == "skill" and relevant:
+            rows = bank.find_bank_questions(name, skills=sorted(relevant), limit=count * 10)
+            selected[name] = _pick_skill_questions(rows, cv_skills, relevant, count)
+        elif kind == "generic":
+            selected[name] = bank.find_bank_questions(name, limit=count)
+    reused = sum(len(rows) for rows in selected.values())
+
+    start = time.perf_counter()
+    if not reused:
+        output = ai_client.chat(
+            QUESTION_GENERATION_PROMPT.format(cv_summary=cv_summary, jd_text=jd_text),
+            model_provider=model
+        )
+        generated, _ = parse_questions(output)
+        bank.add_bank_questions(_bankable(generated))
+        _track(0, len(generated), False, (time.perf_counter() - start) * 1000)
+        return output
+
+    gap = [
+        (name, description, count - len(selected.get(name, [])))
+        for name, description, count, _ in CATEGORIES
+        if len(selected.get(name, [])) < count
+    ]
+    existing = "\n".join(
+        f"- {row['question']}" for rows in selected.values() for row in rows
+    )
+    gap_categories = "\n\n".join(
+        f"### {name} ({count} questions)\n{description}" for name, description, count in gap
+    )
+    output = ai_client.chat(
+        QUESTION_GAP_PROMPT.format(
+            cv_summary=cv_summary,
+            jd_text=jd_text,
+            existing_questions=existing,
+            gap_categories=gap_categories
+        ),
+        model_provider=model
+    )
+    generated, notes = parse_questions(output)
+    bank.mark_bank_questions_used([row["id"] for rows in selected.values() for row in rows])
+    gap_names = {name for name, _, _ in gap}
+    used = 0
+    for q in generated:
+        # Ignore extras for categories the bank already filled
+        if q["category"] in gap_names:
+            selected.setdefault(q["category"], []).append(q)
+            used += 1
+    bank.add_bank_questions(_bankable(generated))
+    _track(reused, used, True, (time.perf_counter() - start) * 1000)
+    return _render(selected, notes)
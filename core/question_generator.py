@@ -1,11 +1,29 @@
 """Generate interview questions from CV and JD"""
+from concurrent.futures import ThreadPoolExecutor
+
+from . import metrics
 from .ai_client import AIClient
-from .prompt_templates import CV_ANALYSIS_PROMPT, QUESTION_GENERATION_PROMPT
+from .cv_chunker import split_cv_text
+from .question_bank import generate_with_bank
+from .prompt_templates import (
+    CV_ANALYSIS_PROMPT,
+    CV_CHUNK_PROMPT,
+    CV_MERGE_PROMPT,
+    QUESTION_GENERATION_PROMPT,
+)
+
+
+# CVs longer than this (roughly 8+ dense pages) are analyzed map-reduce style
+CHUNKED_ANALYSIS_THRESHOLD = 30000
+CHUNK_MAX_CHARS = 12000
+CHUNK_WORKERS = 4
 
 
 def analyze_cv(ai_client: AIClient, cv_text: str, model: str = "gemini") -> str:
     """Analyze CV and extract structured information (text-based).
 
+    Very long CVs are routed to `analyze_cv_chunked` automatically.
+
     Args:
         ai_client: Configured AI client
         cv_text: Raw text from CV PDF
@@ -14,10 +32,49 @@ def analyze_cv(ai_client: AIClient, cv_text: str, model: str = "gemini") -> str:
     Returns:
         Structured CV summary in markdown
     """
+    if len(cv_text) > CHUNKED_ANALYSIS_THRESHOLD:
+        return analyze_cv_chunked(ai_client, cv_text, model)
     prompt = CV_ANALYSIS_PROMPT.format(cv_text=cv_text)
     return ai_client.chat(prompt, model_provider=model)
 
 
+def analyze_cv_chunked(
+    ai_client: AIClient,
+    cv_text: str,
+    model: str = "gemini",
+    max_chars: int = CHUNK_MAX_CHARS
+) -> str:
+    """Analyze a long CV by summarizing chunks in parallel, then merging.
+
+    Args:
+        ai_client: Configured AI client
+        cv_text: Raw text from CV PDF
+        model: "claude" or "gemini"
+        max_chars: Maximum characters per chunk
+
+    Returns:
+        Structured CV summary in markdown (same shape as `analyze_cv`)
+    """
+    chunks = split_cv_text(cv_text, max_chars)
+    if len(chunks) == 1:
+        return ai_client.chat(CV_ANALYSIS_PROMPT.format(cv_text=chunks[0]), model_provider=model)
+
+    def summarize(item):
+        part, chunk = item
+        prompt = CV_CHUNK_PROMPT.format(part=part, total=len(chunks), chunk_text=chunk)
+        return ai_client.chat(prompt, model_provider=model)
+
+    with metrics.stage("cv_analysis_map"):
+        with ThreadPoolExecutor(max_workers=min(CHUNK_WORKERS, len(chunks))) as pool:
+            partials = list(pool.map(metrics.bind(summarize), enumerate(chunks, start=1)))
+
+    merged = "\n\n".join(
+        f"## Part {part}\n{partial}" for part, partial in enumerate(partials, start=1)
+    )
+    with metrics.stage("cv_analysis_reduce"):
+        return ai_client.chat(CV_MERGE_PROMPT.format(partials=merged), model_provider=model)
+
+
 def analyze_cv_from_pdf(
     ai_client: AIClient,
     pdf_bytes: bytes,
@@ -54,7 +111,8 @@ def generate_interview_questions(
     ai_client: AIClient,
     cv_summary: str,
     jd_text: str,
-    model: str = "gemini"
+    model: str = "gemini",
+    question_bank=None
 ) -> str:
     """Generate interview questions based on CV and JD.
 
@@ -63,10 +121,14 @@ def generate_interview_questions(
         cv_summary: Analyzed CV summary
         jd_text: Job description text
         model: "claude" or "gemini"
+        question_bank: Optional Database holding the question bank; banked
+            questions are reused and only the gap is generated
 
     Returns:
         Interview questions in markdown format
     """
+    if question_bank is not None:
+        return generate_with_bank(ai_client, cv_summary, jd_text, model, question_bank)
     prompt = QUESTION_GENERATION_PROMPT.format(
         cv_summary=cv_summary,
         jd_text=jd_text
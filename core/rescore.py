@@ -0,0 +1,102 @@
+"""Re-score stored candidates of a position against an edited JD.
+
+Only `score_cv` (and optionally `generate_interview_questions`) runs, from
+each record's stored `cv_summary`; the PDF is not parsed or analyzed again.
+Records already scored against the same JD (by hash) are skipped.
+"""
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable
+
+from . import metrics
+from .ai_client import AIClient
+from .cv_scorer import score_cv, score_cv_consensus
+from .pipeline import jd_hash
+from .question_bank import structure_questions
+from .question_generator import generate_interview_questions
+
+
+logger = logging.getLogger(__name__)
+
+
+def rescore_position(
+    ai_client: AIClient,
+    db,
+    position: str,
+    jd_full: str,
+    model: str = "gemini",
+    regenerate_questions: bool = False,
+    workers: int = 4,
+    on_progress: Callable[[int, int], None] = None,
+    consensus: bool = False
+) -> dict:
+    """Re-score every record of a position whose JD hash differs from jd_full.
+
+    Args:
+        ai_client: Configured AI client
+        db: Database with get_rescore_candidates / update_record_score
+        position: Position whose records are re-scored
+        jd_full: New job description text
+        model: "claude", "gemini" or "fake"
+        regenerate_questions: Also regenerate interview questions
+        workers: Maximum parallel scoring calls
+        on_progress: Called with (done, total) after each record
+        consensus: Score from several samples (see score_cv_consensus)
+
+    Returns:
+        Summary dict with total, updated, failed and errors (first few)
+    """
+    new_hash = jd_hash(jd_full)
+    candidates = db.get_rescore_candidates(position, new_hash)
+    summary = {"total": len(candidates), "updated": 0, "failed": 0, "errors": []}
+    if not candidates:
+        return summary
+
+    def rescore_one(candidate: dict):
+        with metrics.run(f"rescore-{candidate['id']}"):
+            with metrics.stage("scoring"):
+                scorer = score_cv_consensus if consensus else score_cv
+                score_result = scorer(ai_client, candidate["cv_summary"], jd_full, model)
+            if score_result.get("parse_status") == "failed":
+                # Keep the previous score rather than overwrite it with nothing
+                raise ValueError(score_result.get("error") or "Score could not be parsed")
+            questions = questions_data = None
+            if regenerate_questions:
+                with metrics.stage("questions"):
+                    questions = generate_interview_questions(
+                        ai_client, candidate["cv_summary"], jd_full, model
+                    )
+                questions_data = json.dumps(structure_questions(questions), ensure_ascii=False)
+        db.update_record_score(
+            candidate["id"],
+            score_result.get("overall_score"),
+            json.dumps(score_result, indent=2, ensure_ascii=False),
+            jd_full,
+            new_hash,
+            model=model,
+            questions=questions,
+            questions_data=questions_data,
+            score_variance=score_result.get("consensus", {}).get("variance")
+        )
+
+    done = 0
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {
+            pool.submit(metrics.bind(rescore_one), candidate): candidate
+            for candidate in candidates
+        }
+        for future in as_completed(futures):
+            candidate = futures[future]
+            try:
+                future.result()
+                summary["updated"] += 1
+            except Exception as e:
+                logger.warning("Re-scoring record %s failed: %s", candidate["id"], e)
+                summary["failed"] += 1
+                if len(summary["errors"]) < 5:
+                    summary["errors"].append(f"{candidate['candidate_name']}: {e}")
+            done += 1
+            if on_progress:
+                on_progress(done, len(candidates))
+    return summary
@@ -0,0 +1,71 @@
+"""Minimal JSON schema compiler for validating structured AI output.
+
+Supports the subset of JSON schema used by our prompts (object, array,
+string, integer, number, boolean, enum, minimum/maximum, required).
+Schemas are compiled once into nested closures so validation is a plain
+function call per response.
+"""
+from typing import Any, Callable
+
+# A compiled validator takes (value, path) and returns a list of error strings
+Validator = Callable[[Any, str], list[str]]
+
+_TYPE_CHECKS = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+}
+
+
+def compile_schema(schema: dict) -> Validator:
+    """Compile a JSON schema into a validator function.
+
+    Args:
+        schema: JSON schema dict
+
+    Returns:
+        Function (value, path) -> list of validation errors (empty if valid)
+    """
+    schema_type = schema.get("type")
+    type_check = _TYPE_CHECKS.get(schema_type)
+    enum = schema.get("enum")
+    minimum = schema.get("minimum")
+    maximum = schema.get("maximum")
+
+    properties = {
+        name: compile_schema(sub)
+        for name, sub in schema.get("properties", {}).items()
+    }
+    required = schema.get("required", [])
+    items = compile_schema(schema["items"]) if "items" in schema else None
+
+    def validate(value: Any, path: str = "$") -> list[str]:
+        if type_check and not type_check(value):
+            return [f"{path}: expected {schema_type}, got {type(value).__name__}"]
+
+        errors = []
+        if enum is not None and value not in enum:
+            errors.append(f"{path}: {value!r} not one of {enum}")
+        if minimum is not None and value < minimum:
+            errors.append(f"{path}: {value} is below minimum {minimum}")
+        if maximum is not None and value > maximum:
+            errors.append(f"{path}: {value} is above maximum {maximum}")
+
+        if isinstance(value, dict):
+            for name in required:
+                if name not in value:
+                    errors.append(f"{path}.{name}: missing required field")
+            for name, validator in properties.items():
+                if name in value:
+                    errors.extend(validator(value[name], f"{path}.{name}"))
+
+        if items and isinstance(value, list):
+            for i, item in enumerate(value):
+                errors.extend(items(item, f"{path}[{i}]"))
+
+        return errors
+
+    return validate
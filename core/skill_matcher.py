@@ -0,0 +1,193 @@
+"""Local skill matching for instant pre-screening.
+
+JD skills and their aliases (e.g. "k8s" -> Kubernetes) are compiled into
+an Aho-Corasick automaton that finds every mention in a CV in one pass over
+the text, with no LLM call. Short forms that are also ordinary words
+("Go", "REST", "AI") must be written exactly as listed in
+CASE_SENSITIVE_FORMS, so everyday prose does not inflate coverage.
+"""
+import functools
+from collections import deque
+
+
+# Canonical skill -> aliases. Matching is case-insensitive except for
+# CASE_SENSITIVE_FORMS; the canonical name always matches itself.
+SKILL_ALIASES = {
+    "Kubernetes": ["k8s", "kube"],
+    "PostgreSQL": ["postgres", "psql", "pgsql"],
+    "JavaScript": ["JS", "ecmascript", "es6"],
+    "TypeScript": ["TS"],
+    "Node.js": ["nodejs", "node js"],
+    "React": ["react.js", "reactjs"],
+    "Vue.js": ["vue", "vuejs"],
+    "Angular": ["angularjs", "angular.js"],
+    "Next.js": ["nextjs"],
+    "Python": ["py", "python3"],
+    "Go": ["golang"],
+    "C#": ["csharp", "c sharp"],
+    "C++": ["cpp"],
+    ".NET": ["dotnet", "asp.net", ".net core"],
+    "Amazon Web Services": ["aws"],
+    "Google Cloud": ["gcp", "google cloud platform"],
+    "Microsoft Azure": ["azure"],
+    "Machine Learning": ["ML"],
+    "Artificial Intelligence": ["AI"],
+    "Natural Language Processing": ["nlp"],
+    "CI/CD": ["ci cd", "continuous integration", "continuous delivery"],
+    "MongoDB": ["mongo"],
+    "Elasticsearch": ["elastic search", "elk"],
+    "RabbitMQ": ["rabbit mq"],
+    "Apache Kafka": ["kafka"],
+    "Terraform": [],
+    "GraphQL": ["gql"],
+    "REST": ["restful", "rest api", "rest apis"],
+    "Microservices": ["microservice", "micro-services"],
+    "Spring Boot": ["springboot", "spring framework", "spring mvc"],
+    "Django": ["django rest framework", "drf"],
+    "Ruby on Rails": ["Rails", "ror"],
+    "SQL Server": ["mssql", "ms sql"],
+    "Scikit-learn": ["sklearn", "scikit learn"],
+    "TensorFlow": [],
+    "PyTorch": ["Torch"],
+}
+
+# Forms that are also ordinary English words ("go hiking", "the rest",
+# "react quickly") only match when written exactly like this
+CASE_SENSITIVE_FORMS = {"Go", "REST", "React", "JS", "TS", "ML", "AI", "Rails", "Torch"}
+_EXACT_FORMS = {form.lower(): form for form in CASE_SENSITIVE_FORMS}
+
+
+def _canonical_index(aliases: dict) -> dict:
+    """Lowercase name/alias -> canonical skill"""
+    index = {}
+    for canonical, names in aliases.items():
+        for name in (canonical, *names):
+            index.setdefault(name.lower(), canonical)
+    return index
+
+
+_DEFAULT_INDEX = _canonical_index(SKILL_ALIASES)
+
+
+def canonical_skill(name: str) -> str:
+    """Map a skill name or alias to its canonical form (unknown names pass through)"""
+    name = name.strip()
+    return _DEFAULT_INDEX.get(name.lower(), name)
+
+
+def parse_skill_list(text: str) -> list[str]:
+    """Parse a comma/semicolon/newline separated skill list into canonical names"""
+    if not text:
+        return []
+    for sep in (";", "\n"):
+        text = text.replace(sep, ",")
+    return list(dict.fromkeys(canonical_skill(s) for s in text.split(",") if s.strip()))
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch in "_+#"
+
+
+class SkillMatcher:
+    """Aho-Corasick automaton over skill names and their aliases.
+
+    Args:
+        skills: Skills to look for (canonical names or aliases)
+        aliases: Alias taxonomy (defaults to SKILL_ALIASES)
+    """
+
+    def __init__(self, skills: list[str], aliases: dict = None):
+        index = _DEFAULT_INDEX if aliases is None else _canonical_index(aliases)
+        self.skills = list(dict.fromkeys(index.get(s.strip().lower(), s.strip()) for s in skills))
+
+        # Every surface form that maps to one of our skills
+        patterns = {skill.lower(): skill for skill in self.skills}
+        for form, canonical in index.items():
+            if canonical in patterns.values():
+                patterns.setdefault(form, canonical)
+
+        # Trie: goto transitions, failure links, outputs
+        # (pattern length, skill, exact spelling for case-sensitive forms or None)
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for form, canonical in patterns.items():
+            node = 0
+            for ch in form:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append((len(form), canonical, _EXACT_FORMS.get(form)))
+
+        # Breadth-first failure links (depth-1 nodes fail to the root)
+        pending = deque(self._goto[0].values())
+        while pending:
+            node = pending.popleft()
+            for ch, child in self._goto[node].items():
+                pending.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(ch, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find(self, text: str) -> set[str]:
+        """Canonical skills mentioned in text as whole words"""
+        found = set()
+        original = text
+        text = text.lower()
+        # Exact spellings are checked against the original text; the rare
+        # characters whose lowercase form is longer disable those checks
+        aligned = len(text) == len(original)
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for end, ch in enumerate(text, start=1):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for length, canonical, exact in out[node]:
+                if canonical in found:
+                    continue
+                start = end - length
+                if exact and not (aligned and original[start:end] == exact):
+                    continue
+                # Whole-word match: "go" must not match inside "google"
+                if (start == 0 or not _is_word_char(text[start - 1])) and \
+                        (end == len(text) or not _is_word_char(text[end])):
+                    found.add(canonical)
+        return found
+
+
+@functools.lru_cache(maxsize=32)
+def _compiled(skills: tuple) -> SkillMatcher:
+    return SkillMatcher(list(skills))
+
+
+def match_skills(cv_text: str, required: list[str], nice_to_have: list[str] = ()) -> dict:
+    """Match a CV's text against required and nice-to-have skills.
+
+    Args:
+        cv_text: Extracted CV text
+        required: Required skills
+        nice_to_have: Nice-to-have skills
+
+    Returns:
+        Dict with matched/missing lists for both skill groups and
+        required_coverage (0.0-1.0; 1.0 when nothing is required)
+    """
+    required = [canonical_skill(s) for s in required]
+    nice_to_have = [canonical_skill(s) for s in nice_to_have]
+    found = _compiled(tuple(dict.fromkeys(required + nice_to_have))).find(cv_text)
+    matched_required = [s for s in required if s in found]
+    return {
+        "matched_required": matched_required,
+        "missing_required": [s for s in required if s not in found],
+        "matched_nice_to_have": [s for s in nice_to_have if s in found],
+        "missing_nice_to_have": [s for s in nice_to_have if s not in found],
+        "required_coverage": round(len(matched_required) / len(required), 3) if required else 1.0,
+    }
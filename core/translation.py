@@ -0,0 +1,87 @@
+"""Translate generated report content, with a persistent cache.
+
+Analyses, questions and scores are generated and stored in English. To show
+them in another language, every text that is not already cached is sent in
+one batched call; results are cached by content hash and language, so a
+report costs at most one call per language and none on repeat.
+"""
+import hashlib
+import json
+import logging
+
+from . import metrics
+from .ai_client import AIClient
+from .prompt_templates import TRANSLATE_PROMPT, TRANSLATE_SCHEMA
+from .schema_validator import compile_schema
+
+
+logger = logging.getLogger(__name__)
+
+SOURCE_LANGUAGE = "en"
+LANGUAGE_NAMES = {"en": "English", "vi": "Vietnamese"}
+
+_validate_translations = compile_schema(TRANSLATE_SCHEMA)
+
+
+def content_hash(text: str) -> str:
+    """Cache key part for a text (SHA-256 of its UTF-8 bytes)"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def translate_texts(
+    ai_client: AIClient,
+    texts: list[str],
+    language: str,
+    model: str,
+    cache
+) -> list[str]:
+    """Translate texts into a language, reusing cached translations.
+
+    Texts that cannot be translated (call failed or unusable response) are
+    returned unchanged and not cached.
+
+    Args:
+        ai_client: Configured AI client
+        texts: Source-language texts
+        language: Target language code (see LANGUAGE_NAMES)
+        model: "claude", "gemini" or "fake"
+        cache: Database with get_translations / save_translations
+
+    Returns:
+        Translated texts, in order
+    """
+    if language == SOURCE_LANGUAGE or not texts:
+        return list(texts)
+
+    hashes = [content_hash(t) for t in texts]
+    cached = cache.get_translations(set(hashes), language)
+    # Blank texts need no translation; duplicates are sent once
+    missing = {h: t for h, t in zip(hashes, texts) if h not in cached and t.strip()}
+    metrics.record_cache("translation_cache", not missing)
+
+    if missing:
+        prompt = TRANSLATE_PROMPT.format(
+            language_name=LANGUAGE_NAMES.get(language, language),
+            texts_json=json.dumps(list(missing.values()), ensure_ascii=False, indent=1)
+        )
+        try:
+            with metrics.stage("translation"):
+                data = json.loads(ai_client.chat_json(
+                    prompt, TRANSLATE_SCHEMA, model_provider=model,
+                    schema_name="submit_translations"
+                ))
+            errors = _validate_translations(data)
+            if errors:
+                raise ValueError("; ".join(errors))
+            if len(data["translations"]) != len(missing):
+                raise ValueError(
+                    f"expected {len(missing)} translations, got {len(data['translations'])}"
+                )
+        except Exception as e:
+            logger.warning("Translation to %s failed, showing source text: %s", language, e)
+        else:
+            translated = dict(zip(missing, data["translations"]))
+            cache.save_translations(language, translated)
+            cached.update(translated)
+
+    return [cached.get(h, t) for h, t in zip(hashes, texts)]
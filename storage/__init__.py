@@ -1,3 +1,3 @@
 # Storage module exports
 from .database import Database
-from .models import CVRecord, Settings
+from .models import CVRecord, Settings, Job, ScoreChange
@@ -1,10 +1,127 @@
 """SQLite database operations"""
+import atexit
+import hashlib
+import logging
+import queue
 import sqlite3
 import json
+import threading
+import zlib
+from dataclasses import fields
+from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
-from .models import CVRecord, Settings
-from core.encryption import encrypt, decrypt, is_encrypted
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TextIO
+from .models import CVRecord, Settings, Job, ScoreChange
+from core.encryption import derive_key, encrypt, decrypt, is_encrypted
+from core.metrics import latency_bucket, bucket_latency
+from core.near_duplicate import band_keys, minhash, signature_from_bytes, similarity
+
+
+logger = logging.getLogger(__name__)
+
+# Heavy record columns stored zlib-compressed (as one JSON object) in archives
+_ARCHIVED_FIELDS = ("cv_text", "cv_summary", "jd_text", "questions", "score_breakdown",
+                    "questions_data")
+
+
+def _pack_archived(*values) -> bytes:
+    return zlib.compress(json.dumps(dict(zip(_ARCHIVED_FIELDS, values))).encode("utf-8"))
+
+
+def _unpack_archived(payload: bytes) -> str:
+    return zlib.decompress(payload).decode("utf-8") if payload else "{}"
+
+
+# JSONL history export: format marker, version and record columns
+EXPORT_FORMAT = "interviewer-helper-history"
+EXPORT_VERSION = 1
+_EXPORT_FIELDS = (
+    "content_hash", "candidate_name", "position", "created_at", "score", "score_variance",
+    "file_hash", "jd_hash", "cv_text", "cv_summary", "jd_text", "questions", "score_breakdown",
+    "questions_data"
+)
+
+
+def record_content_hash(candidate_name, position, created_at, cv_text, jd_text) -> str:
+    """Identity of a record across databases (SHA-256 of who, for what and when).
+
+    Scores and generated text are left out, so a record re-scored after an
+    export is still recognized as the same record on import.
+    """
+    identity = json.dumps(
+        [candidate_name or "", position or "", str(created_at or ""), cv_text or "",
+         jd_text or ""],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+
+class BatchWriter:
+    """Write-behind writer that batches inserts.
+
+    A background thread drains a queue and passes up to `batch_size` items
+    at a time to `write`, which stores them in one transaction, so bulk
+    screening pays one commit (fsync) per batch instead of per candidate or
+    metric event. Pending items are flushed on `close()` and at interpreter
+    exit; items still queued when the process is killed are lost, so
+    callers that need durability or the row ID should write synchronously
+    (e.g. `Database.save_cv_record`).
+    """
+
+    def __init__(self, write: Callable[[list], object], batch_size: int = 50,
+                 flush_interval: float = 0.5, name: str = "batch-writer"):
+        self.write = write
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.name = name
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def put(self, item):
+        """Queue an item for insertion"""
+        if self._closed:
+            raise RuntimeError(f"{self.name} is closed")
+        self._queue.put(item)
+
+    def flush(self):
+        """Block until every queued item is written"""
+        self._queue.join()
+
+    def close(self):
+        """Flush pending items and stop the writer thread"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            # Wait briefly for more items so they share one transaction
+            try:
+                while len(batch) < self.batch_size and batch[-1] is not None:
+                    batch.append(self._queue.get(timeout=self.flush_interval))
+            except queue.Empty:
+                pass
+
+            stop = batch[-1] is None
+            items = [i for i in batch if i is not None]
+            try:
+                if items:
+                    self.write(items)
+            except Exception:
+                logger.exception("Write-behind %s batch of %d item(s) failed",
+                                 self.name, len(items))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                return
 
 
 class Database:
@@ -15,6 +132,8 @@ class Database:
             db_path = Path(__file__).parent.parent / "data" / "history.db"
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._writer: Optional[BatchWriter] = None
+        self._metric_writer: Optional[BatchWriter] = None
         self._init_db()
 
     def _get_conn(self):
@@ -23,6 +142,9 @@ class Database:
     def _init_db(self):
         """Initialize database tables"""
         with self._get_conn() as conn:
+            # Lets archive_records return freed pages (only applies to new databases;
+            # existing ones are converted by the first optimize())
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS cv_records (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -37,6 +159,130 @@ class Database:
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """)
+            self._ensure_column(conn, "cv_records", "file_hash", "TEXT")
+            self._ensure_column(conn, "cv_records", "jd_hash", "TEXT")
+            self._ensure_column(conn, "cv_records", "questions_data", "TEXT")
+            self._ensure_column(conn, "cv_records", "score_variance", "REAL")
+            # Filled on export/import (see record_content_hash)
+            self._ensure_column(conn, "cv_records", "content_hash", "TEXT")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_cv_records_content_hash "
+                "ON cv_records(content_hash)"
+            )
+
+            # Per-position ranking kept in step with cv_records on every write
+            backfill = not conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'leaderboard'"
+            ).fetchone()
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS leaderboard (
+                    record_id INTEGER PRIMARY KEY,
+                    position TEXT,
+                    score INTEGER,
+                    candidate_name TEXT
+                )
+            """)
+            for statement in self._DEFERRABLE_INDEXES.values():
+                conn.execute(statement)
+            if backfill:
+                conn.execute("""
+                    INSERT INTO leaderboard (record_id, position, score, candidate_name)
+                    SELECT id, position, score, candidate_name FROM cv_records
+                """)
+
+            # MinHash signatures and LSH band buckets for near-duplicate lookup.
+            # An empty signature marks a record whose text was too short to index.
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS record_minhash (
+                    record_id INTEGER PRIMARY KEY,
+                    signature BLOB
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS lsh_buckets (
+                    band INTEGER,
+                    bucket INTEGER,
+                    record_id INTEGER
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_lsh_buckets ON lsh_buckets(band, bucket)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_lsh_buckets_record ON lsh_buckets(record_id)"
+            )
+
+            # Reusable interview questions, indexed by category and skill
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS question_bank (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    category TEXT,
+                    question TEXT UNIQUE,
+                    purpose TEXT,
+                    skills TEXT DEFAULT '[]',
+                    use_count INTEGER DEFAULT 0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_question_bank_category
+                ON question_bank(category, use_count DESC)
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS question_bank_skills (
+                    skill TEXT,
+                    question_id INTEGER,
+                    PRIMARY KEY (skill, question_id)
+                ) WITHOUT ROWID
+            """)
+            # Technical Deep-Dive questions name one candidate's projects and are
+            # no longer banked; drop any stored before that
+            conn.execute("""
+                DELETE FROM question_bank_skills WHERE question_id IN (
+                    SELECT id FROM question_bank WHERE category = 'Technical Deep-Dive'
+                )
+            """)
+            conn.execute("DELETE FROM question_bank WHERE category = 'Technical Deep-Dive'")
+
+            # Translated report content, keyed by source text hash + language
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS translation_cache (
+                    content_hash TEXT,
+                    language TEXT,
+                    translated TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (content_hash, language)
+                ) WITHOUT ROWID
+            """)
+
+            # Cached candidate comparisons, keyed by record IDs + JD hash
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS compare_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    record_ids TEXT,
+                    jd_hash TEXT,
+                    result TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+            # Audit trail of scores replaced by re-scoring
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS score_history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    record_id INTEGER,
+                    old_score INTEGER,
+                    new_score INTEGER,
+                    old_jd_hash TEXT,
+                    new_jd_hash TEXT,
+                    old_score_breakdown TEXT,
+                    model TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_score_history_record ON score_history(record_id)"
+            )
 
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS settings (
@@ -44,48 +290,280 @@ class Database:
                     value TEXT
                 )
             """)
+
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    status TEXT DEFAULT 'queued',
+                    stage TEXT DEFAULT '',
+                    pdf_path TEXT,
+                    params TEXT,
+                    state TEXT DEFAULT '{}',
+                    record_id INTEGER,
+                    error TEXT DEFAULT '',
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, id)")
+
+            # Metrics: raw events plus rollups maintained on insert
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS metric_events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    run_id TEXT,
+                    kind TEXT,
+                    name TEXT,
+                    provider TEXT,
+                    model TEXT,
+                    input_tokens INTEGER DEFAULT 0,
+                    output_tokens INTEGER DEFAULT 0,
+                    latency_ms REAL,
+                    cache_hit INTEGER DEFAULT 0,
+                    error TEXT,
+                    cost REAL DEFAULT 0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS metric_rollups (
+                    kind TEXT,
+                    name TEXT,
+                    count INTEGER DEFAULT 0,
+                    errors INTEGER DEFAULT 0,
+                    cache_hits INTEGER DEFAULT 0,
+                    input_tokens INTEGER DEFAULT 0,
+                    output_tokens INTEGER DEFAULT 0,
+                    cost REAL DEFAULT 0,
+                    PRIMARY KEY (kind, name)
+                )
+            """)
+            # Histograms were once keyed by name only; rebuild them keyed by kind too
+            old_buckets = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'metric_latency_buckets'"
+            ).fetchone() and "kind" not in {
+                row[1] for row in conn.execute("PRAGMA table_info(metric_latency_buckets)")
+            }
+            if old_buckets:
+                conn.execute("ALTER TABLE metric_latency_buckets RENAME TO metric_latency_buckets_old")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS metric_latency_buckets (
+                    kind TEXT,
+                    name TEXT,
+                    bucket INTEGER,
+                    count INTEGER DEFAULT 0,
+                    PRIMARY KEY (kind, name, bucket)
+                )
+            """)
+            if old_buckets:
+                # Only stages and calls carry latencies
+                conn.execute("""
+                    INSERT INTO metric_latency_buckets (kind, name, bucket, count)
+                    SELECT COALESCE((SELECT MIN(r.kind) FROM metric_rollups r
+                                     WHERE r.name = b.name AND r.kind IN ('stage', 'call')),
+                                    'stage'),
+                           b.name, b.bucket, b.count
+                    FROM metric_latency_buckets_old b
+                """)
+                conn.execute("DROP TABLE metric_latency_buckets_old")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS metric_runs (
+                    run_id TEXT PRIMARY KEY,
+                    cost REAL DEFAULT 0,
+                    input_tokens INTEGER DEFAULT 0,
+                    output_tokens INTEGER DEFAULT 0,
+                    calls INTEGER DEFAULT 0
+                )
+            """)
             conn.commit()
 
+    # Secondary indexes dropped during large imports and rebuilt afterwards
+    _DEFERRABLE_INDEXES = {
+        "idx_cv_records_file_hash":
+            "CREATE INDEX IF NOT EXISTS idx_cv_records_file_hash ON cv_records(file_hash)",
+        "idx_cv_records_position":
+            "CREATE INDEX IF NOT EXISTS idx_cv_records_position ON cv_records(position)",
+        "idx_leaderboard_rank":
+            "CREATE INDEX IF NOT EXISTS idx_leaderboard_rank "
+            "ON leaderboard(position, score DESC, record_id)",
+    }
+
+    @staticmethod
+    def _ensure_column(conn, table: str, column: str, decl: str):
+        """Add a column to an existing table if it is missing"""
+        columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if column not in columns:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
     # CV Records
+    _INSERT_RECORD = """
+        INSERT INTO cv_records
+        (candidate_name, position, cv_text, cv_summary, jd_text, questions, score,
+         score_breakdown, file_hash, jd_hash, questions_data, score_variance)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    @staticmethod
+    def _record_params(record: CVRecord) -> tuple:
+        return (
+            record.candidate_name,
+            record.position,
+            record.cv_text,
+            record.cv_summary,
+            record.jd_text,
+            record.questions,
+            record.score,
+            record.score_breakdown,
+            record.file_hash or None,
+            record.jd_hash or None,
+            record.questions_data or None,
+            record.score_variance
+        )
+
+    _UPSERT_LEADERBOARD = """
+        INSERT OR REPLACE INTO leaderboard (record_id, position, score, candidate_name)
+        VALUES (?, ?, ?, ?)
+    """
+
+    @staticmethod
+    def _index_minhash(conn, record_id: int, signature):
+        """Store a record's MinHash signature and its LSH band buckets"""
+        conn.execute(
+            "INSERT OR REPLACE INTO record_minhash (record_id, signature) VALUES (?, ?)",
+            (record_id, signature.tobytes())
+        )
+        conn.execute("DELETE FROM lsh_buckets WHERE record_id = ?", (record_id,))
+        if signature:
+            conn.executemany(
+                "INSERT INTO lsh_buckets (band, bucket, record_id) VALUES (?, ?, ?)",
+                [(band, key, record_id) for band, key in enumerate(band_keys(signature))]
+            )
+
     def save_cv_record(self, record: CVRecord) -> int:
-        """Save CV record and return ID"""
+        """Save CV record and return ID.
+
+        The near-duplicate signature is not computed here; see
+        index_signature and index_missing_signatures.
+        """
         with self._get_conn() as conn:
-            cursor = conn.execute("""
-                INSERT INTO cv_records
-                (candidate_name, position, cv_text, cv_summary, jd_text, questions, score, score_breakdown)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                record.candidate_name,
-                record.position,
-                record.cv_text,
-                record.cv_summary,
-                record.jd_text,
-                record.questions,
-                record.score,
-                record.score_breakdown
+            cursor = conn.execute(self._INSERT_RECORD, self._record_params(record))
+            conn.execute(self._UPSERT_LEADERBOARD, (
+                cursor.lastrowid, record.position, record.score, record.candidate_name
             ))
             conn.commit()
             return cursor.lastrowid
 
-    def get_all_records(self) -> List[CVRecord]:
-        """Get all CV records"""
+    def save_cv_records(self, records: List[CVRecord]) -> List[int]:
+        """Save several CV records with one executemany in one transaction.
+
+        Returns:
+            IDs of the inserted records, in order
+        """
+        if not records:
+            return []
+        with self._get_conn() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(self._INSERT_RECORD, [self._record_params(r) for r in records])
+            # The write lock is held, so the new IDs are contiguous
+            last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+            ids = list(range(last_id - len(records) + 1, last_id + 1))
+            conn.executemany(self._UPSERT_LEADERBOARD, [
+                (record_id, r.position, r.score, r.candidate_name)
+                for record_id, r in zip(ids, records)
+            ])
+            conn.commit()
+        return ids
+
+    def enable_write_behind(self, batch_size: int = 50, flush_interval: float = 0.5):
+        """Route `queue_cv_record` and `record_metric` through batching background writers"""
+        if self._writer is None:
+            self._writer = BatchWriter(self.save_cv_records, batch_size, flush_interval,
+                                       name="record-writer")
+        if self._metric_writer is None:
+            # Events are small and frequent: a run's worth share one commit
+            self._metric_writer = BatchWriter(self.record_metrics, 500, flush_interval,
+                                              name="metric-writer")
+
+    def queue_cv_record(self, record: CVRecord) -> Optional[int]:
+        """Save a record via the write-behind writer if enabled.
+
+        Returns:
+            None when queued, or the new ID when saved synchronously
+        """
+        if self._writer is None:
+            return self.save_cv_record(record)
+        self._writer.put(record)
+        return None
+
+    def flush(self):
+        """Wait for queued write-behind records and metric events to be written"""
+        for writer in (self._writer, self._metric_writer):
+            if writer is not None:
+                writer.flush()
+
+    def close(self):
+        """Flush and stop the write-behind writers"""
+        for writer in (self._writer, self._metric_writer):
+            if writer is not None:
+                writer.close()
+        self._writer = self._metric_writer = None
+
+    def get_processed_hashes(self) -> set:
+        """Get file hashes of all PDFs that already have a record"""
         with self._get_conn() as conn:
-            conn.row_factory = sqlite3.Row
             rows = conn.execute(
-                "SELECT * FROM cv_records ORDER BY created_at DESC"
+                "SELECT DISTINCT file_hash FROM cv_records WHERE file_hash IS NOT NULL"
             ).fetchall()
+        return {row[0] for row in rows}
+
+    @staticmethod
+    def _row_to_record(row) -> CVRecord:
+        return CVRecord(
+            id=row["id"],
+            candidate_name=row["candidate_name"],
+            position=row["position"],
+            cv_text=row["cv_text"],
+            cv_summary=row["cv_summary"],
+            jd_text=row["jd_text"],
+            questions=row["questions"],
+            score=row["score"],
+            score_breakdown=row["score_breakdown"],
+            created_at=row["created_at"],
+            file_hash=row["file_hash"] or "",
+            jd_hash=row["jd_hash"] or "",
+            questions_data=row["questions_data"] or "",
+            score_variance=row["score_variance"]
+        )
+
+    def get_all_records(self, lazy: bool = True) -> List[CVRecord]:
+        """Get all CV records.
+
+        Args:
+            lazy: Only load metadata columns; heavy text fields are fetched
+                per record on first access. Pass False to load everything.
+        """
+        with self._get_conn() as conn:
+            conn.row_factory = sqlite3.Row
+            if not lazy:
+                rows = conn.execute(
+                    "SELECT * FROM cv_records ORDER BY created_at DESC"
+                ).fetchall()
+                return [self._row_to_record(row) for row in rows]
 
-            return [CVRecord(
+            rows = conn.execute(
+                f"SELECT {', '.join(CVRecord.METADATA_FIELDS)} FROM cv_records "
+                "ORDER BY created_at DESC"
+            ).fetchall()
+            return [CVRecord.lazy(
+                self,
                 id=row["id"],
                 candidate_name=row["candidate_name"],
                 position=row["position"],
-                cv_text=row["cv_text"],
-                cv_summary=row["cv_summary"],
-                jd_text=row["jd_text"],
-                questions=row["questions"],
                 score=row["score"],
-                score_breakdown=row["score_breakdown"],
-                created_at=row["created_at"]
+                created_at=row["created_at"],
+                file_hash=row["file_hash"] or "",
+                jd_hash=row["jd_hash"] or "",
+                score_variance=row["score_variance"]
             ) for row in rows]
 
     def get_record(self, record_id: int) -> Optional[CVRecord]:
@@ -95,39 +573,1084 @@ class Database:
             row = conn.execute(
                 "SELECT * FROM cv_records WHERE id = ?", (record_id,)
             ).fetchone()
+            return self._row_to_record(row) if row else None
 
-            if row:
-                return CVRecord(
-                    id=row["id"],
-                    candidate_name=row["candidate_name"],
-                    position=row["position"],
-                    cv_text=row["cv_text"],
-                    cv_summary=row["cv_summary"],
-                    jd_text=row["jd_text"],
-                    questions=row["questions"],
-                    score=row["score"],
-                    score_breakdown=row["score_breakdown"],
-                    created_at=row["created_at"]
-                )
-            return None
+    def get_record_ids(self, position: str = None, min_score: int = None) -> List[int]:
+        """Get IDs of records matching optional filters, newest first"""
+        query = "SELECT id FROM cv_records WHERE 1 = 1"
+        params = []
+        if position:
+            query += " AND position = ?"
+            params.append(position)
+        if min_score is not None:
+            query += " AND score >= ?"
+            params.append(min_score)
+        with self._get_conn() as conn:
+            rows = conn.execute(query + " ORDER BY created_at DESC, id DESC", params).fetchall()
+        return [row[0] for row in rows]
+
+    def iter_records(self, record_ids: List[int], batch_size: int = 50) -> Iterator[CVRecord]:
+        """Yield fully loaded records in the given order, fetched in batches"""
+        for start in range(0, len(record_ids), batch_size):
+            batch = record_ids[start:start + batch_size]
+            with self._get_conn() as conn:
+                conn.row_factory = sqlite3.Row
+                rows = conn.execute(
+                    f"SELECT * FROM cv_records WHERE id IN ({', '.join('?' * len(batch))})",
+                    batch
+                ).fetchall()
+            by_id = {row["id"]: row for row in rows}
+            for record_id in batch:
+                if record_id in by_id:
+                    yield self._row_to_record(by_id[record_id])
+
+    def load_record_field(self, record_id: int, field: str) -> str:
+        """Fetch one heavy text column of a record (used by lazy CVRecords)"""
+        if field not in CVRecord.HEAVY_FIELDS:
+            raise ValueError(f"Not a lazily loaded field: {field}")
+        with self._get_conn() as conn:
+            row = conn.execute(
+                f"SELECT {field} FROM cv_records WHERE id = ?", (record_id,)
+            ).fetchone()
+        return row[0] if row else ""
 
     def delete_record(self, record_id: int):
         """Delete CV record"""
         with self._get_conn() as conn:
             conn.execute("DELETE FROM cv_records WHERE id = ?", (record_id,))
+            conn.execute("DELETE FROM leaderboard WHERE record_id = ?", (record_id,))
+            conn.execute("DELETE FROM record_minhash WHERE record_id = ?", (record_id,))
+            conn.execute("DELETE FROM lsh_buckets WHERE record_id = ?", (record_id,))
+            conn.commit()
+
+    def get_positions(self) -> List[str]:
+        """Get distinct positions that have records"""
+        with self._get_conn() as conn:
+            rows = conn.execute(
+                "SELECT DISTINCT position FROM cv_records WHERE position IS NOT NULL ORDER BY position"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def get_rescore_candidates(self, position: str, jd_hash: str) -> List[dict]:
+        """Get records of a position that were scored against a different JD.
+
+        Candidates auto-rejected by the skill pre-screen are left out: their
+        stored summary is a placeholder, not an analysis of the CV.
+
+        Returns:
+            Dicts with id, candidate_name and cv_summary
+        """
+        with self._get_conn() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(
+                """SELECT id, candidate_name, cv_summary FROM cv_records
+                   WHERE position = ? AND (jd_hash IS NULL OR jd_hash != ?)
+                   AND COALESCE(
+                       CASE WHEN json_valid(score_breakdown)
+                            THEN json_extract(score_breakdown, '$.parse_status') END, ''
+                   ) != 'auto_rejected'
+                   ORDER BY id""",
+                (position, jd_hash)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def update_record_score(
+        self,
+        record_id: int,
+        score: Optional[int],
+        score_breakdown: str,
+        jd_text: str,
+        jd_hash: str,
+        model: str = "",
+        questions: str = None,
+        questions_data: str = None,
+        score_variance: float = None
+    ):
+        """Replace a record's score (and optionally questions) in place.
+
+        The previous score is kept in score_history.
+        """
+        with self._get_conn() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT score, jd_hash, score_breakdown FROM cv_records WHERE id = ?",
+                (record_id,)
+            ).fetchone()
+            if row is None:
+                conn.rollback()
+                return
+            conn.execute(
+                """INSERT INTO score_history
+                   (record_id, old_score, new_score, old_jd_hash, new_jd_hash,
+                    old_score_breakdown, model)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (record_id, row[0], score, row[1], jd_hash, row[2], model)
+            )
+            conn.execute(
+                """UPDATE cv_records
+                   SET score = ?, score_breakdown = ?, jd_text = ?, jd_hash = ?,
+                       questions = COALESCE(?, questions),
+                       questions_data = COALESCE(?, questions_data),
+                       score_variance = ?
+                   WHERE id = ?""",
+                (score, score_breakdown, jd_text, jd_hash, questions, questions_data,
+                 score_variance, record_id)
+            )
+            conn.execute(
+                "UPDATE leaderboard SET score = ? WHERE record_id = ?", (score, record_id)
+            )
             conn.commit()
 
+    def get_score_history(self, record_id: int) -> List[ScoreChange]:
+        """Get the re-scoring audit trail of a record, newest first"""
+        with self._get_conn() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(
+                "SELECT * FROM score_history WHERE record_id = ? ORDER BY id DESC",
+                (record_id,)
+            ).fetchall()
+        return [ScoreChange(
+            id=row["id"],
+            record_id=row["record_id"],
+            old_score=row["old_score"],
+            new_score=row["new_score"],
+            old_jd_hash=row["old_jd_hash"] or "",
+            new_jd_hash=row["new_jd_hash"] or "",
+            old_score_breakdown=row["old_score_breakdown"] or "",
+            model=row["model"] or "",
+            created_at=row["created_at"]
+        ) for row in rows]
+
+    # Near-duplicate detection
+    def find_near_duplicates(self, signature, threshold: float = 0.8) -> List[tuple]:
+        """Find saved records whose CV text is nearly identical.
+
+        Only records sharing an LSH bucket with the signature are compared.
+
+        Returns:
+            (record_id, estimated similarity) pairs at or above threshold,
+            most similar first
+        """
+        if not signature:
+            return []
+        keys = list(enumerate(band_keys(signature)))
+        with self._get_conn() as conn:
+            rows = conn.execute(
+                f"""SELECT m.record_id, m.signature FROM record_minhash m
+                    WHERE m.record_id IN (
+                        SELECT record_id FROM lsh_buckets
+                        WHERE {" OR ".join(["(band = ? AND bucket = ?)"] * len(keys))}
+                    )""",
+                [value for pair in keys for value in pair]
+            ).fetchall()
+        matches = [
+            (record_id, similarity(signature, signature_from_bytes(blob)))
+            for record_id, blob in rows
+        ]
+        return sorted(
+            [(record_id, sim) for record_id, sim in matches if sim >= threshold],
+            key=lambda match: match[1], reverse=True
+        )
+
+    def index_signature(self, record_id: int, cv_text: str):
+        """Compute and store one record's MinHash signature (after it was saved)"""
+        signature = minhash(cv_text or "")  # computed before taking the write lock
+        with self._get_conn() as conn:
+            self._index_minhash(conn, record_id, signature)
+            conn.commit()
+
+    def index_missing_signatures(self, batch_size: int = 200) -> int:
+        """Compute MinHash signatures for records that have none yet.
+
+        Covers records saved in bulk (batch CLI, write-behind, imports) and
+        before near-duplicate detection existed.
+
+        Returns:
+            Number of records indexed
+        """
+        total = 0
+        while True:
+            with self._get_conn() as conn:
+                rows = conn.execute(
+                    """SELECT id, cv_text FROM cv_records
+                       WHERE id NOT IN (SELECT record_id FROM record_minhash)
+                       LIMIT ?""",
+                    (batch_size,)
+                ).fetchall()
+            if not rows:
+                return total
+            signatures = [(record_id, minhash(text or "")) for record_id, text in rows]
+            with self._get_conn() as conn:
+                for record_id, signature in signatures:
+                    self._index_minhash(conn, record_id, signature)
+                conn.commit()
+            total += len(rows)
+
+    # Retention and archives
+    def _archive_path(self, year: str) -> Path:
+        return self.db_path.parent / "archive" / f"{self.db_path.stem}_{year}.db"
+
+    def get_archive_years(self) -> List[str]:
+        """Years that have an archive database, newest first"""
+        prefix = f"{self.db_path.stem}_"
+        return sorted(
+            (p.stem[len(prefix):] for p in (self.db_path.parent / "archive").glob(f"{prefix}*.db")),
+            reverse=True
+        )
+
+    @staticmethod
+    def _init_archive(conn):
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS archive.archived_records (
+                id INTEGER PRIMARY KEY,
+                candidate_name TEXT,
+                position TEXT,
+                score INTEGER,
+                created_at TIMESTAMP,
+                file_hash TEXT,
+                jd_hash TEXT,
+                score_variance REAL,
+                payload BLOB,
+                archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS archive.idx_archived_position
+            ON archived_records(position, created_at)
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS archive.idx_archived_candidate
+            ON archived_records(candidate_name)
+        """)
+
+    def archive_records(self, older_than_days: int, positions: List[str] = None) -> Dict[str, int]:
+        """Move old records into per-year archive databases, then optimize.
+
+        Records are copied into `data/archive/<db>_<year>.db` (attached for
+        the move) with their heavy text compressed, and removed from the
+        live database together with their leaderboard and near-duplicate
+        rows. Archives stay searchable with `search_archive`.
+
+        Args:
+            older_than_days: Archive records created more than this many days ago
+            positions: Only archive records of these positions (default: all)
+
+        Returns:
+            Number of archived records per year
+        """
+        self.flush()
+        where = "created_at < datetime('now', ?)"
+        params = [f"-{int(older_than_days)} days"]
+        if positions:
+            where += f" AND position IN ({', '.join('?' * len(positions))})"
+            params += list(positions)
+
+        moved = {}
+        with self._get_conn() as conn:
+            conn.create_function("ih_pack", len(_ARCHIVED_FIELDS), _pack_archived)
+            years = [row[0] for row in conn.execute(
+                f"SELECT DISTINCT strftime('%Y', created_at) FROM cv_records WHERE {where}", params
+            ) if row[0]]
+            for year in years:
+                path = self._archive_path(year)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                conn.execute("ATTACH DATABASE ? AS archive", (str(path),))
+                try:
+                    self._init_archive(conn)
+                    year_where = f"{where} AND strftime('%Y', created_at) = ?"
+                    year_params = params + [year]
+                    selected = f"SELECT id FROM cv_records WHERE {year_where}"
+                    # One transaction across both files: a record is never in both or neither
+                    conn.execute("BEGIN IMMEDIATE")
+                    conn.execute(f"""
+                        INSERT OR REPLACE INTO archive.archived_records
+                        (id, candidate_name, position, score, created_at, file_hash, jd_hash,
+                         score_variance, payload)
+                        SELECT id, candidate_name, position, score, created_at, file_hash, jd_hash,
+                               score_variance, ih_pack({", ".join(_ARCHIVED_FIELDS)})
+                        FROM main.cv_records WHERE {year_where}
+                    """, year_params)
+                    for table in ("leaderboard", "record_minhash", "lsh_buckets"):
+                        conn.execute(
+                            f"DELETE FROM main.{table} WHERE record_id IN ({selected})", year_params
+                        )
+                    moved[year] = conn.execute(
+                        f"DELETE FROM main.cv_records WHERE {year_where}", year_params
+                    ).rowcount
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                finally:
+                    conn.execute("DETACH DATABASE archive")
+
+        if moved:
+            logger.info("Archived %d record(s): %s", sum(moved.values()), moved)
+            self.optimize()
+        return moved
+
+    def search_archive(self, query: str = "", position: str = None, years: List[str] = None,
+                       search_content: bool = False, limit: int = 100) -> List[dict]:
+        """Search archived records, attaching each year's archive in turn.
+
+        Args:
+            query: Text matched (case-insensitive) against candidate name and
+                position, and against the CV, summary, JD and questions when
+                search_content is set (decompresses every candidate row)
+            position: Only this position
+            years: Only these archive years (default: all, newest first)
+            search_content: Also search the compressed text fields
+            limit: Maximum results
+
+        Returns:
+            Dicts with year, id, candidate_name, position, score and created_at
+        """
+        results = []
+        where = ["1 = 1"]
+        params = []
+        if position:
+            where.append("position = ?")
+            params.append(position)
+        if query:
+            pattern = f"%{query}%"
+            match = "candidate_name LIKE ? OR position LIKE ?"
+            params += [pattern, pattern]
+            if search_content:
+                match += " OR ih_unpack(payload) LIKE ?"
+                params.append(pattern)
+            where.append(f"({match})")
+
+        with self._get_conn() as conn:
+            conn.row_factory = sqlite3.Row
+            conn.create_function("ih_unpack", 1, _unpack_archived)
+            for year in years or self.get_archive_years():
+                if len(results) >= limit:
+                    break
+                path = self._archive_path(year)
+                if not path.exists():
+                    continue
+                conn.execute("ATTACH DATABASE ? AS archive", (str(path),))
+                try:
+                    rows = conn.execute(
+                        f"""SELECT id, candidate_name, position, score, created_at
+                            FROM archive.archived_records WHERE {" AND ".join(where)}
+                            ORDER BY created_at DESC LIMIT ?""",
+                        params + [limit - len(results)]
+                    ).fetchall()
+                finally:
+                    conn.execute("DETACH DATABASE archive")
+                results.extend(dict(row, year=year) for row in rows)
+        return results
+
+    def get_archived_record(self, year: str, record_id: int) -> Optional[CVRecord]:
+        """Load an archived record (its ID is the one it had in the live database)"""
+        path = self._archive_path(year)
+        if not path.exists():
+            return None
+        with sqlite3.connect(path) as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute(
+                "SELECT * FROM archived_records WHERE id = ?", (record_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        content = json.loads(_unpack_archived(row["payload"]))
+        return CVRecord(
+            id=row["id"],
+            candidate_name=row["candidate_name"],
+            position=row["position"],
+            score=row["score"],
+            created_at=row["created_at"],
+            file_hash=row["file_hash"] or "",
+            jd_hash=row["jd_hash"] or "",
+            score_variance=row["score_variance"],
+            **{name: content.get(name) or "" for name in _ARCHIVED_FIELDS}
+        )
+
+    def optimize(self) -> dict:
+        """Return free pages to the OS (incremental vacuum) and refresh planner statistics.
+
+        A database created before incremental auto-vacuum was enabled is
+        converted with one full VACUUM the first time.
+
+        Returns:
+            Dict with freed_pages and page_size
+        """
+        conn = self._get_conn()
+        try:
+            page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+            free_before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                conn.execute("VACUUM")
+            else:
+                # executescript steps the pragma to completion; execute frees one page
+                conn.executescript("PRAGMA incremental_vacuum;")
+            conn.execute("ANALYZE")
+            conn.commit()
+            freed = free_before - conn.execute("PRAGMA freelist_count").fetchone()[0]
+        finally:
+            conn.close()
+        return {"freed_pages": freed, "page_size": page_size}
+
+    # JSONL export / import
+    @staticmethod
+    def _backfill_content_hashes(conn):
+        conn.create_function("ih_content_hash", 5, record_content_hash, deterministic=True)
+        conn.execute("""
+            UPDATE cv_records
+            SET content_hash = ih_content_hash(candidate_name, position, created_at, cv_text,
+                                               jd_text)
+            WHERE content_hash IS NULL
+        """)
+        conn.commit()
+
+    def export_jsonl(self, out: TextIO, position: str = None) -> int:
+        """Stream history records and non-secret settings as JSON lines.
+
+        The first line is a header, the second the settings without API
+        keys, then one line per record (oldest first). Rows are read from
+        a cursor one at a time, so memory use does not grow with history size.
+
+        Args:
+            out: Text stream to write to
+            position: Only export records of this position
+
+        Returns:
+            Number of records written
+        """
+        self.flush()
+        out.write(json.dumps({
+            "type": "header", "format": EXPORT_FORMAT, "version": EXPORT_VERSION,
+            "exported_at": datetime.now().isoformat(timespec="seconds"),
+        }) + "\n")
+
+        count = 0
+        with self._get_conn() as conn:
+            self._backfill_content_hashes(conn)
+            settings = dict(conn.execute(
+                f"SELECT key, value FROM settings "
+                f"WHERE key NOT IN ({', '.join('?' * len(self._SENSITIVE_KEYS))})",
+                sorted(self._SENSITIVE_KEYS)
+            ).fetchall())
+            out.write(json.dumps({"type": "settings", "values": settings},
+                                 ensure_ascii=False) + "\n")
+
+            query = f"SELECT {', '.join(_EXPORT_FIELDS)} FROM cv_records"
+            params = []
+            if position:
+                query += " WHERE position = ?"
+                params.append(position)
+            for row in conn.execute(query + " ORDER BY id", params):
+                line = dict(zip(_EXPORT_FIELDS, row), type="record")
+                out.write(json.dumps(line, ensure_ascii=False) + "\n")
+                count += 1
+        return count
+
+    def import_jsonl(self, lines: Iterable[str], apply_settings: bool = True,
+                     chunk_size: int = 1000, transaction_size: int = 50000) -> dict:
+        """Import history written by export_jsonl, skipping records already present.
+
+        Records are matched by content hash (see record_content_hash), so
+        importing the same file twice, or overlapping exports, adds nothing
+        the second time. Lines are parsed and inserted chunk by chunk with
+        executemany into a staging table, merged into cv_records inside
+        transactions of up to transaction_size records. For imports larger
+        than one chunk, secondary indexes and leaderboard rows are built once
+        at the end instead of per row. Near-duplicate signatures of imported
+        records are computed later by index_missing_signatures.
+
+        Transactions committed before an invalid line are kept; importing
+        the fixed file again only adds the rest.
+
+        Args:
+            lines: JSONL text lines (e.g. an open file)
+            apply_settings: Also store the exported settings (API keys are
+                never exported and are left unchanged)
+            chunk_size: Records per executemany
+            transaction_size: Records per transaction
+
+        Returns:
+            Dict with records (seen), imported, skipped (already present)
+            and settings (keys applied)
+
+        Raises:
+            ValueError: On malformed lines or an unsupported export version
+        """
+        self.flush()
+        columns = [name for name in _EXPORT_FIELDS if name != "created_at"]
+        staged = ", ".join(columns)
+        stats = {"records": 0, "imported": 0, "skipped": 0, "settings": 0}
+        settings_keys = {f.name for f in fields(Settings)} - self._SENSITIVE_KEYS
+
+        conn = self._get_conn()
+        self._backfill_content_hashes(conn)
+        conn.execute(f"""
+            CREATE TEMP TABLE import_staging (
+                content_hash TEXT PRIMARY KEY,
+                {", ".join(name for name in _EXPORT_FIELDS if name != "content_hash")}
+            )
+        """)
+        first_new_id = conn.execute(
+            "SELECT COALESCE(MAX(id), 0) + 1 FROM cv_records"
+        ).fetchone()[0]
+        try:
+            chunk = []
+            in_transaction = 0
+            deferred = False
+
+            def merge():
+                nonlocal in_transaction, deferred
+                if not conn.in_transaction:
+                    conn.execute("BEGIN IMMEDIATE")
+                # Past the first chunk, rebuilding indexes once beats updating them per row
+                if not deferred and stats["records"] > chunk_size:
+                    for name in self._DEFERRABLE_INDEXES:
+                        conn.execute(f"DROP INDEX IF EXISTS {name}")
+                    deferred = True
+                conn.executemany(
+                    f"INSERT OR IGNORE INTO import_staging ({', '.join(_EXPORT_FIELDS)}) "
+                    f"VALUES ({', '.join('?' * len(_EXPORT_FIELDS))})",
+                    chunk
+                )
+                inserted = conn.execute(f"""
+                    INSERT INTO cv_records ({staged}, created_at)
+                    SELECT {staged}, COALESCE(created_at, CURRENT_TIMESTAMP)
+                    FROM import_staging s
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM cv_records c WHERE c.content_hash = s.content_hash
+                    )
+                    ORDER BY s.rowid
+                """).rowcount
+                conn.execute("DELETE FROM import_staging")
+                stats["imported"] += inserted
+                in_transaction += len(chunk)
+                chunk.clear()
+                if in_transaction >= transaction_size:
+                    conn.commit()
+                    in_transaction = 0
+
+            for number, line in enumerate(lines, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    item = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"Line {number}: invalid JSON ({e})") from e
+                kind = item.get("type") if isinstance(item, dict) else None
+                if kind == "record":
+                    content_hash = item.get("content_hash") or record_content_hash(
+                        item.get("candidate_name"), item.get("position"),
+                        item.get("created_at"), item.get("cv_text"), item.get("jd_text")
+                    )
+                    chunk.append(tuple(
+                        content_hash if name == "content_hash" else item.get(name)
+                        for name in _EXPORT_FIELDS
+                    ))
+                    stats["records"] += 1
+                    if len(chunk) >= chunk_size:
+                        merge()
+                elif kind == "header":
+                    if item.get("format") != EXPORT_FORMAT:
+                        raise ValueError(f"Line {number}: not an Interviewer Helper export")
+                    if item.get("version", 0) > EXPORT_VERSION:
+                        raise ValueError(
+                            f"Line {number}: export version {item['version']} is newer than "
+                            f"supported ({EXPORT_VERSION})"
+                        )
+                elif kind == "settings":
+                    if not apply_settings:
+                        continue
+                    values = {
+                        key: str(value) for key, value in (item.get("values") or {}).items()
+                        if key in settings_keys
+                    }
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+                        values.items()
+                    )
+                    stats["settings"] = len(values)
+                else:
+                    raise ValueError(f"Line {number}: unknown line type {kind!r}")
+            if chunk:
+                merge()
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            # Rank and re-index whatever was committed, even after a failure
+            conn.execute("""
+                INSERT OR REPLACE INTO leaderboard (record_id, position, score, candidate_name)
+                SELECT id, position, score, candidate_name FROM cv_records WHERE id >= ?
+            """, (first_new_id,))
+            for statement in self._DEFERRABLE_INDEXES.values():
+                conn.execute(statement)
+            conn.commit()
+            conn.close()
+
+        stats["skipped"] = stats["records"] - stats["imported"]
+        return stats
+
+    # Question bank
+    def add_bank_questions(self, questions: List[dict]) -> int:
+        """Add questions (category, question, purpose, skills) to the bank.
+
+        Questions already in the bank (same text) are ignored.
+
+        Returns:
+            Number of questions added
+        """
+        added = 0
+        with self._get_conn() as conn:
+            for q in questions:
+                cursor = conn.execute(
+                    """INSERT OR IGNORE INTO question_bank (category, question, purpose, skills)
+                       VALUES (?, ?, ?, ?)""",
+                    (q["category"], q["question"], q["purpose"], json.dumps(q["skills"]))
+                )
+                if cursor.rowcount:
+                    added += 1
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO question_bank_skills (skill, question_id) VALUES (?, ?)",
+                        [(skill, cursor.lastrowid) for skill in q["skills"]]
+                    )
+            conn.commit()
+        return added
+
+    def find_bank_questions(self, category: str, skills: List[str] = None,
+                            limit: int = 50) -> List[dict]:
+        """Get banked questions of a category, most used first.
+
+        Args:
+            category: Question category
+            skills: Only questions tagged with at least one of these skills
+            limit: Maximum number of questions
+
+        Returns:
+            Dicts with id, category, question, purpose, skills and use_count
+        """
+        with self._get_conn() as conn:
+            conn.row_factory = sqlite3.Row
+            if skills:
+                rows = conn.execute(
+                    f"""SELECT * FROM question_bank WHERE category = ? AND id IN (
+                            SELECT question_id FROM question_bank_skills
+                            WHERE skill IN ({", ".join("?" * len(skills))})
+                        )
+                        ORDER BY use_count DESC, id LIMIT ?""",
+                    [category, *skills, limit]
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    """SELECT * FROM question_bank WHERE category = ?
+                       ORDER BY use_count DESC, id LIMIT ?""",
+                    (category, limit)
+                ).fetchall()
+        return [dict(row, skills=json.loads(row["skills"] or "[]")) for row in rows]
+
+    def mark_bank_questions_used(self, question_ids: List[int]):
+        """Count a reuse of banked questions"""
+        if not question_ids:
+            return
+        with self._get_conn() as conn:
+            conn.executemany(
+                "UPDATE question_bank SET use_count = use_count + 1 WHERE id = ?",
+                [(i,) for i in question_ids]
+            )
+            conn.commit()
+
+    # Translation cache
+    def get_translations(self, content_hashes: set, language: str) -> dict:
+        """Get cached translations as {content hash: translated text}"""
+        hashes = list(content_hashes)
+        found = {}
+        with self._get_conn() as conn:
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(hashes), 500):
+                batch = hashes[start:start + 500]
+                rows = conn.execute(
+                    f"""SELECT content_hash, translated FROM translation_cache
+                        WHERE language = ? AND content_hash IN ({", ".join("?" * len(batch))})""",
+                    [language, *batch]
+                ).fetchall()
+                found.update(rows)
+        return found
+
+    def save_translations(self, language: str, translations: dict):
+        """Cache translations given as {content hash: translated text}"""
+        with self._get_conn() as conn:
+            conn.executemany(
+                """INSERT OR REPLACE INTO translation_cache (content_hash, language, translated)
+                   VALUES (?, ?, ?)""",
+                [(h, language, text) for h, text in translations.items()]
+            )
+            conn.commit()
+
+    # Leaderboard and comparisons
+    def get_leaderboard(self, position: str, limit: int = None,
+                        scored_only: bool = False) -> List[dict]:
+        """Get a position's candidates ranked by score (unscored sort last).
+
+        Reads the leaderboard table through its (position, score) index,
+        so the top of the ranking is cheap however many records exist.
+        scored_only leaves out records without a score.
+
+        Returns:
+            Dicts with rank, record_id, candidate_name and score
+        """
+        with self._get_conn() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(
+                f"""SELECT record_id, candidate_name, score FROM leaderboard
+                   WHERE position = ?{" AND score IS NOT NULL" if scored_only else ""}
+                   ORDER BY score DESC, record_id
+                   LIMIT ?""",
+                (position, -1 if limit is None else limit)
+            ).fetchall()
+        return [dict(row, rank=rank) for rank, row in enumerate(rows, start=1)]
+
+    def get_compare_inputs(self, record_ids: List[int]) -> List[dict]:
+        """Get what a comparison needs (name, score, summary, JD) for records.
+
+        Returns:
+            Dicts with id, candidate_name, score, cv_summary, jd_text and
+            jd_hash, in the order of record_ids (missing IDs are skipped)
+        """
+        if not record_ids:
+            return []
+        placeholders = ", ".join("?" * len(record_ids))
+        with self._get_conn() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(
+                f"""SELECT id, candidate_name, score, cv_summary, jd_text, jd_hash
+                    FROM cv_records WHERE id IN ({placeholders})""",
+                list(record_ids)
+            ).fetchall()
+        by_id = {row["id"]: dict(row) for row in rows}
+        return [by_id[i] for i in record_ids if i in by_id]
+
+    def get_cached_comparison(self, cache_key: str) -> Optional[str]:
+        """Get a cached comparison result"""
+        with self._get_conn() as conn:
+            row = conn.execute(
+                "SELECT result FROM compare_cache WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def save_comparison(self, cache_key: str, record_ids: List[int], jd_hash: str, result: str):
+        """Cache a comparison result"""
+        with self._get_conn() as conn:
+            conn.execute(
+                """INSERT OR REPLACE INTO compare_cache (cache_key, record_ids, jd_hash, result)
+                   VALUES (?, ?, ?, ?)""",
+                (cache_key, json.dumps(sorted(record_ids)), jd_hash, result)
+            )
+            conn.commit()
+
+    # Jobs
+    @staticmethod
+    def _row_to_job(row) -> Job:
+        return Job(
+            id=row["id"],
+            status=row["status"],
+            stage=row["stage"],
+            pdf_path=row["pdf_path"],
+            params=json.loads(row["params"] or "{}"),
+            state=json.loads(row["state"] or "{}"),
+            record_id=row["record_id"],
+            error=row["error"],
+            created_at=row["created_at"],
+            updated_at=row["updated_at"]
+        )
+
+    def create_job(self, pdf_path: str, params: dict, state: dict = None) -> int:
+        """Queue a new job and return its ID.
+
+        A state with results from elsewhere (e.g. a reused CV summary) makes
+        the job start like one resumed after its analysis stage.
+        """
+        with self._get_conn() as conn:
+            cursor = conn.execute(
+                "INSERT INTO jobs (pdf_path, params, state, stage) VALUES (?, ?, ?, ?)",
+                (pdf_path, json.dumps(params, ensure_ascii=False),
+                 json.dumps(state or {}, ensure_ascii=False), "analysis" if state else "")
+            )
+            conn.commit()
+            return cursor.lastrowid
+
+    def get_job(self, job_id: int) -> Optional[Job]:
+        """Get single job by ID"""
+        with self._get_conn() as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            return self._row_to_job(row) if row else None
+
+    def claim_next_job(self) -> Optional[Job]:
+        """Atomically mark the oldest queued job as running and return it"""
+        conn = self._get_conn()
+        try:
+            conn.row_factory = sqlite3.Row
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE status = 'queued' ORDER BY id LIMIT 1"
+            ).fetchone()
+            if row is None:
+                conn.rollback()
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                (row["id"],)
+            )
+            conn.commit()
+            job = self._row_to_job(row)
+            job.status = "running"
+            return job
+        finally:
+            conn.close()
+
+    def update_job_stage(self, job_id: int, stage: str, state: dict):
+        """Persist the outputs of a completed stage"""
+        with self._get_conn() as conn:
+            conn.execute(
+                "UPDATE jobs SET stage = ?, state = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                (stage, json.dumps(state, ensure_ascii=False), job_id)
+            )
+            conn.commit()
+
+    def finish_job(self, job_id: int, record: CVRecord) -> int:
+        """Save a job's record and mark the job done in one transaction.
+
+        A crash can then never leave a saved record on a job that is still
+        running, which a restart would resume and save a second time.
+        Calling it again for a finished job saves nothing and returns the
+        existing record.
+
+        Returns:
+            ID of the job's record
+        """
+        with self._get_conn() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT record_id FROM jobs WHERE id = ? AND status = 'done'", (job_id,)
+            ).fetchone()
+            if row and row[0] is not None:
+                conn.rollback()
+                return row[0]
+            cursor = conn.execute(self._INSERT_RECORD, self._record_params(record))
+            record_id = cursor.lastrowid
+            conn.execute(self._UPSERT_LEADERBOARD, (
+                record_id, record.position, record.score, record.candidate_name
+            ))
+            conn.execute(
+                "UPDATE jobs SET status = 'done', record_id = ?, updated_at = CURRENT_TIMESTAMP "
+                "WHERE id = ?",
+                (record_id, job_id)
+            )
+            conn.commit()
+            return record_id
+
+    def fail_job(self, job_id: int, error: str):
+        """Mark a running job failed; completed stages are kept for a retry.
+
+        A job that already finished stays done.
+        """
+        with self._get_conn() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, updated_at = CURRENT_TIMESTAMP "
+                "WHERE id = ? AND status = 'running'",
+                (error, job_id)
+            )
+            conn.commit()
+
+    def retry_job(self, job_id: int) -> bool:
+        """Requeue a failed job; it resumes after its last completed stage"""
+        with self._get_conn() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'queued', error = '', updated_at = CURRENT_TIMESTAMP "
+                "WHERE id = ? AND status = 'failed'",
+                (job_id,)
+            )
+            conn.commit()
+            return cursor.rowcount > 0
+
+    def requeue_interrupted_jobs(self) -> int:
+        """Requeue jobs left running by a previous process. Returns count."""
+        with self._get_conn() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'queued', updated_at = CURRENT_TIMESTAMP "
+                "WHERE status = 'running'"
+            )
+            conn.commit()
+            return cursor.rowcount
+
+    # Metrics
+    def record_metric(self, event: dict):
+        """Store a metric event, via the metric writer if write-behind is enabled.
+
+        Used as the sink for `core.metrics`.
+        """
+        if self._metric_writer is None:
+            self.record_metrics([event])
+        else:
+            self._metric_writer.put(event)
+
+    def record_metrics(self, events: List[dict]):
+        """Store metric events and update their rollups in one transaction"""
+        if not events:
+            return
+        # Aggregate in memory so each rollup row is written once per batch
+        rollups = {}
+        buckets = {}
+        runs = {}
+        for event in events:
+            key = (event["kind"], event["name"])
+            rollup = rollups.setdefault(key, [0, 0, 0, 0, 0, 0.0])
+            rollup[0] += 1
+            rollup[1] += event["error"] is not None
+            rollup[2] += int(event["cache_hit"])
+            rollup[3] += event["input_tokens"]
+            rollup[4] += event["output_tokens"]
+            rollup[5] += event["cost"]
+            if event["latency_ms"] is not None:
+                bucket = (*key, latency_bucket(event["latency_ms"]))
+                buckets[bucket] = buckets.get(bucket, 0) + 1
+            if event["kind"] == "call" and event["run_id"]:
+                run = runs.setdefault(event["run_id"], [0.0, 0, 0, 0])
+                run[0] += event["cost"]
+                run[1] += event["input_tokens"]
+                run[2] += event["output_tokens"]
+                run[3] += 1
+
+        with self._get_conn() as conn:
+            conn.executemany("""
+                INSERT INTO metric_events
+                (run_id, kind, name, provider, model, input_tokens, output_tokens,
+                 latency_ms, cache_hit, error, cost)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [(
+                event["run_id"], event["kind"], event["name"],
+                event["provider"], event["model"],
+                event["input_tokens"], event["output_tokens"],
+                event["latency_ms"], int(event["cache_hit"]),
+                event["error"], event["cost"]
+            ) for event in events])
+            conn.executemany("""
+                INSERT INTO metric_rollups
+                (kind, name, count, errors, cache_hits, input_tokens, output_tokens, cost)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(kind, name) DO UPDATE SET
+                    count = count + excluded.count,
+                    errors = errors + excluded.errors,
+                    cache_hits = cache_hits + excluded.cache_hits,
+                    input_tokens = input_tokens + excluded.input_tokens,
+                    output_tokens = output_tokens + excluded.output_tokens,
+                    cost = cost + excluded.cost
+            """, [(*key, *rollup) for key, rollup in rollups.items()])
+            conn.executemany("""
+                INSERT INTO metric_latency_buckets (kind, name, bucket, count)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(kind, name, bucket) DO UPDATE SET count = count + excluded.count
+            """, [(*bucket, count) for bucket, count in buckets.items()])
+            if runs:
+                placeholders = ", ".join("?" * len(runs))
+                seen = {row[0] for row in conn.execute(
+                    f"SELECT run_id FROM metric_runs WHERE run_id IN ({placeholders})",
+                    list(runs)
+                )}
+                conn.executemany("""
+                    INSERT INTO metric_runs (run_id, cost, input_tokens, output_tokens, calls)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(run_id) DO UPDATE SET
+                        cost = cost + excluded.cost,
+                        input_tokens = input_tokens + excluded.input_tokens,
+                        output_tokens = output_tokens + excluded.output_tokens,
+                        calls = calls + excluded.calls
+                """, [(run_id, *run) for run_id, run in runs.items()])
+                # A run's first call counts one more candidate
+                new_runs = len(runs.keys() - seen)
+                if new_runs:
+                    conn.execute("""
+                        INSERT INTO metric_rollups (kind, name, count) VALUES ('run', 'candidates', ?)
+                        ON CONFLICT(kind, name) DO UPDATE SET count = count + excluded.count
+                    """, (new_runs,))
+            conn.commit()
+
+    def get_latency_percentiles(self, percentiles=(50, 95, 99)) -> List[dict]:
+        """Get latency percentiles per stage/call from the histogram rollup"""
+        if self._metric_writer is not None:
+            self._metric_writer.flush()
+        with self._get_conn() as conn:
+            rows = conn.execute("""
+                SELECT b.kind, b.name, b.bucket, b.count, r.count, r.errors, r.cache_hits
+                FROM metric_latency_buckets b
+                LEFT JOIN metric_rollups r ON r.kind = b.kind AND r.name = b.name
+                WHERE b.kind IN ('stage', 'call')
+                ORDER BY b.name, b.kind, b.bucket
+            """).fetchall()
+
+        by_name = {}
+        for kind, name, bucket, count, total, errors, cache_hits in rows:
+            entry = by_name.setdefault((kind, name), {
+                "kind": kind, "name": name, "count": total or 0, "errors": errors or 0,
+                "cache_hits": cache_hits or 0, "buckets": []
+            })
+            entry["buckets"].append((bucket, count))
+
+        results = []
+        for entry in by_name.values():
+            buckets = entry.pop("buckets")
+            seen = sum(count for _, count in buckets)
+            for p in percentiles:
+                target = seen * p / 100
+                running = 0
+                for bucket, count in buckets:
+                    running += count
+                    if running >= target:
+                        entry[f"p{p}"] = round(bucket_latency(bucket))
+                        break
+            results.append(entry)
+        return results
+
+    def get_cost_summary(self) -> dict:
+        """Get total and per-candidate token usage and cost from rollups"""
+        if self._metric_writer is not None:
+            self._metric_writer.flush()
+        with self._get_conn() as conn:
+            calls, cost, input_tokens, output_tokens = conn.execute("""
+                SELECT COALESCE(SUM(count), 0), COALESCE(SUM(cost), 0),
+                       COALESCE(SUM(input_tokens), 0), COALESCE(SUM(output_tokens), 0)
+                FROM metric_rollups WHERE kind = 'call'
+            """).fetchone()
+            row = conn.execute(
+                "SELECT count FROM metric_rollups WHERE kind = 'run' AND name = 'candidates'"
+            ).fetchone()
+        runs = row[0] if row else 0
+        return {
+            "candidates": runs,
+            "total_cost": cost,
+            "cost_per_candidate": cost / runs if runs else 0.0,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "calls_per_candidate": calls / runs if runs else 0.0,
+        }
+
     # Settings
     # Keys that contain sensitive data requiring encryption
     _SENSITIVE_KEYS = {"claude_api_key", "gemini_api_key"}
 
     def save_settings(self, settings: Settings):
         """Save app settings with encryption for sensitive values"""
+        # Derived once for this save, not kept afterwards
+        secret = derive_key() if any(
+            getattr(settings, key) and not is_encrypted(getattr(settings, key))
+            for key in self._SENSITIVE_KEYS
+        ) else None
         with self._get_conn() as conn:
             for key, value in settings.__dict__.items():
                 # Encrypt sensitive keys before storage
                 if key in self._SENSITIVE_KEYS and value:
-                    value = encrypt(value)
+                    value = encrypt(value, key=secret)
                 conn.execute(
                     "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
                     (key, value)
@@ -139,12 +1662,16 @@ class Database:
         settings = Settings()
         with self._get_conn() as conn:
             rows = conn.execute("SELECT key, value FROM settings").fetchall()
-            for key, value in rows:
-                if hasattr(settings, key):
-                    # Decrypt sensitive keys after loading
-                    if key in self._SENSITIVE_KEYS and value:
-                        value = decrypt(value)
-                    setattr(settings, key, value)
+        # Derived once for this load, not kept afterwards
+        secret = derive_key() if any(
+            key in self._SENSITIVE_KEYS and is_encrypted(value) for key, value in rows
+        ) else None
+        for key, value in rows:
+            if hasattr(settings, key):
+                # Decrypt sensitive keys after loading
+                if key in self._SENSITIVE_KEYS and value:
+                    value = decrypt(value, key=secret)
+                setattr(settings, key, value)
         return settings
 
     def migrate_plaintext_keys(self):
@@ -152,13 +1679,16 @@ class Database:
 
         Safe to call multiple times - skips already encrypted values.
         """
+        secret = None
         with self._get_conn() as conn:
             for key in self._SENSITIVE_KEYS:
                 row = conn.execute(
                     "SELECT value FROM settings WHERE key = ?", (key,)
                 ).fetchone()
                 if row and row[0] and not is_encrypted(row[0]):
-                    encrypted_value = encrypt(row[0])
+                    # Derived on the first plaintext key, for this migration only
+                    secret = secret or derive_key()
+                    encrypted_value = encrypt(row[0], key=secret)
                     conn.execute(
                         "UPDATE settings SET value = ? WHERE key = ?",
                         (encrypted_value, key)
@@ -1,26 +1,121 @@
 """Data models for storage"""
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
 
 
-@dataclass
+# Sentinel for heavy fields that have not been fetched from the database yet
+_UNLOADED = object()
+
+
+class _LazyField:
+    """Descriptor for a heavy text column fetched on first access"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.slot = f"_{name}"
+
+    def __get__(self, record, owner=None):
+        if record is None:
+            return self
+        value = getattr(record, self.slot)
+        if value is _UNLOADED:
+            value = record._db.load_record_field(record.id, self.name)
+            setattr(record, self.slot, value)
+        return value
+
+    def __set__(self, record, value):
+        setattr(record, self.slot, value)
+
+
 class CVRecord:
-    """Record of analyzed CV"""
-    id: Optional[int] = None
-    candidate_name: str = ""
-    position: str = ""
-    cv_text: str = ""
-    cv_summary: str = ""
-    jd_text: str = ""
-    questions: str = ""
-    score: int = 0
-    score_breakdown: str = ""  # JSON string
-    created_at: datetime = None
+    """Record of analyzed CV.
+
+    Heavy text fields (CV text, summary, JD, questions, score breakdown)
+    can be left unloaded; they are then fetched from the owning Database
+    on first attribute access. Instances use __slots__ to stay compact.
+    """
+
+    METADATA_FIELDS = (
+        "id", "candidate_name", "position", "score", "created_at", "file_hash", "jd_hash",
+        "score_variance"
+    )
+    HEAVY_FIELDS = (
+        "cv_text", "cv_summary", "jd_text", "questions", "score_breakdown", "questions_data"
+    )
+
+    __slots__ = (
+        "id", "candidate_name", "position", "score", "created_at", "file_hash", "jd_hash",
+        "score_variance", "_db",
+        "_cv_text", "_cv_summary", "_jd_text", "_questions", "_score_breakdown",
+        "_questions_data",
+    )
+
+    cv_text = _LazyField("cv_text")
+    cv_summary = _LazyField("cv_summary")
+    jd_text = _LazyField("jd_text")
+    questions = _LazyField("questions")
+    score_breakdown = _LazyField("score_breakdown")  # JSON string
+    questions_data = _LazyField("questions_data")  # JSON string of the parsed questions
+
+    def __init__(
+        self,
+        id: Optional[int] = None,
+        candidate_name: str = "",
+        position: str = "",
+        cv_text: str = "",
+        cv_summary: str = "",
+        jd_text: str = "",
+        questions: str = "",
+        score: int = 0,
+        score_breakdown: str = "",
+        created_at: datetime = None,
+        file_hash: str = "",  # SHA-256 of the source PDF
+        jd_hash: str = "",  # hash of the JD the record was scored against
+        questions_data: str = "",  # language-neutral questions, see structure_questions
+        score_variance: Optional[float] = None,  # variance of consensus score samples
+        _db=None
+    ):
+        self.id = id
+        self.candidate_name = candidate_name
+        self.position = position
+        self.cv_text = cv_text
+        self.cv_summary = cv_summary
+        self.jd_text = jd_text
+        self.questions = questions
+        self.score = score
+        self.score_breakdown = score_breakdown
+        self.created_at = created_at if created_at is not None else datetime.now()
+        self.file_hash = file_hash
+        self.jd_hash = jd_hash
+        self.questions_data = questions_data
+        self.score_variance = score_variance
+        self._db = _db
 
-    def __post_init__(self):
-        if self.created_at is None:
-            self.created_at = datetime.now()
+    @classmethod
+    def lazy(cls, db, **metadata) -> "CVRecord":
+        """Create a record holding only metadata; heavy fields load on access"""
+        record = cls(_db=db, **metadata)
+        for name in cls.HEAVY_FIELDS:
+            setattr(record, f"_{name}", _UNLOADED)
+        return record
+
+    def is_loaded(self, name: str) -> bool:
+        """Whether a heavy field is already in memory"""
+        return getattr(self, f"_{name}") is not _UNLOADED
+
+    def _values(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.METADATA_FIELDS + self.HEAVY_FIELDS)
+
+    def __eq__(self, other):
+        if not isinstance(other, CVRecord):
+            return NotImplemented
+        return self._values() == other._values()
+
+    def __repr__(self):
+        # Metadata only: repr must not trigger lazy loads
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.METADATA_FIELDS)
+        return f"CVRecord({fields})"
 
 
 @dataclass
@@ -30,3 +125,39 @@ class Settings:
     gemini_api_key: str = ""
     default_model: str = "gemini"
     language: str = "en"
+    auto_reject_coverage: str = "0"  # percent of required skills; "0" disables
+    reuse_questions: str = "0"  # "1" fills questions from the question bank (opt-in)
+    consensus_scoring: str = "0"  # "1" scores from several samples
+    profiling: str = "0"  # "1" profiles sampled requests into data/profiles
+    profile_sample_rate: str = "0.1"  # share of requests profiled (0-1)
+    retention_days: str = "0"  # archive records older than this at startup; "0" disables
+    retention_positions: str = ""  # comma-separated positions to archive; "" means all
+
+
+@dataclass
+class ScoreChange:
+    """Audit entry for a record re-scored against a changed JD"""
+    id: Optional[int] = None
+    record_id: int = 0
+    old_score: Optional[int] = None
+    new_score: Optional[int] = None
+    old_jd_hash: str = ""
+    new_jd_hash: str = ""
+    old_score_breakdown: str = ""  # JSON string
+    model: str = ""
+    created_at: datetime = None
+
+
+@dataclass
+class Job:
+    """Background CV processing job"""
+    id: Optional[int] = None
+    status: str = "queued"  # queued | running | done | failed
+    stage: str = ""  # last completed pipeline stage
+    pdf_path: str = ""
+    params: dict = field(default_factory=dict)  # jd_full, model, candidate_name, position, skills
+    state: dict = field(default_factory=dict)  # outputs of completed stages
+    record_id: Optional[int] = None
+    error: str = ""
+    created_at: datetime = None
+    updated_at: datetime = None
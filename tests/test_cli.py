@@ -0,0 +1,79 @@
+import json
+import threading
+
+import pytest
+
+import cli
+from core import metrics
+from storage.database import Database
+from storage.models import CVRecord
+
+
+@pytest.fixture
+def batch_dir(tmp_path):
+    pdf_dir = tmp_path / "cvs"
+    pdf_dir.mkdir()
+    for i in range(8):
+        (pdf_dir / f"cv{i}.pdf").write_bytes(f"cv {i}".encode())
+    (tmp_path / "jd.md").write_text("JD", encoding="utf-8")
+    yield tmp_path
+    metrics.set_sink(None)
+
+
+def _args(tmp_path, *extra):
+    return cli.build_parser().parse_args([
+        "batch", "--pdf-dir", str(tmp_path / "cvs"), "--jd", str(tmp_path / "jd.md"),
+        "--model", "fake", "--db", str(tmp_path / "test.db"),
+        "--output", str(tmp_path / "out.jsonl"), *extra
+    ])
+
+
+def _fake_record(ai_client, pdf_path, digest, *args):
+    return CVRecord(
+        candidate_name=pdf_path.stem, score=70, file_hash=digest,
+        score_breakdown=json.dumps({"recommendation": "Hire", "summary": "ok"})
+    )
+
+
+def _output_lines(tmp_path):
+    path = tmp_path / "out.jsonl"
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_interrupt_cancels_queued_cvs(batch_dir, monkeypatch):
+    started = []
+    release = threading.Event()
+
+    def process(*args):
+        started.append(args[1])
+        release.wait(timeout=5)
+        return _fake_record(*args)
+
+    def interrupted(futures):
+        release.set()
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(cli, "_process_one", process)
+    monkeypatch.setattr(cli, "as_completed", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        cli.run_batch(_args(batch_dir, "--workers", "2"))
+    # Only the CVs already running when Ctrl-C came were processed
+    assert len(started) <= 2
+
+
+def test_lines_written_only_after_save(batch_dir, monkeypatch):
+    monkeypatch.setattr(cli, "_process_one", _fake_record)
+
+    def failing_save(self, records):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(Database, "save_cv_records", failing_save)
+    with pytest.raises(OSError):
+        cli.run_batch(_args(batch_dir, "--workers", "1", "--batch-size", "3"))
+    assert _output_lines(batch_dir) == []
+
+    monkeypatch.undo()
+    monkeypatch.setattr(cli, "_process_one", _fake_record)
+    assert cli.run_batch(_args(batch_dir, "--workers", "1", "--batch-size", "3")) == 0
+    lines = _output_lines(batch_dir)
+    assert sorted(line["file"] for line in lines) == [f"cv{i}.pdf" for i in range(8)]
@@ -0,0 +1,90 @@
+import json
+
+from core import comparison
+from storage.database import Database
+from storage.models import CVRecord
+
+
+class StubClient:
+    """Leaves group order to the stored-score fallback and counts calls"""
+
+    def __init__(self):
+        self.group_calls = 0
+        self.final_calls = 0
+
+    def chat_json(self, prompt, schema, model_provider=None, schema_name=None):
+        self.group_calls += 1
+        if self.group_calls > 100:
+            raise AssertionError("tournament did not terminate")
+        return json.dumps({"ranking": [], "notes": ""})
+
+    def chat(self, prompt, model_provider=None):
+        self.final_calls += 1
+        return f"comparison by {model_provider}"
+
+
+def _candidates(count, summary_chars):
+    return [
+        {"id": i, "candidate_name": f"C{i}", "score": 50 + i, "cv_summary": "x" * summary_chars}
+        for i in range(1, count + 1)
+    ]
+
+
+def test_small_field_with_long_summaries_terminates():
+    # 4 x 11k chars is over COMPARE_MAX_CHARS, but too few for two groups of 3
+    client = StubClient()
+    finalists, notes = comparison._tournament(client, _candidates(4, 11000), "JD", "fake")
+    assert len(finalists) == comparison.ADVANCE_PER_GROUP
+    assert client.group_calls == 1
+    assert len(notes) == 1
+
+
+def test_every_round_shrinks_the_field():
+    for count in range(3, 30):
+        for chars in (100, 11000, 45000):
+            candidates = _candidates(count, chars)
+            groups = comparison._make_groups(candidates)
+            assert all(len(g) > comparison.ADVANCE_PER_GROUP for g in groups)
+            finalists, _ = comparison._tournament(StubClient(), candidates, "JD", "fake")
+            assert len(finalists) < count or comparison._fits_one_call(candidates)
+
+
+def _save(db, name, score, position="Dev"):
+    return db.save_cv_record(CVRecord(
+        candidate_name=name, position=position, score=score,
+        cv_summary=f"{name} summary", jd_text="JD"
+    ))
+
+
+def test_cache_is_per_model(tmp_path):
+    db = Database(str(tmp_path / "test.db"))
+    ids = [_save(db, "A", 80), _save(db, "B", 70)]
+    client = StubClient()
+
+    result, cached = comparison.compare_records(client, db, ids, model="gemini")
+    assert (result, cached) == ("comparison by gemini", False)
+    result, cached = comparison.compare_records(client, db, ids, model="claude")
+    assert (result, cached) == ("comparison by claude", False)
+    result, cached = comparison.compare_records(client, db, ids, model="gemini")
+    assert (result, cached) == ("comparison by gemini", True)
+
+
+def test_top_k_skips_unscored_records(tmp_path):
+    db = Database(str(tmp_path / "test.db"))
+    _save(db, "Rejected", None)
+    _save(db, "A", 80)
+    _save(db, "B", 70)
+
+    assert [r["candidate_name"] for r in db.get_leaderboard("Dev", limit=3, scored_only=True)] \
+        == ["A", "B"]
+    with_unscored = db.get_leaderboard("Dev")
+    assert with_unscored[-1]["candidate_name"] == "Rejected"
+
+    _save(db, "Failed", None, position="Solo")
+    _save(db, "Only", 60, position="Solo")
+    try:
+        comparison.compare_top_k(StubClient(), db, "Solo", k=5)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("an unscored record was compared")
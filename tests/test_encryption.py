@@ -0,0 +1,31 @@
+from core import encryption
+from storage.database import Database
+from storage.models import Settings
+
+
+def test_key_derived_once_per_settings_call(tmp_path, monkeypatch):
+    calls = []
+    derive = encryption._derive_key
+
+    def counting_derive(salt):
+        calls.append(salt)
+        return derive(salt)
+
+    monkeypatch.setattr(encryption, "_derive_key", counting_derive)
+    db = Database(str(tmp_path / "test.db"))
+
+    db.save_settings(Settings(claude_api_key="sk-claude", gemini_api_key="gm-key"))
+    assert len(calls) == 1
+    settings = db.load_settings()
+    assert (settings.claude_api_key, settings.gemini_api_key) == ("sk-claude", "gm-key")
+    assert len(calls) == 2
+    # Nothing is cached between calls
+    db.load_settings()
+    assert len(calls) == 3
+
+
+def test_no_derivation_without_keys(tmp_path, monkeypatch):
+    monkeypatch.setattr(encryption, "_derive_key", lambda salt: 1 / 0)
+    db = Database(str(tmp_path / "test.db"))
+    db.save_settings(Settings(default_model="gemini"))
+    assert db.load_settings().default_model == "gemini"
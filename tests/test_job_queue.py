@@ -0,0 +1,95 @@
+import sqlite3
+
+from core.job_queue import JobQueue
+from storage.database import Database
+from storage.models import CVRecord
+
+
+# Every stage already done: the queue goes straight to on_complete
+FINISHED_STATE = {
+    "cv_text": "text", "cv_summary": "summary", "questions": "questions",
+    "score_result": {"overall_score": 70}
+}
+
+
+def _record_count(db):
+    with sqlite3.connect(db.db_path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM cv_records").fetchone()[0]
+
+
+def _running_job(db):
+    db.create_job("cv.pdf", {"jd_full": "JD", "model": "fake"}, state=FINISHED_STATE)
+    return db.claim_next_job()
+
+
+def test_finish_job_is_idempotent(tmp_path):
+    db = Database(str(tmp_path / "test.db"))
+    job = _running_job(db)
+
+    record_id = db.finish_job(job.id, CVRecord(candidate_name="A", position="Dev", score=70))
+    assert db.finish_job(job.id, CVRecord(candidate_name="A", position="Dev", score=70)) \
+        == record_id
+    assert _record_count(db) == 1
+    assert db.get_job(job.id).record_id == record_id
+
+
+def test_crash_after_finish_is_not_resumed(tmp_path):
+    db = Database(str(tmp_path / "test.db"))
+    job = _running_job(db)
+    db.finish_job(job.id, CVRecord(candidate_name="A", position="Dev", score=70))
+
+    # A restart requeues only jobs still marked running
+    assert db.requeue_interrupted_jobs() == 0
+    assert db.claim_next_job() is None
+    assert _record_count(db) == 1
+
+
+def test_failure_after_finish_keeps_job_done(tmp_path):
+    db = Database(str(tmp_path / "test.db"))
+
+    def on_complete(job, state):
+        db.finish_job(job.id, CVRecord(candidate_name="A", position="Dev", score=70))
+        raise OSError("cleanup failed")
+
+    queue = JobQueue(db, client_factory=lambda: None, on_complete=on_complete)
+    job = _running_job(db)
+    queue._run(job)
+
+    assert db.get_job(job.id).status == "done"
+    assert not db.retry_job(job.id)
+    assert _record_count(db) == 1
+
+
+def test_fail_job_marks_running_job_failed(tmp_path):
+    db = Database(str(tmp_path / "test.db"))
+    job = _running_job(db)
+
+    def on_complete(job, state):
+        raise ValueError("save failed")
+
+    JobQueue(db, client_factory=lambda: None, on_complete=on_complete)._run(job)
+    assert db.get_job(job.id).status == "failed"
+    assert db.retry_job(job.id)
+
+
+def test_crash_inside_finish_saves_nothing(tmp_path):
+    db = Database(str(tmp_path / "test.db"))
+    job = _running_job(db)
+    # Simulate the process dying between the record insert and the job update
+    with sqlite3.connect(db.db_path) as conn:
+        conn.execute("""CREATE TRIGGER crash BEFORE UPDATE OF status ON jobs
+                        BEGIN SELECT RAISE(ABORT, 'crash'); END""")
+    try:
+        db.finish_job(job.id, CVRecord(candidate_name="A", position="Dev", score=70))
+    except sqlite3.IntegrityError:
+        pass
+    assert _record_count(db) == 0
+
+    # The restart resumes the job, and it is saved exactly once
+    with sqlite3.connect(db.db_path) as conn:
+        conn.execute("DROP TRIGGER crash")
+    assert db.requeue_interrupted_jobs() == 1
+    resumed = db.claim_next_job()
+    db.finish_job(resumed.id, CVRecord(candidate_name="A", position="Dev", score=70))
+    assert _record_count(db) == 1
+    assert db.get_job(job.id).status == "done"
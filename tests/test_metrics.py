@@ -0,0 +1,117 @@
+import sqlite3
+
+import json
+
+import pytest
+
+from core import metrics
+from core.translation import translate_texts
+from storage.database import Database
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = Database(str(tmp_path / "test.db"))
+    metrics.set_sink(db.record_metric)
+    yield db
+    metrics.set_sink(None)
+
+
+def _by_key(db):
+    return {(m["kind"], m["name"]): m for m in db.get_latency_percentiles()}
+
+
+def test_cache_lookup_does_not_count_as_stage(db):
+    metrics.record_cache("translation", True)
+    metrics.record("stage", "translation", latency_ms=100)
+
+    assert set(_by_key(db)) == {("stage", "translation")}
+    stage = _by_key(db)[("stage", "translation")]
+    assert (stage["count"], stage["cache_hits"]) == (1, 0)
+
+
+class UpperCaseTranslator:
+    def chat_json(self, prompt, schema, model_provider=None, schema_name=None):
+        texts = json.loads(prompt[prompt.index("["):prompt.rindex("]") + 1])
+        return json.dumps({"translations": [t.upper() for t in texts]})
+
+
+def test_translation_cache_and_stage_are_reported_apart(db):
+    for _ in range(2):
+        assert translate_texts(UpperCaseTranslator(), ["Strong backend skills"], "vi",
+                               "fake", db) == ["STRONG BACKEND SKILLS"]
+
+    with sqlite3.connect(db.db_path) as conn:
+        rollups = {(kind, name): (count, hits) for kind, name, count, hits in conn.execute(
+            "SELECT kind, name, count, cache_hits FROM metric_rollups")}
+    # One miss that called the model, then one hit
+    assert rollups[("cache", "translation_cache")] == (2, 1)
+    assert rollups[("stage", "translation")] == (1, 0)
+    stage = _by_key(db)[("stage", "translation")]
+    assert (stage["count"], stage["cache_hits"]) == (1, 0)
+    assert [m["name"] for m in db.get_latency_percentiles()].count("translation") == 1
+
+
+def test_same_name_keeps_separate_histograms(db):
+    for _ in range(3):
+        metrics.record("stage", "ai:fake", latency_ms=10)
+    metrics.record("call", "ai:fake", latency_ms=5000)
+
+    by_key = _by_key(db)
+    stage, call = by_key[("stage", "ai:fake")], by_key[("call", "ai:fake")]
+    assert stage["count"] == 3 and stage["p99"] < 20
+    assert call["count"] == 1 and call["p50"] > 4000
+
+
+def test_old_bucket_table_is_migrated(tmp_path):
+    path = str(tmp_path / "old.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute("""CREATE TABLE metric_latency_buckets (
+            name TEXT, bucket INTEGER, count INTEGER DEFAULT 0, PRIMARY KEY (name, bucket))""")
+        conn.execute("""CREATE TABLE metric_rollups (
+            kind TEXT, name TEXT, count INTEGER DEFAULT 0, errors INTEGER DEFAULT 0,
+            cache_hits INTEGER DEFAULT 0, input_tokens INTEGER DEFAULT 0,
+            output_tokens INTEGER DEFAULT 0, cost REAL DEFAULT 0, PRIMARY KEY (kind, name))""")
+        conn.execute("INSERT INTO metric_latency_buckets VALUES ('ai:fake', 5, 2)")
+        conn.execute("INSERT INTO metric_latency_buckets VALUES ('scoring', 3, 1)")
+        conn.execute("INSERT INTO metric_rollups (kind, name, count) VALUES ('call', 'ai:fake', 2)")
+
+    db = Database(path)
+    assert set(_by_key(db)) == {("call", "ai:fake"), ("stage", "scoring")}
+    assert _by_key(db)[("call", "ai:fake")]["count"] == 2
+
+
+def _record_runs(runs, calls_per_run):
+    for r in range(runs):
+        with metrics.run(f"run-{r}"):
+            for _ in range(calls_per_run):
+                metrics.record_call("fake", "fake-model", 100, 50, 200.0)
+            with metrics.stage("scoring"):
+                pass
+
+
+def test_batched_events_match_synchronous_writes(tmp_path):
+    sync_db = Database(str(tmp_path / "sync.db"))
+    metrics.set_sink(sync_db.record_metric)
+    _record_runs(3, 2)
+
+    batched_db = Database(str(tmp_path / "batched.db"))
+    batched_db.enable_write_behind()
+    metrics.set_sink(batched_db.record_metric)
+    try:
+        _record_runs(3, 2)
+        # A run continued in a later batch is still one candidate
+        batched_db.flush()
+        _record_runs(1, 1)
+
+        assert batched_db.get_cost_summary()["candidates"] == 3
+        assert _by_key(batched_db)[("call", "ai:fake")]["count"] == 7
+        with sqlite3.connect(batched_db.db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM metric_events").fetchone()[0] == 11
+    finally:
+        metrics.set_sink(None)
+        batched_db.close()
+
+    sync_summary = sync_db.get_cost_summary()
+    assert sync_summary["candidates"] == 3
+    assert sync_summary["calls_per_candidate"] == 2
@@ -0,0 +1,39 @@
+import pytest
+
+from core.ai_client import AIClient
+from core.pdf_parser import MAX_VISION_PAGES, _fitz
+from core.pipeline import iter_pipeline
+
+
+def _scanned_pdf(path, pages):
+    """PDF without a text layer, like a scanned CV"""
+    doc = _fitz().open()
+    for _ in range(pages):
+        doc.new_page()
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+@pytest.fixture(autouse=True)
+def instant_fake_llm(monkeypatch):
+    monkeypatch.setenv("IH_FAKE_LATENCY", "fixed:0")
+
+
+def _analysis(pdf_path):
+    stage, state = next(iter_pipeline(AIClient(), pdf_path, "JD", "fake"))
+    assert stage == "analysis"
+    return state
+
+
+def test_long_scanned_cv_is_flagged(tmp_path):
+    pages = MAX_VISION_PAGES + 4
+    state = _analysis(_scanned_pdf(tmp_path / "cv.pdf", pages))
+    assert state["cv_summary"].startswith(
+        f"> ⚠️ Scanned CV: only the first {MAX_VISION_PAGES} of {pages} pages"
+    )
+
+
+def test_short_scanned_cv_is_not_flagged(tmp_path):
+    state = _analysis(_scanned_pdf(tmp_path / "cv.pdf", MAX_VISION_PAGES))
+    assert "Scanned CV" not in state["cv_summary"]
@@ -127,6 +127,123 @@ TRANSLATIONS = {
     "error": {
         "en": "Error",
         "vi": "Lỗi"
+    },
+    # Report headings (templates/questions_output.md)
+    "report_title": {
+        "en": "Interview Questions",
+        "vi": "Câu Hỏi Phỏng Vấn"
+    },
+    "generated": {
+        "en": "Generated",
+        "vi": "Ngày Tạo"
+    },
+    "cv_summary": {
+        "en": "CV Summary",
+        "vi": "Tóm Tắt CV"
+    },
+    "interview_questions": {
+        "en": "Interview Questions",
+        "vi": "Câu Hỏi Phỏng Vấn"
+    },
+    "score_breakdown": {
+        "en": "Score Breakdown",
+        "vi": "Chi Tiết Điểm"
+    },
+    "report_footer": {
+        "en": "Generated by Interviewer Helper",
+        "vi": "Tạo bởi Interviewer Helper"
+    },
+    # Question categories (core.question_bank.CATEGORY_KEYS)
+    "technical_deep_dive": {
+        "en": "Technical Deep-Dive",
+        "vi": "Chuyên Sâu Kỹ Thuật"
+    },
+    "experience_validation": {
+        "en": "Experience Validation",
+        "vi": "Xác Minh Kinh Nghiệm"
+    },
+    "scenario_based": {
+        "en": "Scenario-Based",
+        "vi": "Tình Huống"
+    },
+    "independent_work_ai_usage": {
+        "en": "Independent Work & AI Usage",
+        "vi": "Làm Việc Độc Lập & Sử Dụng AI"
+    },
+    "growth_mindset": {
+        "en": "Growth Mindset",
+        "vi": "Tư Duy Phát Triển"
+    },
+    "red_flags_to_probe": {
+        "en": "Red Flags to Probe",
+        "vi": "Điểm Cần Làm Rõ"
+    },
+    # Report content
+    "question": {
+        "en": "Question",
+        "vi": "Câu Hỏi"
+    },
+    "purpose": {
+        "en": "Purpose",
+        "vi": "Mục Đích"
+    },
+    "assessment_notes": {
+        "en": "Assessment Notes",
+        "vi": "Ghi Chú Đánh Giá"
+    },
+    "criterion": {
+        "en": "Criterion",
+        "vi": "Tiêu Chí"
+    },
+    "details": {
+        "en": "Details",
+        "vi": "Chi Tiết"
+    },
+    "matched": {
+        "en": "Matched",
+        "vi": "Đáp ứng"
+    },
+    "missing": {
+        "en": "Missing",
+        "vi": "Còn thiếu"
+    },
+    # Score breakdown criteria (required_skills/nice_to_have above)
+    "experience_level": {
+        "en": "Experience Level",
+        "vi": "Mức Độ Kinh Nghiệm"
+    },
+    "education": {
+        "en": "Education",
+        "vi": "Học Vấn"
+    },
+    "tech_modernity": {
+        "en": "Tech Stack Modernity",
+        "vi": "Độ Hiện Đại Công Nghệ"
+    },
+    "summary": {
+        "en": "Summary",
+        "vi": "Tóm Tắt"
+    },
+    "recommendation": {
+        "en": "Recommendation",
+        "vi": "Đề Xuất"
+    },
+    # Recommendations
+    "strong_hire": {
+        "en": "Strong Hire",
+        "vi": "Rất Nên Tuyển"
+    },
+    "hire": {
+        "en": "Hire",
+        "vi": "Nên Tuyển"
+    },
+    "maybe": {
+        "en": "Maybe",
+        "vi": "Cân Nhắc"
+    },
+    "no_hire": {
+        "en": "No Hire",
+        "vi": "Không Tuyển"
     }
 }
 
@@ -138,8 +255,8 @@ def set_language(lang: str):
         _current_language = lang
 
 
-def get_text(key: str) -> str:
-    """Get translated text for key"""
+def get_text(key: str, lang: str = None) -> str:
+    """Get translated text for key (in the current language unless lang is given)"""
     if key in TRANSLATIONS:
-        return TRANSLATIONS[key].get(_current_language, TRANSLATIONS[key]["en"])
+        return TRANSLATIONS[key].get(lang or _current_language, TRANSLATIONS[key]["en"])
     return key
@@ -0,0 +1,298 @@
+"""Render saved records as downloadable reports.
+
+The Markdown report comes from `templates/questions_output.md`. The
+template is parsed once per language: `{label_*}` placeholders are resolved
+to translated headings at compile time, leaving only the record fields to
+fill in per report. Questions and scores are rendered from their stored
+language-neutral form: fixed strings come from `ui.i18n`, and generated
+text goes through an optional `translate` callable in one batch. Bulk
+exports write one report at a time into a ZIP file, so memory use does not
+grow with the number of records.
+"""
+import functools
+import json
+import string
+import tempfile
+import time
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterable
+
+from core.prompt_templates import SCORING_SCHEMA
+from core.question_bank import CATEGORIES, CATEGORY_KEYS, structure_questions
+from .i18n import get_text
+
+
+TEMPLATE_PATH = Path(__file__).parent.parent / "templates" / "questions_output.md"
+FORMATS = ("md", "json")
+
+# Downloads are written here; files older than EXPORT_MAX_AGE are removed
+EXPORT_DIR = Path(tempfile.gettempdir()) / "interviewer_helper_exports"
+EXPORT_MAX_AGE = 24 * 3600  # seconds
+
+_LABEL_PREFIX = "label_"
+
+# Breakdown criteria in report order with their maximum scores
+_CRITERIA = {
+    key: item["properties"]["score"]["maximum"]
+    for key, item in SCORING_SCHEMA["properties"]["breakdown"]["properties"].items()
+}
+
+# (texts) -> translated texts, in order
+Translator = Callable[[list], list]
+
+
+@functools.lru_cache(maxsize=8)
+def compile_template(language: str = "en") -> tuple:
+    """Parse the report template for one language.
+
+    Returns:
+        Tuple of (literal text, record field name or None) segments
+    """
+    segments = []
+    literal = ""
+    for text, field, _, _ in string.Formatter().parse(TEMPLATE_PATH.read_text(encoding="utf-8")):
+        literal += text
+        if field is None:
+            continue
+        if field.startswith(_LABEL_PREFIX):
+            literal += get_text(field[len(_LABEL_PREFIX):], language)
+            continue
+        segments.append((literal, field))
+        literal = ""
+    segments.append((literal, None))
+    return tuple(segments)
+
+
+def _questions_data(record) -> dict:
+    """Stored language-neutral questions, parsed from the markdown for older records"""
+    if record.questions_data:
+        try:
+            return json.loads(record.questions_data)
+        except json.JSONDecodeError:
+            pass
+    return structure_questions(record.questions)
+
+
+def _score_result(record) -> dict:
+    try:
+        result = json.loads(record.score_breakdown) if record.score_breakdown else {}
+    except json.JSONDecodeError:
+        return {}
+    return result if isinstance(result, dict) else {}
+
+
+def _generated_texts(record, questions: dict, score_result: dict) -> list[str]:
+    """Generated (translatable) texts of a record, in render order"""
+    texts = [record.cv_summary or ""]
+    if questions["questions"]:
+        for q in questions["questions"]:
+            texts += [q["question"], q["purpose"]]
+        texts.append(questions["notes"])
+    else:
+        texts.append(record.questions or "")
+    for key in _CRITERIA:
+        texts.append(score_result.get("breakdown", {}).get(key, {}).get("notes", ""))
+    texts.append(score_result.get("summary", ""))
+    return [t for t in texts if isinstance(t, str) and t.strip()]
+
+
+def _cell(text: str) -> str:
+    return text.replace("|", "\\|").replace("\n", " ")
+
+
+def _render_questions(questions: dict, tr, language: str) -> str:
+    by_category = {}
+    for q in questions["questions"]:
+        by_category.setdefault(q["category"], []).append(q)
+    sections = []
+    header = f"| # | {get_text('question', language)} | {get_text('purpose', language)} |"
+    for number, (name, _, _, _) in enumerate(CATEGORIES, start=1):
+        key = CATEGORY_KEYS[name]
+        rows = by_category.get(key)
+        if not rows:
+            continue
+        table = "\n".join(
+            f"| {i} | {_cell(tr(q['question']))} | {_cell(tr(q['purpose']))} |"
+            for i, q in enumerate(rows, start=1)
+        )
+        sections.append(
+            f"### {number}. {get_text(key, language)}\n\n{header}\n|---|----------|---------|\n{table}"
+        )
+    if questions["notes"]:
+        sections.append(f"### {get_text('assessment_notes', language)}\n{tr(questions['notes'])}")
+    return "\n\n".join(sections)
+
+
+def _render_score(record, score_result: dict, tr, language: str) -> str:
+    breakdown = score_result.get("breakdown")
+    if not isinstance(breakdown, dict):
+        # Unparsed or auto-rejected results have no breakdown to localize
+        return f"```json\n{record.score_breakdown or '{}'}\n```"
+
+    rows = []
+    for key, maximum in _CRITERIA.items():
+        item = breakdown.get(key)
+        if not isinstance(item, dict):
+            continue
+        details = []
+        for field in ("matched", "missing"):
+            if item.get(field):
+                details.append(f"{get_text(field, language)}: {', '.join(map(str, item[field]))}")
+        if item.get("notes"):
+            details.append(tr(item["notes"]))
+        rows.append(
+            f"| {get_text(key, language)} | {item.get('score', 'N/A')}/{maximum} "
+            f"| {_cell('; '.join(details))} |"
+        )
+    lines = [
+        f"| {get_text('criterion', language)} | {get_text('score', language)} "
+        f"| {get_text('details', language)} |",
+        "|-----------|-------|---------|",
+        *rows,
+    ]
+    recommendation = score_result.get("recommendation")
+    if recommendation:
+        key = "_".join(recommendation.lower().split())
+        label = get_text(key, language)
+        lines.append(f"\n**{get_text('recommendation', language)}:** "
+                     f"{recommendation if label == key else label}")
+    if score_result.get("summary"):
+        lines.append(f"\n**{get_text('summary', language)}:** {tr(score_result['summary'])}")
+    return "\n".join(lines)
+
+
+def _report_fields(record, language: str, translate: Translator = None) -> dict:
+    questions = _questions_data(record)
+    score_result = _score_result(record)
+
+    translations = {}
+    if translate is not None:
+        texts = list(dict.fromkeys(_generated_texts(record, questions, score_result)))
+        translations = dict(zip(texts, translate(texts)))
+
+    def tr(text: str) -> str:
+        return translations.get(text, text)
+
+    score = f"{record.score}/100" if record.score is not None else "N/A"
+    return {
+        "candidate_name": record.candidate_name or "Candidate",
+        "position": record.position or "N/A",
+        "date": str(record.created_at or datetime.now().strftime("%Y-%m-%d %H:%M")),
+        "score": score,
+        "cv_summary": tr(record.cv_summary or ""),
+        "jd_text": record.jd_text or "",
+        "questions": _render_questions(questions, tr, language) if questions["questions"]
+        else tr(record.questions or ""),
+        "score_breakdown": _render_score(record, score_result, tr, language),
+    }
+
+
+def render_markdown(record, language: str = "en", translate: Translator = None) -> str:
+    """Render a CVRecord as the Markdown report.
+
+    Args:
+        record: Record to render
+        language: Language of headings and fixed strings
+        translate: Translates the record's generated text into `language`
+            (batched, one call per report); None keeps the stored text
+    """
+    fields = _report_fields(record, language, translate)
+    return "".join(
+        literal + (fields[field] if field else "")
+        for literal, field in compile_template(language)
+    )
+
+
+def render_json(record) -> str:
+    """Render a CVRecord as JSON (score breakdown kept structured)"""
+    try:
+        breakdown = json.loads(record.score_breakdown) if record.score_breakdown else {}
+    except json.JSONDecodeError:
+        breakdown = record.score_breakdown
+    return json.dumps({
+        "id": record.id,
+        "candidate_name": record.candidate_name,
+        "position": record.position,
+        "created_at": str(record.created_at) if record.created_at else None,
+        "score": record.score,
+        "cv_summary": record.cv_summary,
+        "jd_text": record.jd_text,
+        "questions": record.questions,
+        "questions_data": _questions_data(record),
+        "score_breakdown": breakdown,
+    }, indent=2, ensure_ascii=False)
+
+
+def render_report(record, fmt: str = "md", language: str = "en",
+                  translate: Translator = None) -> str:
+    """Render a CVRecord in one of FORMATS (JSON stays language-neutral)"""
+    if fmt == "md":
+        return render_markdown(record, language, translate)
+    if fmt == "json":
+        return render_json(record)
+    raise ValueError(f"Unknown report format: {fmt}")
+
+
+def report_filename(record, fmt: str = "md") -> str:
+    """File name for a record's report (unique per record)"""
+    safe_name = "".join(
+        c for c in (record.candidate_name or "candidate") if c.isalnum() or c in " -_"
+    ).strip()
+    safe_name = safe_name.replace(" ", "_") or "interview"
+    return f"{safe_name}_{record.id}.{fmt}"
+
+
+def cleanup_exports(max_age: float = EXPORT_MAX_AGE) -> int:
+    """Delete export files older than max_age seconds. Returns the number removed."""
+    if not EXPORT_DIR.exists():
+        return 0
+    cutoff = time.time() - max_age
+    removed = 0
+    for path in EXPORT_DIR.iterdir():
+        try:
+            if path.is_file() and path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except OSError:
+            continue  # in use or already gone
+    return removed
+
+
+def _export_path(filename: str) -> Path:
+    EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+    cleanup_exports()
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    return EXPORT_DIR / f"{timestamp}_{filename}"
+
+
+def export_report(record, fmt: str = "md", language: str = "en",
+                  translate: Translator = None) -> str:
+    """Write one record's report to the export directory. Returns the file path."""
+    path = _export_path(report_filename(record, fmt))
+    path.write_text(render_report(record, fmt, language, translate), encoding="utf-8")
+    return str(path)
+
+
+def export_zip(records: Iterable, fmt: str = "md", language: str = "en",
+               translate: Translator = None) -> tuple[str, int]:
+    """Stream reports for records into a ZIP file in the export directory.
+
+    Args:
+        records: CVRecords, consumed one at a time (e.g. Database.iter_records)
+        fmt: Report format, one of FORMATS
+        language: Language of Markdown reports
+        translate: Translator for generated text (see render_markdown)
+
+    Returns:
+        (ZIP file path, number of reports written)
+    """
+    path = _export_path("interview_reports.zip")
+    count = 0
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for record in records:
+            with archive.open(report_filename(record, fmt), "w") as entry:
+                entry.write(render_report(record, fmt, language, translate).encode("utf-8"))
+            count += 1
+    return str(path), count